@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+import recallcode.fields
+from recallcode.fields import compress_existing
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0002_initial'),
+    ]
+
+    operations = [
+        *compress_existing('ai', 'aihint', 'hint', recallcode.fields.CompressedTextField(), models.TextField()),
+        *compress_existing('ai', 'aihint', 'context', recallcode.fields.CompressedJSONField(blank=True, default=dict), models.JSONField(blank=True, default=dict)),
+    ]
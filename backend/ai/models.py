@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from recallcode.fields import CompressedJSONField, CompressedTextField
 
 User = get_user_model()
 
@@ -15,9 +16,9 @@ class AIHint(models.Model):
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ai_hints')
     problem_id = models.IntegerField()  # Problem ID
-    hint = models.TextField()
+    hint = CompressedTextField()
     provider = models.CharField(max_length=20, choices=PROVIDER_CHOICES, default='openai')
-    context = models.JSONField(default=dict, blank=True)
+    context = CompressedJSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -16,7 +16,7 @@ class AIService:
         return getattr(settings, 'AI_PROVIDER', 'openai')
     
     @staticmethod
-    def generate_hint(user, problem_id, problem_description, user_code=None, error_message=None):
+    def generate_hint(user, problem_id, problem_description, user_code=None, error_message=None, code_revision=None):
         """
         Generate an AI hint for a problem.
         
@@ -26,6 +26,8 @@ class AIService:
             problem_description: Problem description
             user_code: User's code (optional)
             error_message: Error message if any (optional)
+            code_revision: SubmissionRevision holding `user_code` (optional);
+                the saved context then references it instead of copying the code
         
         Returns:
             str: AI-generated hint
@@ -52,6 +54,12 @@ class AIService:
             hint = "AI hint generation is not configured."
         
         # Save hint
+        if code_revision is not None:
+            context.pop('user_code', None)
+            context['code_revision'] = {
+                'submission_id': code_revision.submission_id,
+                'number': code_revision.number,
+            }
         AIHint.objects.create(
             user=user,
             problem_id=problem_id,
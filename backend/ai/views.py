@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from .services import AIService
 from problems.models import Problem, Submission
+from problems.services import RevisionService
 
 
 @api_view(['POST'])
@@ -29,11 +30,13 @@ def generate_hint(request):
     
     user_code = None
     error_message = None
+    code_revision = None
     
     if submission_id:
         try:
             submission = Submission.objects.get(id=submission_id, user=request.user)
             user_code = submission.code
+            code_revision = RevisionService.record(submission)
             if submission.error_message:
                 error_message = submission.error_message
         except Submission.DoesNotExist:
@@ -44,7 +47,8 @@ def generate_hint(request):
         problem_id=problem_id,
         problem_description=problem.description,
         user_code=user_code,
-        error_message=error_message
+        error_message=error_message,
+        code_revision=code_revision
     )
     
     return Response({'hint': hint})
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+import recallcode.fields
+from recallcode.fields import compress_existing
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coach', '0003_initial'),
+    ]
+
+    operations = [
+        *compress_existing('coach', 'coachinteraction', 'query', recallcode.fields.CompressedTextField(), models.TextField()),
+        *compress_existing('coach', 'coachinteraction', 'response', recallcode.fields.CompressedTextField(), models.TextField()),
+        *compress_existing('coach', 'coachinteraction', 'context', recallcode.fields.CompressedJSONField(blank=True, default=dict), models.JSONField(blank=True, default=dict)),
+    ]
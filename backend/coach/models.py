@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from problems.models import Submission
+from recallcode.fields import CompressedJSONField, CompressedTextField
 
 User = get_user_model()
 
@@ -16,9 +17,9 @@ class CoachInteraction(models.Model):
         null=True,
         blank=True
     )
-    query = models.TextField()  # User's question or request
-    response = models.TextField()  # AI coach's response
-    context = models.JSONField(default=dict, blank=True)  # Additional context
+    query = CompressedTextField()  # User's question or request
+    response = CompressedTextField()  # AI coach's response
+    context = CompressedJSONField(default=dict, blank=True)  # Additional context
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
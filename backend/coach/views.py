@@ -22,13 +22,18 @@ def chat_with_coach(request):
     # Get context from submission if provided
     context = {'query': query}
     submission = None
+    code_revision = None
     
     if submission_id:
         try:
             from problems.models import Submission
+            from problems.services import RevisionService
             submission = Submission.objects.get(id=submission_id, user=request.user)
+            # Reference the saved version of the code instead of copying it
+            code_revision = RevisionService.record(submission)
             context['submission'] = {
-                'code': submission.code,
+                'id': submission.id,
+                'revision': code_revision.number,
                 'problem': submission.problem.title,
                 'error': submission.error_message,
             }
@@ -43,7 +48,8 @@ def chat_with_coach(request):
         problem_id=submission.problem.id if submission else 0,
         problem_description=query,
         user_code=submission.code if submission else None,
-        error_message=submission.error_message if submission else None
+        error_message=submission.error_message if submission else None,
+        code_revision=code_revision
     )
     
     # Save interaction
@@ -0,0 +1,248 @@
+"""
+Admission control for code execution.
+
+Every run takes a slot before it reaches an executor. Slots are limited
+globally (EXECUTION_MAX_CONCURRENCY) and per user (EXECUTION_MAX_PER_USER).
+Runs that cannot start wait in a per-user FIFO queue; users with waiting
+runs are served round-robin as slots free up, so one user queueing many
+runs cannot starve the others.
+
+State lives in Redis and every transition is a single Lua script, so the
+limits hold across all web and Celery processes:
+
+    exec:admission:inflight          ZSET "<user>:<slot>" -> lease expiry
+    exec:admission:inflight:<user>   ZSET "<slot>" -> lease expiry
+    exec:admission:queue:<user>      LIST of waiting job ids
+    exec:admission:ring              LIST of users with waiting jobs
+    exec:admission:metrics           HASH of counters and the queue depth
+
+Slots carry a lease (EXECUTION_ADMISSION_LEASE) so those held by a crashed
+worker are reclaimed instead of leaking.
+"""
+import time
+from typing import Optional, Dict, Any, List
+from django.conf import settings
+from redis.exceptions import RedisError
+from recallcode.redis_client import get_redis
+
+
+PREFIX = 'exec:admission:'
+
+# KEYS: global inflight, user inflight, user queue, ring, metrics
+# ARGV: slot, user, now, lease expiry, global cap, user cap, queue if full
+ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[3])
+local waiting = redis.call('LLEN', KEYS[3])
+if waiting == 0
+        and redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[5])
+        and redis.call('ZCARD', KEYS[2]) < tonumber(ARGV[6]) then
+    redis.call('ZADD', KEYS[1], ARGV[4], ARGV[2] .. ':' .. ARGV[1])
+    redis.call('ZADD', KEYS[2], ARGV[4], ARGV[1])
+    redis.call('HINCRBY', KEYS[5], 'admitted', 1)
+    return {1, 0}
+end
+if ARGV[7] ~= '1' then
+    redis.call('HINCRBY', KEYS[5], 'deferred', 1)
+    return {0, 0}
+end
+if waiting == 0 then
+    redis.call('RPUSH', KEYS[4], ARGV[2])
+end
+redis.call('RPUSH', KEYS[3], ARGV[1])
+redis.call('HINCRBY', KEYS[5], 'queued', 1)
+redis.call('HINCRBY', KEYS[5], 'queue_depth', 1)
+local turn = redis.call('LPOS', KEYS[4], ARGV[2]) or 0
+return {0, waiting * redis.call('LLEN', KEYS[4]) + turn + 1}
+"""
+
+# KEYS: global inflight, ring, metrics
+# ARGV: slot, user, now, lease expiry, global cap, user cap, key prefix
+RELEASE_SCRIPT = """
+local prefix = ARGV[7]
+redis.call('ZREM', KEYS[1], ARGV[2] .. ':' .. ARGV[1])
+redis.call('ZREM', prefix .. 'inflight:' .. ARGV[2], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])
+local dispatched = {}
+local idle = 0
+while redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[5]) do
+    local users = redis.call('LLEN', KEYS[2])
+    if users == 0 or idle >= users then
+        break
+    end
+    local user = redis.call('LPOP', KEYS[2])
+    local inflight = prefix .. 'inflight:' .. user
+    local queue = prefix .. 'queue:' .. user
+    redis.call('ZREMRANGEBYSCORE', inflight, '-inf', ARGV[3])
+    local job = false
+    if redis.call('ZCARD', inflight) < tonumber(ARGV[6]) then
+        job = redis.call('LPOP', queue)
+    end
+    if job then
+        redis.call('ZADD', KEYS[1], ARGV[4], user .. ':' .. job)
+        redis.call('ZADD', inflight, ARGV[4], job)
+        redis.call('HINCRBY', KEYS[3], 'queue_depth', -1)
+        redis.call('HINCRBY', KEYS[3], 'dequeued', 1)
+        table.insert(dispatched, job)
+        idle = 0
+    else
+        idle = idle + 1
+    end
+    if redis.call('LLEN', queue) > 0 then
+        redis.call('RPUSH', KEYS[2], user)
+    end
+end
+return dispatched
+"""
+
+# KEYS: user queue, ring
+# ARGV: job, user
+POSITION_SCRIPT = """
+local index = redis.call('LPOS', KEYS[1], ARGV[1])
+if not index then
+    return -1
+end
+local turn = redis.call('LPOS', KEYS[2], ARGV[2]) or 0
+return index * redis.call('LLEN', KEYS[2]) + turn + 1
+"""
+
+_scripts = {}
+
+
+def _script(source: str):
+    client = get_redis()
+    script = _scripts.get(source)
+    if script is None or script.registered_client is not client:
+        script = _scripts[source] = client.register_script(source)
+    return script
+
+
+class AdmissionController:
+    """Redis-backed global/per-user concurrency limits with fair queueing."""
+
+    GLOBAL_KEY = PREFIX + 'inflight'
+    RING_KEY = PREFIX + 'ring'
+    METRICS_KEY = PREFIX + 'metrics'
+    COUNTERS = ('admitted', 'deferred', 'queued', 'dequeued')
+
+    @staticmethod
+    def _user_keys(user_id) -> List[str]:
+        return [f'{PREFIX}inflight:{user_id}', f'{PREFIX}queue:{user_id}']
+
+    @staticmethod
+    def _clock() -> List[float]:
+        now = time.time()
+        return [now, now + settings.EXECUTION_ADMISSION_LEASE]
+
+    @staticmethod
+    def acquire(user_id, slot_id, queue: bool = True) -> Dict[str, Any]:
+        """
+        Take an execution slot for `slot_id` on behalf of `user_id`.
+
+        Args:
+            user_id: Owner of the run
+            slot_id: Unique id of the run (an ExecutionJob id when queueing)
+            queue: Queue the run if no slot is free; otherwise just refuse
+
+        Returns:
+            Dict with `admitted` and, for queued runs, the estimated 1-based
+            `position` among all waiting runs
+        """
+        if not settings.EXECUTION_ADMISSION_ENABLED:
+            return {'admitted': True, 'position': None}
+
+        inflight, user_queue = AdmissionController._user_keys(user_id)
+        try:
+            admitted, position = _script(ACQUIRE_SCRIPT)(
+                keys=[
+                    AdmissionController.GLOBAL_KEY,
+                    inflight,
+                    user_queue,
+                    AdmissionController.RING_KEY,
+                    AdmissionController.METRICS_KEY,
+                ],
+                args=[
+                    str(slot_id),
+                    str(user_id),
+                    *AdmissionController._clock(),
+                    settings.EXECUTION_MAX_CONCURRENCY,
+                    settings.EXECUTION_MAX_PER_USER,
+                    1 if queue else 0,
+                ]
+            )
+        except RedisError:
+            # Fail open: losing admission control is better than losing execution
+            return {'admitted': True, 'position': None}
+
+        return {'admitted': bool(admitted), 'position': position or None}
+
+    @staticmethod
+    def release(user_id, slot_id) -> List[str]:
+        """
+        Free the slot held by `slot_id` and admit waiting runs in its place.
+
+        Returns:
+            Ids of queued jobs that now hold a slot; the caller must start them
+        """
+        if not settings.EXECUTION_ADMISSION_ENABLED:
+            return []
+
+        try:
+            return _script(RELEASE_SCRIPT)(
+                keys=[
+                    AdmissionController.GLOBAL_KEY,
+                    AdmissionController.RING_KEY,
+                    AdmissionController.METRICS_KEY,
+                ],
+                args=[
+                    str(slot_id),
+                    str(user_id),
+                    *AdmissionController._clock(),
+                    settings.EXECUTION_MAX_CONCURRENCY,
+                    settings.EXECUTION_MAX_PER_USER,
+                    PREFIX,
+                ]
+            )
+        except RedisError:
+            return []
+
+    @staticmethod
+    def position(user_id, job_id) -> Optional[int]:
+        """Estimated 1-based queue position of a waiting job, or None if it is not queued."""
+        if not settings.EXECUTION_ADMISSION_ENABLED:
+            return None
+
+        _, user_queue = AdmissionController._user_keys(user_id)
+        try:
+            position = _script(POSITION_SCRIPT)(
+                keys=[user_queue, AdmissionController.RING_KEY],
+                args=[str(job_id), str(user_id)]
+            )
+        except RedisError:
+            return None
+        return position if position > 0 else None
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """Current slot usage, queue depth and admission counters."""
+        stats = {
+            'enabled': settings.EXECUTION_ADMISSION_ENABLED,
+            'max_concurrency': settings.EXECUTION_MAX_CONCURRENCY,
+            'max_per_user': settings.EXECUTION_MAX_PER_USER,
+        }
+        try:
+            client = get_redis()
+            with client.pipeline(transaction=False) as pipe:
+                pipe.zcount(AdmissionController.GLOBAL_KEY, time.time(), '+inf')
+                pipe.llen(AdmissionController.RING_KEY)
+                pipe.hgetall(AdmissionController.METRICS_KEY)
+                in_flight, waiting_users, metrics = pipe.execute()
+        except RedisError:
+            return stats
+
+        stats['in_flight'] = in_flight
+        stats['waiting_users'] = waiting_users
+        stats['queue_depth'] = int(metrics.get('queue_depth', 0))
+        for name in AdmissionController.COUNTERS:
+            stats[name] = int(metrics.get(name, 0))
+        return stats
@@ -0,0 +1,311 @@
+"""
+Output comparison for execution results.
+
+Outputs are compared incrementally, line by line or token by token, from
+strings, iterables of chunks or text file objects, so large outputs are
+never copied or split into lists. When both outputs are strings, their
+common prefix is skipped with block-wise string comparisons first, so
+matching outputs cost little more than a memcmp. Only the first difference
+is reported, with short excerpts of both sides.
+
+Modes:
+    exact      Line by line, ignoring trailing whitespace on each line,
+               leading whitespace of the output and trailing blank lines
+    tokens     Whitespace-separated tokens; line breaks and spacing ignored
+    float      Like tokens, but numeric tokens match within a tolerance
+    unordered  Lines in any order (a multiset of lines); blank lines ignored
+
+A comparison is written as `mode` or `float:<tolerance>`.
+"""
+import math
+import re
+from collections import Counter
+from itertools import zip_longest
+from typing import Optional, Dict, Any, Iterable, Iterator, Tuple, Union
+
+CHUNK_SIZE = 64 * 1024
+SNIPPET_LENGTH = 40
+DEFAULT_TOLERANCE = 1e-6
+
+MODES = ('exact', 'tokens', 'float', 'unordered')
+
+TOKEN_RE = re.compile(r'\S+')
+
+Source = Union[str, Iterable[str], Any]
+
+
+def _chunks(source: Source, offset: int = 0) -> Iterator[str]:
+    if source is None:
+        return
+    if isinstance(source, str):
+        for start in range(offset, len(source), CHUNK_SIZE):
+            yield source[start:start + CHUNK_SIZE]
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def _lines(source: Source, offset: int = 0) -> Iterator[str]:
+    """Yield lines without terminators, holding only the current line in memory."""
+    partial = []
+    for chunk in _chunks(source, offset):
+        start = 0
+        while True:
+            end = chunk.find('\n', start)
+            if end == -1:
+                if start < len(chunk):
+                    partial.append(chunk[start:])
+                break
+            line = chunk[start:end]
+            if partial:
+                partial.append(line)
+                line = ''.join(partial)
+                partial = []
+            yield line
+            start = end + 1
+    if partial:
+        yield ''.join(partial)
+
+
+def _trimmed_lines(source: Source, skip: 'Prefix') -> Iterator[Tuple[int, str]]:
+    """
+    Yield (line number, line) with trailing whitespace removed, starting at
+    the first non-blank character of the output.
+    """
+    started = skip.started
+    for line_no, line in enumerate(_lines(source, skip.offset), skip.lines + 1):
+        line = line.rstrip()
+        if not started:
+            if not line:
+                continue
+            line = line.lstrip()
+            started = True
+        yield line_no, line
+
+
+def _tokens(source: Source, skip: 'Prefix') -> Iterator[Tuple[int, str]]:
+    """Yield (line number, token) for every whitespace-separated token."""
+    for line_no, line in enumerate(_lines(source, skip.offset), skip.lines + 1):
+        for token in line.split():
+            yield line_no, token
+
+
+class Prefix:
+    """
+    Identical leading part of two string outputs, ending at a line break.
+
+    Comparators start reading both outputs at `offset`; `lines` counts the
+    skipped lines and `started` tells whether they held anything but
+    whitespace.
+    """
+
+    def __init__(self, expected: Source = None, actual: Source = None):
+        self.offset = self.lines = 0
+        self.started = False
+        if not (isinstance(expected, str) and isinstance(actual, str)):
+            return
+
+        end = min(len(expected), len(actual))
+        position = 0
+        while position < end:
+            stop = min(position + CHUNK_SIZE, end)
+            if expected[position:stop] != actual[position:stop]:
+                break
+            position = stop
+
+        # Everything before `position` is identical; cut after its last line break
+        self.offset = expected.rfind('\n', 0, position) + 1
+        if self.offset:
+            self.lines = expected.count('\n', 0, self.offset)
+            self.started = TOKEN_RE.search(expected, 0, self.offset) is not None
+
+    def count_tokens(self, expected: Source) -> int:
+        """Number of tokens in the skipped part; only needed to report a mismatch."""
+        if not self.offset:
+            return 0
+        return sum(1 for _ in TOKEN_RE.finditer(expected, 0, self.offset))
+
+
+def _snippet(text: Optional[str], start: int = 0) -> str:
+    if text is None:
+        return 'end of output'
+    excerpt = text[start:start + SNIPPET_LENGTH]
+    prefix = '...' if start > 0 else ''
+    suffix = '...' if len(text) > start + SNIPPET_LENGTH else ''
+    return f"'{prefix}{excerpt}{suffix}'"
+
+
+def _mismatch(position: str, expected: Optional[str], actual: Optional[str], start: int = 0, **where) -> Dict[str, Any]:
+    expected_snippet = _snippet(expected, start)
+    actual_snippet = _snippet(actual, start)
+    return {
+        **where,
+        'expected': expected_snippet,
+        'actual': actual_snippet,
+        'message': f'{position}: expected {expected_snippet}, got {actual_snippet}',
+    }
+
+
+def _first_difference(a: str, b: str) -> int:
+    for index, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return index
+    return min(len(a), len(b))
+
+
+def compare_exact(
+    expected: Source,
+    actual: Source,
+    tolerance: float = DEFAULT_TOLERANCE,
+    skip: Optional[Prefix] = None
+) -> Optional[Dict[str, Any]]:
+    skip = skip or Prefix()
+    pairs = zip_longest(_trimmed_lines(expected, skip), _trimmed_lines(actual, skip), fillvalue=(None, None))
+    for (expected_no, expected_line), (actual_no, actual_line) in pairs:
+        if expected_line == actual_line:
+            continue
+        # Trailing blank lines on either side
+        if (expected_line is None and actual_line == '') or (actual_line is None and expected_line == ''):
+            continue
+
+        line_no = actual_no or expected_no
+        column = _first_difference(expected_line or '', actual_line or '')
+        return _mismatch(
+            f'Line {line_no}, column {column + 1}',
+            expected_line,
+            actual_line,
+            start=max(column - 10, 0),
+            line=line_no,
+            column=column + 1
+        )
+    return None
+
+
+def _compare_tokens(expected: Source, actual: Source, same, skip: Optional[Prefix]) -> Optional[Dict[str, Any]]:
+    skip = skip or Prefix()
+    pairs = zip_longest(_tokens(expected, skip), _tokens(actual, skip), fillvalue=(None, None))
+    for index, ((expected_line, expected_token), (actual_line, actual_token)) in enumerate(pairs, 1):
+        if expected_token is not None and actual_token is not None and same(expected_token, actual_token):
+            continue
+        index += skip.count_tokens(expected)
+        line_no = actual_line or expected_line
+        return _mismatch(
+            f'Token {index} (line {line_no})',
+            expected_token,
+            actual_token,
+            line=line_no,
+            token=index
+        )
+    return None
+
+
+def compare_tokens(
+    expected: Source,
+    actual: Source,
+    tolerance: float = DEFAULT_TOLERANCE,
+    skip: Optional[Prefix] = None
+) -> Optional[Dict[str, Any]]:
+    return _compare_tokens(expected, actual, lambda a, b: a == b, skip)
+
+
+def numbers_match(expected: str, actual: str, tolerance: float = DEFAULT_TOLERANCE) -> bool:
+    """Token equality, treating numbers within `tolerance` (absolute or relative) as equal."""
+    if expected == actual:
+        return True
+    try:
+        expected_value, actual_value = float(expected), float(actual)
+    except ValueError:
+        return False
+    if math.isnan(expected_value) or math.isnan(actual_value):
+        return math.isnan(expected_value) and math.isnan(actual_value)
+    return math.isclose(actual_value, expected_value, rel_tol=tolerance, abs_tol=tolerance)
+
+
+def compare_float(
+    expected: Source,
+    actual: Source,
+    tolerance: float = DEFAULT_TOLERANCE,
+    skip: Optional[Prefix] = None
+) -> Optional[Dict[str, Any]]:
+    mismatch = _compare_tokens(expected, actual, lambda a, b: numbers_match(a, b, tolerance), skip)
+    if mismatch:
+        mismatch['message'] += f' (tolerance {tolerance:g})'
+    return mismatch
+
+
+def compare_unordered(
+    expected: Source,
+    actual: Source,
+    tolerance: float = DEFAULT_TOLERANCE,
+    skip: Optional[Prefix] = None
+) -> Optional[Dict[str, Any]]:
+    # Lines of the common prefix cancel out. Only hashes of the rest are kept;
+    # str hashes are salted per process, so collisions cannot be crafted.
+    skip = skip or Prefix()
+    remaining = Counter(hash(line.rstrip()) for line in _lines(expected, skip.offset) if line.strip())
+
+    for line_no, line in enumerate(_lines(actual, skip.offset), skip.lines + 1):
+        line = line.rstrip()
+        if not line.strip():
+            continue
+        key = hash(line)
+        if not remaining[key]:
+            snippet = _snippet(line)
+            return {
+                'line': line_no,
+                'expected': None,
+                'actual': snippet,
+                'message': f'Line {line_no}: unexpected line {snippet}',
+            }
+        remaining[key] -= 1
+
+    missing = sum(remaining.values())
+    if missing:
+        return {
+            'line': None,
+            'expected': None,
+            'actual': 'end of output',
+            'message': f'{missing} expected line(s) missing from output',
+        }
+    return None
+
+
+COMPARATORS = {
+    'exact': compare_exact,
+    'tokens': compare_tokens,
+    'float': compare_float,
+    'unordered': compare_unordered,
+}
+
+
+def parse_comparison(comparison: Optional[str]) -> Tuple[str, float]:
+    """Split `mode[:tolerance]` into its mode and tolerance."""
+    mode, _, tolerance = (comparison or 'exact').partition(':')
+    if mode not in COMPARATORS:
+        raise ValueError(f"Unknown comparison mode '{mode}'")
+    return mode, float(tolerance) if tolerance else DEFAULT_TOLERANCE
+
+
+def compare(expected: Source, actual: Source, comparison: Optional[str] = 'exact') -> Optional[Dict[str, Any]]:
+    """
+    Compare a program's output with the expected output.
+
+    Args:
+        expected: Expected output as a string, chunks or text file
+        actual: Program output as a string, chunks or text file
+        comparison: `mode` or `float:<tolerance>` (see module docstring)
+
+    Returns:
+        None if the outputs match, else a dict describing the first
+        difference: `message`, `expected`/`actual` excerpts and its position
+        (`line`, plus `column` or `token` where known)
+    """
+    mode, tolerance = parse_comparison(comparison)
+    if isinstance(expected, str) and isinstance(actual, str) and expected == actual:
+        return None
+    return COMPARATORS[mode](expected, actual, tolerance, Prefix(expected, actual))
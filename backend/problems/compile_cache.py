@@ -0,0 +1,143 @@
+"""
+On-disk cache of compiled artifacts for the local executor.
+
+Artifacts are keyed by (normalized source hash, language, compile command,
+compiler binary) so re-runs of unchanged code skip compilation. Entries are
+directories under COMPILE_CACHE_DIR; their mtime is bumped on every hit and
+the least recently used entries are evicted once the cache grows past
+COMPILE_CACHE_MAX_BYTES.
+"""
+import glob
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from typing import Optional, List, Dict, Any
+
+from django.conf import settings
+
+from .utils import source_hash
+
+
+class CompileCache:
+    """LRU, size-bounded store of build outputs shared by all local workers."""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.counters = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    @staticmethod
+    def make_key(code: str, language: str, command: List[str]) -> str:
+        """Key for a build; includes the compiler so toolchain upgrades miss."""
+        compiler = shutil.which(command[0]) or command[0]
+        try:
+            compiler_id = f'{os.path.realpath(compiler)}:{os.stat(compiler).st_mtime_ns}'
+        except OSError:
+            compiler_id = compiler
+        parts = [source_hash(code), language.lower(), '\0'.join(command), compiler_id]
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def restore(self, key: str, workdir: str) -> bool:
+        """Copy the cached artifacts for `key` into `workdir`; False on a miss."""
+        path = self._path(key)
+        try:
+            names = os.listdir(path)
+            for name in names:
+                shutil.copy2(os.path.join(path, name), os.path.join(workdir, name))
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            # Missing, or evicted by another process while copying
+            self._count('misses')
+            return False
+
+        self._count('hits')
+        return True
+
+    def store(self, key: str, workdir: str, patterns: List[str]):
+        """Save the files in `workdir` matching `patterns` under `key`."""
+        files = [path for pattern in patterns for path in glob.glob(os.path.join(workdir, pattern))]
+        if not files:
+            return
+
+        staging = self._path(f'.{key}.{uuid.uuid4().hex}')
+        try:
+            os.makedirs(staging)
+            for path in files:
+                shutil.copy2(path, staging)
+            # Atomic publish; a concurrent store of the same key simply wins
+            os.rename(staging, self._path(key))
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+
+        self._count('stores')
+        self.evict()
+
+    @staticmethod
+    def _entry_size(path: str) -> int:
+        total = 0
+        for name in os.listdir(path):
+            try:
+                total += os.path.getsize(os.path.join(path, name))
+            except OSError:
+                pass
+        return total
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if name.startswith('.'):
+                continue
+            path = self._path(name)
+            try:
+                size = self._entry_size(path)
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+            total += size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            self._count('evictions')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_compile_cache() -> Optional[CompileCache]:
+    """Return the process-wide compile cache, or None if disabled."""
+    global _cache
+
+    if not settings.COMPILE_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = CompileCache(settings.COMPILE_CACHE_DIR, settings.COMPILE_CACHE_MAX_BYTES)
+        return _cache
@@ -0,0 +1,90 @@
+"""
+Empirical complexity estimation.
+
+Measurements taken at increasing input sizes are fitted to common
+complexity classes with least squares, modelling y = a + b * f(n) so that
+fixed costs (interpreter start-up, baseline memory) land in the intercept.
+Curves that grow by less than a minimum amount (measurement noise, clock
+resolution) are reported as O(1). Otherwise the growing class with the
+smallest residual error wins; a simpler class is kept when a more complex
+one fits only marginally better.
+"""
+import math
+from typing import Dict, Any, List, Optional
+
+# (label, growth function), simplest first
+COMPLEXITY_CLASSES = [
+    ('O(1)', lambda n: 1.0),
+    ('O(log n)', lambda n: math.log2(n)),
+    ('O(n)', lambda n: float(n)),
+    ('O(n log n)', lambda n: n * math.log2(n)),
+    ('O(n^2)', lambda n: float(n) ** 2),
+    ('O(n^3)', lambda n: float(n) ** 3),
+]
+
+# A more complex class must at least halve the residual error to win; neighbouring
+# classes (n vs n log n) differ little over practical input ranges
+IMPROVEMENT_REQUIRED = 0.5
+
+
+def _linear_fit(xs: List[float], ys: List[float]):
+    """Least-squares a, b for y = a + b * x; returns (a, b, residual sum of squares)."""
+    count = len(xs)
+    mean_x = sum(xs) / count
+    mean_y = sum(ys) / count
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if var_x == 0:
+        b = 0.0
+    else:
+        b = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    a = mean_y - b * mean_x
+    rss = sum((y - a - b * x) ** 2 for x, y in zip(xs, ys))
+    return a, b, rss
+
+
+def fit(sizes: List[int], values: List[float], min_growth: float = 0.0) -> Optional[Dict[str, Any]]:
+    """
+    Fit measurements to the complexity classes.
+
+    Args:
+        sizes: Input sizes (n > 1), increasing
+        values: Measurement (runtime or memory) at each size
+        min_growth: Largest change across all sizes still treated as noise
+
+    Returns:
+        Dict with `class`, `r2` (fit quality, 0-1) and the model
+        `coefficients`, or None with fewer than three points. For O(1) the
+        quality is one minus the coefficient of variation.
+    """
+    if len(sizes) < 3 or len(sizes) != len(values):
+        return None
+
+    count = len(values)
+    mean_y = sum(values) / count
+    tss = sum((y - mean_y) ** 2 for y in values)
+
+    if max(values) - min(values) <= min_growth or tss == 0:
+        variation = math.sqrt(tss / count) / mean_y if mean_y > 0 else 0.0
+        return {
+            'class': 'O(1)',
+            'r2': round(max(0.0, 1 - variation), 4),
+            'coefficients': [mean_y, 0.0],
+        }
+
+    best = None
+    for label, growth in COMPLEXITY_CLASSES[1:]:
+        a, b, rss = _linear_fit([growth(n) for n in sizes], values)
+        if b <= 0:
+            continue  # Decreasing curves do not describe growth
+        if best is None or rss < best['rss'] * IMPROVEMENT_REQUIRED:
+            best = {'class': label, 'rss': rss, 'coefficients': [a, b]}
+
+    if best is None:
+        # Values only shrink with n: nothing grows, report a constant
+        return fit(sizes, values, min_growth=float('inf'))
+
+    return {
+        'class': best['class'],
+        'r2': round(max(0.0, 1 - best['rss'] / tss), 4),
+        'coefficients': best['coefficients'],
+    }
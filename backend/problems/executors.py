@@ -0,0 +1,305 @@
+"""
+Pluggable code execution backends.
+
+Every executor returns the same result dicts as `Judge0Service`, so callers
+do not care whether code ran on Judge0 or on this machine. The backend is
+chosen with the CODE_EXECUTOR setting.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Optional, Dict, Any, List
+from django.conf import settings
+from . import sandbox
+from .compile_cache import get_compile_cache
+from .services import Judge0Service
+from .testcase_store import case_stdin_path
+from .worker_pool import WorkerError, get_pool
+
+
+class BaseExecutor:
+    """Interface for code execution backends."""
+
+    name = ''
+
+    def execute(
+        self,
+        code: str,
+        language: str,
+        stdin: Optional[str] = None,
+        expected_output: Optional[str] = None,
+        comparison: str = 'exact'
+    ) -> Dict[str, Any]:
+        """Run code against a single input; see `Judge0Service.execute_code`."""
+        raise NotImplementedError
+
+    def execute_batch(
+        self,
+        code: str,
+        language: str,
+        test_cases: List[Dict[str, Optional[str]]],
+        comparison: str = 'exact'
+    ) -> Dict[str, Any]:
+        """Run code against several test cases; see `Judge0Service.execute_batch`."""
+        raise NotImplementedError
+
+
+class Judge0Executor(BaseExecutor):
+    """Executes code remotely on Judge0."""
+
+    name = 'judge0'
+
+    def execute(self, code, language, stdin=None, expected_output=None, comparison='exact'):
+        return Judge0Service.execute_code(
+            code=code,
+            language=language,
+            stdin=stdin,
+            expected_output=expected_output,
+            comparison=comparison
+        )
+
+    def execute_batch(self, code, language, test_cases, comparison='exact'):
+        return Judge0Service.execute_batch(
+            code=code,
+            language=language,
+            test_cases=test_cases,
+            comparison=comparison
+        )
+
+
+class LocalExecutor(BaseExecutor):
+    """
+    Executes code in resource-limited subprocesses on this machine.
+
+    Only languages whose toolchain is installed are available. Compiled
+    languages are built once (or restored from the compile cache) and the
+    binary is run for every case.
+    Python runs on the warm worker pool when PYTHON_WORKER_POOL_SIZE > 0.
+    """
+
+    name = 'local'
+
+    # source: file name for the code
+    # compile: build command, or None for interpreted languages
+    # run: command that runs the program
+    # artifacts: build outputs kept in the compile cache
+    # limit_address_space: False for runtimes that reserve large virtual ranges
+    TOOLCHAINS = {
+        'python': {
+            'source': 'main.py',
+            'compile': None,
+            'run': [sys.executable, '-I', '-S', 'main.py'],
+        },
+        'javascript': {
+            'source': 'main.js',
+            'compile': None,
+            'run': ['node', 'main.js'],
+            'limit_address_space': False,
+        },
+        'java': {
+            'source': 'Main.java',
+            'compile': ['javac', '-J-Xmx512m', 'Main.java'],
+            'run': ['java', '-Xss64m', '-cp', '.', 'Main'],
+            'artifacts': ['*.class'],
+            'limit_address_space': False,
+        },
+        'cpp': {
+            'source': 'main.cpp',
+            'compile': ['g++', '-O2', '-std=c++17', '-o', 'main', 'main.cpp'],
+            'run': ['./main'],
+            'artifacts': ['main'],
+        },
+        'c': {
+            'source': 'main.c',
+            'compile': ['gcc', '-O2', '-std=c11', '-o', 'main', 'main.c', '-lm'],
+            'run': ['./main'],
+            'artifacts': ['main'],
+        },
+        'go': {
+            'source': 'main.go',
+            'compile': ['go', 'build', '-o', 'main', 'main.go'],
+            'run': ['./main'],
+            'artifacts': ['main'],
+            'limit_address_space': False,
+        },
+        'rust': {
+            'source': 'main.rs',
+            'compile': ['rustc', '-O', '-o', 'main', 'main.rs'],
+            'run': ['./main'],
+            'artifacts': ['main'],
+        },
+    }
+
+    @staticmethod
+    def is_available(language: str) -> bool:
+        toolchain = LocalExecutor.TOOLCHAINS.get(language.lower())
+        if not toolchain:
+            return False
+        command = toolchain['compile'] or toolchain['run']
+        return shutil.which(command[0]) is not None
+
+    @staticmethod
+    def _limits(toolchain: Dict[str, Any], compile_step: bool = False) -> Dict[str, Any]:
+        limits = dict(settings.LOCAL_EXECUTOR_COMPILE_LIMITS if compile_step else settings.LOCAL_EXECUTOR_LIMITS)
+        limits['limit_address_space'] = toolchain.get('limit_address_space', True)
+        return limits
+
+    @staticmethod
+    def _env(workdir: str) -> Dict[str, str]:
+        return {
+            'PATH': os.environ.get('PATH', '/usr/bin:/bin'),
+            'HOME': workdir,
+            'LANG': 'C.UTF-8',
+            'GOCACHE': os.path.join(workdir, '.gocache'),
+            'GOPATH': os.path.join(workdir, '.gopath'),
+            # HOME points at the workdir, so keep rustup's real toolchain location
+            'RUSTUP_HOME': os.environ.get('RUSTUP_HOME', os.path.expanduser('~/.rustup')),
+            'CARGO_HOME': os.environ.get('CARGO_HOME', os.path.expanduser('~/.cargo')),
+        }
+
+    @staticmethod
+    def _command(argv: List[str]) -> List[str]:
+        return list(settings.LOCAL_EXECUTOR_COMMAND_PREFIX) + argv
+
+    def _prepare(self, code: str, language: str, workdir: str) -> Optional[Dict[str, Any]]:
+        """
+        Write and, if needed, compile the source in `workdir`.
+
+        Builds of unchanged code are restored from the compile cache.
+
+        Returns a Judge0-shaped raw result if compilation failed, else None.
+        """
+        toolchain = self.TOOLCHAINS[language.lower()]
+        with open(os.path.join(workdir, toolchain['source']), 'w') as f:
+            f.write(code)
+
+        if toolchain['compile'] is None:
+            return None
+
+        compile_cache = get_compile_cache()
+        if compile_cache:
+            cache_key = compile_cache.make_key(code, language, toolchain['compile'])
+            if compile_cache.restore(cache_key, workdir):
+                return None
+
+        outcome = sandbox.run_process(
+            self._command(toolchain['compile']),
+            cwd=workdir,
+            limits=self._limits(toolchain, compile_step=True),
+            env=self._env(workdir)
+        )
+        if outcome['exit_code'] != 0:
+            return sandbox.compilation_error(outcome['stderr'] or outcome['stdout'] or 'Compilation failed')
+
+        if compile_cache:
+            compile_cache.store(cache_key, workdir, toolchain['artifacts'])
+        return None
+
+    @staticmethod
+    def _use_worker_pool(language: str) -> bool:
+        # Commands wrapped in a jail must be exec'd, which a warm worker cannot do
+        return (
+            language.lower() == 'python'
+            and settings.PYTHON_WORKER_POOL_SIZE > 0
+            and not settings.LOCAL_EXECUTOR_COMMAND_PREFIX
+        )
+
+    def _run_case(
+        self,
+        code: str,
+        language: str,
+        workdir: str,
+        stdin: Optional[str],
+        stdin_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the prepared program against one input and return a raw result.
+
+        An existing `stdin_path` (a test-case store file) is read by the
+        program directly instead of writing `stdin` out first.
+        """
+        toolchain = self.TOOLCHAINS[language.lower()]
+        if stdin_path is None:
+            stdin_path = os.path.join(workdir, '.stdin')
+            with open(stdin_path, 'w') as f:
+                f.write(stdin or '')
+
+        limits = self._limits(toolchain)
+        outcome = None
+        if self._use_worker_pool(language):
+            try:
+                outcome = get_pool().run(code, stdin_path, workdir, limits)
+            except WorkerError:
+                outcome = None
+
+        if outcome is None:
+            outcome = sandbox.run_process(
+                self._command(toolchain['run']),
+                cwd=workdir,
+                limits=limits,
+                stdin_path=stdin_path,
+                env=self._env(workdir)
+            )
+        return sandbox.to_judge0_result(outcome, limits)
+
+    def _unavailable(self, language: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': 'Unsupported language',
+            'message': f'No local toolchain installed for {language}'
+        }
+
+    def execute(self, code, language, stdin=None, expected_output=None, comparison='exact'):
+        if not self.is_available(language):
+            return self._unavailable(language)
+
+        try:
+            with tempfile.TemporaryDirectory(dir=settings.LOCAL_EXECUTOR_WORKDIR) as workdir:
+                result = self._prepare(code, language, workdir) or self._run_case(code, language, workdir, stdin)
+        except (OSError, subprocess.SubprocessError) as e:
+            return {
+                'success': False,
+                'error': 'Execution error',
+                'message': str(e)
+            }
+
+        return Judge0Service._format_result(result, expected_output, comparison)
+
+    def execute_batch(self, code, language, test_cases, comparison='exact'):
+        if not self.is_available(language):
+            return self._unavailable(language)
+
+        try:
+            with tempfile.TemporaryDirectory(dir=settings.LOCAL_EXECUTOR_WORKDIR) as workdir:
+                compile_error = self._prepare(code, language, workdir)
+                results = [
+                    compile_error or self._run_case(
+                        code, language, workdir, case.get('stdin'), case_stdin_path(case)
+                    )
+                    for case in test_cases
+                ]
+        except (OSError, subprocess.SubprocessError) as e:
+            return {
+                'success': False,
+                'error': 'Execution error',
+                'message': str(e)
+            }
+
+        return Judge0Service._format_batch_result(results, test_cases, comparison)
+
+
+EXECUTORS = {
+    Judge0Executor.name: Judge0Executor,
+    LocalExecutor.name: LocalExecutor,
+}
+
+
+def get_executor(name: Optional[str] = None) -> BaseExecutor:
+    """Return the executor named `name`, defaulting to CODE_EXECUTOR."""
+    name = name or settings.CODE_EXECUTOR
+    try:
+        return EXECUTORS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown code executor '{name}'")
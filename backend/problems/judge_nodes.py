@@ -0,0 +1,222 @@
+"""
+Routing across a pool of Judge0 nodes.
+
+JUDGE0_API_URLS lists the nodes, each optionally weighted as `url|weight`.
+Every submission goes to the healthy node with the lowest weighted load,
+where load is the runs this service has in flight on the node plus the
+queue length the node itself reported at its last health check. Tokens only
+exist on the node that created them, so callers keep the chosen node and
+poll it (and nothing else) for those tokens.
+
+Health and in-flight counts are kept in Redis so every process routes on
+the same picture. Nodes are health-checked by the `check_judge0_nodes`
+beat task; a node whose circuit breaker is open in this process is skipped
+too. Results older than a few check intervals are ignored, so a stopped
+beat cannot take nodes out of rotation for good.
+"""
+import hashlib
+import json
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List
+
+import requests
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from recallcode.redis_client import get_redis
+from .transport import get_transport
+
+
+HEALTH_KEY = 'judge0:nodes:health'
+INFLIGHT_PREFIX = 'judge0:nodes:inflight:'
+
+
+class Judge0Node:
+    """One Judge0 deployment."""
+
+    def __init__(self, url: str, weight: float = 1.0):
+        self.url = url.rstrip('/')
+        self.weight = weight
+        self.id = hashlib.sha1(self.url.encode('utf-8')).hexdigest()[:12]
+
+    @classmethod
+    def parse(cls, entry: str) -> 'Judge0Node':
+        """Build a node from a `url` or `url|weight` setting entry."""
+        url, _, weight = entry.strip().partition('|')
+        return cls(url, float(weight) if weight else 1.0)
+
+    def __repr__(self):
+        return f'Judge0Node({self.url!r}, weight={self.weight})'
+
+
+class Judge0Router:
+    """Chooses the Judge0 node for new submissions."""
+
+    def __init__(self, nodes: List[Judge0Node]):
+        if not nodes:
+            raise ValueError('At least one Judge0 node is required')
+        self.nodes = nodes
+
+    @staticmethod
+    def _inflight_key(node: Judge0Node) -> str:
+        return INFLIGHT_PREFIX + node.id
+
+    def _snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Health and load of every node, keyed by node id."""
+        now = time.time()
+        stale_after = settings.JUDGE0_HEALTH_CHECK_INTERVAL * 3
+        snapshot = {node.id: {'healthy': True, 'queue': 0, 'in_flight': 0} for node in self.nodes}
+
+        try:
+            with get_redis().pipeline(transaction=False) as pipe:
+                pipe.hgetall(HEALTH_KEY)
+                for node in self.nodes:
+                    pipe.zcount(self._inflight_key(node), now, '+inf')
+                health, *in_flight = pipe.execute()
+        except RedisError:
+            return snapshot
+
+        for node, count in zip(self.nodes, in_flight):
+            entry = snapshot[node.id]
+            entry['in_flight'] = count
+            checked = json.loads(health[node.id]) if node.id in health else None
+            if checked and now - checked['checked_at'] <= stale_after:
+                entry['healthy'] = checked['healthy']
+                entry['queue'] = checked.get('queue') or 0
+        return snapshot
+
+    def choose(self) -> Judge0Node:
+        """
+        Return the healthy node with the lowest load per unit of weight.
+
+        Ties are broken randomly so idle nodes share traffic. If no node
+        looks healthy the least loaded one is used anyway and its circuit
+        breaker decides.
+        """
+        if len(self.nodes) == 1:
+            return self.nodes[0]
+
+        snapshot = self._snapshot()
+        transport = get_transport()
+        candidates = [
+            node for node in self.nodes
+            if snapshot[node.id]['healthy'] and not transport.breaker_for(node.url).is_open()
+        ] or self.nodes
+
+        def score(node):
+            entry = snapshot[node.id]
+            return ((entry['in_flight'] + entry['queue']) / node.weight, random.random())
+
+        return min(candidates, key=score)
+
+    def acquire(self, node: Judge0Node, lease_id: Optional[str] = None) -> str:
+        """Count a run as in flight on `node` until released or the lease expires."""
+        lease_id = str(lease_id or uuid.uuid4())
+        if len(self.nodes) > 1:
+            expires = time.time() + settings.JUDGE0_NODE_LEASE
+            try:
+                get_redis().zadd(self._inflight_key(node), {lease_id: expires})
+            except RedisError:
+                pass
+        return lease_id
+
+    def release(self, node_url: str, lease_id: str):
+        """Stop counting a run started with `acquire` on the node at `node_url`."""
+        if len(self.nodes) == 1:
+            return
+        node = Judge0Node(node_url)
+        try:
+            with get_redis().pipeline(transaction=False) as pipe:
+                pipe.zrem(self._inflight_key(node), str(lease_id))
+                # Drop leases of runs whose release was lost
+                pipe.zremrangebyscore(self._inflight_key(node), '-inf', time.time())
+                pipe.execute()
+        except RedisError:
+            pass
+
+    @contextmanager
+    def route(self):
+        """Choose a node and count a run on it for the duration of the block."""
+        node = self.choose()
+        lease_id = self.acquire(node)
+        try:
+            yield node
+        finally:
+            self.release(node.url, lease_id)
+
+    @staticmethod
+    def probe(node: Judge0Node) -> Dict[str, Any]:
+        """
+        Check one node.
+
+        The health endpoint (JUDGE0_HEALTH_CHECK_PATH, `/workers` by default)
+        must answer 200. When it returns Judge0's worker list, the queued and
+        running submissions are reported as the node's queue.
+        """
+        from .services import Judge0Service
+
+        health = {'healthy': False, 'queue': None, 'checked_at': time.time()}
+        try:
+            # Straight to the session: a probe must not be retried or open breakers
+            response = get_transport().session.get(
+                node.url + settings.JUDGE0_HEALTH_CHECK_PATH,
+                headers=Judge0Service._headers(),
+                timeout=settings.JUDGE0_HEALTH_CHECK_TIMEOUT
+            )
+        except requests.exceptions.RequestException:
+            return health
+
+        health['healthy'] = response.status_code == 200
+        try:
+            workers = response.json()
+        except ValueError:
+            workers = None
+        if isinstance(workers, list):
+            health['queue'] = sum(
+                (worker.get('size') or 0) + (worker.get('working') or 0)
+                for worker in workers if isinstance(worker, dict)
+            )
+        return health
+
+    def check_health(self) -> Dict[str, Dict[str, Any]]:
+        """Probe every node and publish the results for all processes."""
+        results = {node.id: self.probe(node) for node in self.nodes}
+        try:
+            get_redis().hset(HEALTH_KEY, mapping={
+                node_id: json.dumps(health) for node_id, health in results.items()
+            })
+        except RedisError:
+            pass
+        return results
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Health, load and breaker state of every node."""
+        snapshot = self._snapshot()
+        transport = get_transport()
+        return [
+            {
+                'url': node.url,
+                'weight': node.weight,
+                'breaker_open': transport.breaker_for(node.url).is_open(),
+                **snapshot[node.id],
+            }
+            for node in self.nodes
+        ]
+
+
+_router = None
+_router_config = None
+
+
+def get_router() -> Judge0Router:
+    """Return the router for the configured JUDGE0_API_URLS."""
+    global _router, _router_config
+
+    config = tuple(settings.JUDGE0_API_URLS)
+    if _router is None or _router_config != config:
+        _router = Judge0Router([Judge0Node.parse(entry) for entry in config if entry.strip()])
+        _router_config = config
+    return _router
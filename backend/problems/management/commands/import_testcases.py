@@ -0,0 +1,79 @@
+"""
+Import hidden test cases for a problem into the test-case store.
+
+Cases are read from a directory of `<name>.in` files with matching
+`<name>.out` (or `<name>.ans`) expected outputs, in name order.
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from problems.models import Problem
+from problems.testcase_store import get_testcase_store
+
+OUTPUT_SUFFIXES = ('.out', '.ans')
+
+
+class Command(BaseCommand):
+    help = 'Import <name>.in/<name>.out test cases from a directory as the hidden tests of a problem'
+
+    def add_arguments(self, parser):
+        parser.add_argument('problem', help='Problem id or slug')
+        parser.add_argument('directory', help='Directory holding the test files')
+        parser.add_argument(
+            '--append',
+            action='store_true',
+            help='Add to the existing cases instead of replacing them'
+        )
+
+    def handle(self, *args, **options):
+        problem_ref = options['problem']
+        lookup = {'id': problem_ref} if problem_ref.isdigit() else {'slug': problem_ref}
+        try:
+            problem = Problem.objects.get(**lookup)
+        except Problem.DoesNotExist:
+            raise CommandError(f"Problem '{problem_ref}' not found")
+
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError(f"'{directory}' is not a directory")
+
+        store = get_testcase_store()
+        cases = []
+        if options['append'] and problem.test_manifest:
+            cases = store.manifest(problem.test_manifest)
+
+        names = sorted(name[:-3] for name in os.listdir(directory) if name.endswith('.in'))
+        for name in names:
+            output_path = next(
+                (
+                    os.path.join(directory, name + suffix) for suffix in OUTPUT_SUFFIXES
+                    if os.path.exists(os.path.join(directory, name + suffix))
+                ),
+                None
+            )
+            if output_path is None:
+                self.stderr.write(f'Skipping {name}: no expected output')
+                continue
+
+            input_path = os.path.join(directory, name + '.in')
+            with open(input_path, 'rb') as f:
+                input_digest = store.put(f)
+            with open(output_path, 'rb') as f:
+                output_digest = store.put(f)
+            cases.append({
+                'name': name,
+                'input': input_digest,
+                'output': output_digest,
+                'input_size': os.path.getsize(input_path),
+                'output_size': os.path.getsize(output_path),
+            })
+
+        if not cases:
+            raise CommandError('No test cases found')
+
+        problem.test_manifest = store.put_manifest(cases)
+        problem.save(update_fields=['test_manifest', 'updated_at'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{problem.title}: {len(cases)} test cases, manifest {problem.test_manifest[:12]}'
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-17 01:56
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutionJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('payload', models.JSONField(default=dict)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='execution_jobs', to='problems.submission')),
+            ],
+            options={
+                'db_table': 'execution_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['submission', 'created_at'], name='execution_j_submiss_1ed8fc_idx'), models.Index(fields=['status'], name='execution_j_status_4aee2c_idx')],
+            },
+        ),
+    ]
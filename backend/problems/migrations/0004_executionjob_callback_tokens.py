@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-17 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0003_executionjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='executionjob',
+            name='judge_results',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='executionjob',
+            name='tokens',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 02:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0004_executionjob_callback_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='executionjob',
+            name='judge_node',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+    ]
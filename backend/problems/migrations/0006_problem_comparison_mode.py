@@ -0,0 +1,23 @@
+# Generated by Django 5.0 on 2026-10-17 02:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0005_executionjob_judge_node'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='comparison_mode',
+            field=models.CharField(choices=[('exact', 'Exact (ignoring trailing whitespace)'), ('tokens', 'Whitespace-insensitive tokens'), ('float', 'Tokens with float tolerance'), ('unordered', 'Lines in any order')], default='exact', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='problem',
+            name='float_tolerance',
+            field=models.FloatField(default=1e-06),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0 on 2026-10-17 02:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0006_problem_comparison_mode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code_hash', models.CharField(max_length=64)),
+                ('runs', models.PositiveSmallIntegerField()),
+                ('runtime_min', models.FloatField()),
+                ('runtime_median', models.FloatField()),
+                ('runtime_p90', models.FloatField()),
+                ('memory_median', models.IntegerField()),
+                ('memory_peak', models.IntegerField()),
+                ('cases', models.JSONField(blank=True, default=list)),
+                ('measured_at', models.DateTimeField(auto_now=True)),
+                ('submission', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='execution_stats', to='problems.submission')),
+            ],
+            options={
+                'db_table': 'execution_stats',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-17 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0007_executionstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='input_generator',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='space_complexity',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='space_complexity_fit',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='time_complexity',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='time_complexity_fit',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.0 on 2026-10-17 02:28
+
+import hashlib
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def snapshot_existing_code(apps, schema_editor):
+    """Start the history of every existing submission with its current code."""
+    Submission = apps.get_model('problems', 'Submission')
+    SubmissionRevision = apps.get_model('problems', 'SubmissionRevision')
+
+    batch = []
+    for submission_id, code in Submission.objects.values_list('id', 'code').iterator(chunk_size=500):
+        batch.append(SubmissionRevision(
+            submission_id=submission_id,
+            number=1,
+            is_snapshot=True,
+            data=zlib.compress(code.encode('utf-8'), 9),
+            code_hash=hashlib.sha256(code.encode('utf-8')).hexdigest(),
+            size=len(code),
+        ))
+        if len(batch) >= 500:
+            SubmissionRevision.objects.bulk_create(batch)
+            batch = []
+    SubmissionRevision.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0008_complexity_estimates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('is_snapshot', models.BooleanField(default=False)),
+                ('depth', models.PositiveSmallIntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('code_hash', models.CharField(max_length=64)),
+                ('size', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='problems.submission')),
+            ],
+            options={
+                'db_table': 'submission_revisions',
+                'ordering': ['submission', 'number'],
+                'unique_together': {('submission', 'number')},
+            },
+        ),
+        migrations.RunPython(snapshot_existing_code, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+import recallcode.fields
+from recallcode.fields import compress_existing
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0009_submissionrevision'),
+    ]
+
+    operations = [
+        *compress_existing('problems', 'submission', 'code', recallcode.fields.CompressedTextField(), models.TextField()),
+    ]
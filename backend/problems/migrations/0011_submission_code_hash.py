@@ -0,0 +1,38 @@
+# Generated by Django 5.0 on 2026-10-17 02:33
+
+from django.db import migrations, models
+
+from problems.utils import source_hash
+
+
+def hash_existing_code(apps, schema_editor):
+    Submission = apps.get_model('problems', 'Submission')
+    batch = []
+    for submission in Submission.objects.only('id', 'code').order_by('id').iterator(chunk_size=500):
+        submission.code_hash = source_hash(submission.code)
+        batch.append(submission)
+        if len(batch) >= 500:
+            Submission.objects.bulk_update(batch, ['code_hash'])
+            batch = []
+    Submission.objects.bulk_update(batch, ['code_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0010_compress_submission_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='code_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='verdict_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.RunPython(hash_existing_code, migrations.RunPython.noop),
+    ]
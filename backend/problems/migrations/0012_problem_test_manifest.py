@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('problems', '0011_submission_code_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='test_manifest',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
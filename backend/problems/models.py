@@ -1,6 +1,9 @@
+import uuid
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.text import slugify
+from recallcode.fields import CompressedTextField
+from .utils import source_hash
 
 User = get_user_model()
 
@@ -14,6 +17,13 @@ class Problem(models.Model):
         ('hard', 'Hard'),
     ]
     
+    COMPARISON_CHOICES = [
+        ('exact', 'Exact (ignoring trailing whitespace)'),
+        ('tokens', 'Whitespace-insensitive tokens'),
+        ('float', 'Tokens with float tolerance'),
+        ('unordered', 'Lines in any order'),
+    ]
+    
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     description = models.TextField()
@@ -21,6 +31,12 @@ class Problem(models.Model):
     constraints = models.TextField(blank=True)
     examples = models.JSONField(default=list, blank=True)
     patterns = models.JSONField(default=list, blank=True)  # e.g., ["Two Pointers", "Sliding Window"]
+    comparison_mode = models.CharField(max_length=20, choices=COMPARISON_CHOICES, default='exact')
+    # Python program that reads a size n from stdin and prints a test input of that size
+    input_generator = models.TextField(blank=True)
+    float_tolerance = models.FloatField(default=1e-6)  # Absolute or relative, for 'float' mode
+    # Digest of the manifest of hidden test cases in the test-case store
+    test_manifest = models.CharField(max_length=64, blank=True)
     leetcode_id = models.IntegerField(null=True, blank=True, unique=True)
     leetcode_url = models.URLField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -38,6 +54,13 @@ class Problem(models.Model):
     def __str__(self):
         return self.title
     
+    @property
+    def comparison(self):
+        """Output comparison spec passed to the executors (see comparators.compare)."""
+        if self.comparison_mode == 'float':
+            return f'float:{self.float_tolerance}'
+        return self.comparison_mode
+    
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
@@ -59,7 +82,8 @@ class Submission(models.Model):
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='submissions')
     problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name='submissions')
-    code = models.TextField()
+    code = CompressedTextField()
+    code_hash = models.CharField(max_length=64, blank=True)  # source_hash of `code`, kept up to date by save()
     language = models.CharField(max_length=20, choices=LANGUAGE_CHOICES, default='python')
     runtime = models.IntegerField(null=True, blank=True)  # in milliseconds
     memory = models.IntegerField(null=True, blank=True)  # in KB
@@ -69,6 +93,13 @@ class Submission(models.Model):
     test_cases_passed = models.IntegerField(default=0)
     test_cases_total = models.IntegerField(default=0)
     notes = models.TextField(blank=True)  # Markdown notes
+    # ExecutionService.verdict_hash of the judging run the verdict above came from
+    verdict_hash = models.CharField(max_length=64, blank=True)
+    # Empirical complexity, e.g. "O(n log n)", and its fit quality (R^2, 0-1)
+    time_complexity = models.CharField(max_length=20, blank=True)
+    time_complexity_fit = models.FloatField(null=True, blank=True)
+    space_complexity = models.CharField(max_length=20, blank=True)
+    space_complexity_fit = models.FloatField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -84,3 +115,96 @@ class Submission(models.Model):
     
     def __str__(self):
         return f"{self.user.email} - {self.problem.title}"
+    
+    def save(self, *args, **kwargs):
+        self.code_hash = source_hash(self.code)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'code' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'code_hash'}
+        super().save(*args, **kwargs)
+
+
+class SubmissionRevision(models.Model):
+    """
+    One saved version of a submission's code, append-only.
+    
+    `data` holds a compressed snapshot or a delta against the previous
+    revision (see problems.revisions). The latest code is also kept in full
+    on `Submission.code`.
+    """
+    
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name='revisions')
+    number = models.PositiveIntegerField()  # 1-based, per submission
+    is_snapshot = models.BooleanField(default=False)
+    depth = models.PositiveSmallIntegerField(default=0)  # Deltas since the last snapshot
+    data = models.BinaryField()
+    code_hash = models.CharField(max_length=64)  # SHA-256 of this version, byte for byte
+    size = models.PositiveIntegerField()  # Length of the code in characters
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'submission_revisions'
+        ordering = ['submission', 'number']
+        unique_together = [['submission', 'number']]
+    
+    def __str__(self):
+        return f"Revision {self.number} of submission {self.submission_id}"
+
+
+class ExecutionStats(models.Model):
+    """Runtime and memory summary of repeated benchmark runs of a submission."""
+    
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE, related_name='execution_stats')
+    code_hash = models.CharField(max_length=64)  # source_hash of the benchmarked code
+    runs = models.PositiveSmallIntegerField()
+    runtime_min = models.FloatField()  # in milliseconds
+    runtime_median = models.FloatField()
+    runtime_p90 = models.FloatField()
+    memory_median = models.IntegerField()  # in KB
+    memory_peak = models.IntegerField()
+    cases = models.JSONField(default=list, blank=True)  # per test case: size, runtime min/median/p90, memory peak
+    measured_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'execution_stats'
+    
+    def __str__(self):
+        return f"Stats for submission {self.submission_id} ({self.runs} runs)"
+
+
+class ExecutionJob(models.Model):
+    """Asynchronous code execution job for a submission."""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    submission = models.ForeignKey(Submission, on_delete=models.CASCADE, related_name='execution_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    payload = models.JSONField(default=dict)  # code, language, stdin, expected_output
+    result = models.JSONField(default=dict, blank=True)
+    tokens = models.JSONField(default=list, blank=True)  # Judge0 tokens awaiting callbacks
+    judge_results = models.JSONField(default=dict, blank=True)  # token -> raw Judge0 result
+    judge_node = models.CharField(max_length=200, blank=True)  # Judge0 node holding the tokens
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'execution_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['submission', 'created_at']),
+            models.Index(fields=['status']),
+        ]
+    
+    def __str__(self):
+        return f"Execution job {self.id} ({self.status})"
+    
+    @property
+    def is_finished(self):
+        return self.status in ('completed', 'failed')
@@ -0,0 +1,108 @@
+"""
+Pre-flight syntax checks run before code is sent for execution.
+
+Code that cannot compile is rejected here instead of costing a judge round
+trip and an execution slot. Python is parsed in-process. Other languages
+use a syntax-only mode of their toolchain when it is installed; languages
+without a cheap check (or without a toolchain) are passed through.
+
+Checks err on the side of passing code: a check that cannot run, crashes or
+times out never rejects anything.
+"""
+import ast
+import os
+import shutil
+import subprocess
+import tempfile
+import traceback
+from typing import Optional
+
+from django.conf import settings
+
+from . import sandbox
+
+
+# source: file name for the code
+# command: syntax-only check; exits non-zero with diagnostics on stderr
+# GNU dialects are used so extensions accepted by the judge are not rejected
+SYNTAX_CHECKS = {
+    'javascript': {
+        'source': 'main.js',
+        'command': ['node', '--check', 'main.js'],
+    },
+    'c': {
+        'source': 'main.c',
+        'command': ['gcc', '-fsyntax-only', '-std=gnu11', 'main.c'],
+    },
+    'cpp': {
+        'source': 'main.cpp',
+        'command': ['g++', '-fsyntax-only', '-std=gnu++17', 'main.cpp'],
+    },
+    'go': {
+        'source': 'main.go',
+        'command': ['gofmt', '-e', '-l', 'main.go'],
+    },
+}
+
+
+def python_syntax_error(code: str) -> Optional[str]:
+    """Return the SyntaxError report for Python `code`, or None if it parses."""
+    try:
+        ast.parse(code, filename='main.py')
+    except (SyntaxError, ValueError) as e:
+        # ValueError: source contains null bytes
+        return ''.join(traceback.format_exception_only(type(e), e))
+    return None
+
+
+def toolchain_syntax_error(code: str, language: str) -> Optional[str]:
+    """Run the local syntax-only check for `language`; None if it passes or cannot run."""
+    check = SYNTAX_CHECKS.get(language)
+    if not check or shutil.which(check['command'][0]) is None:
+        return None
+
+    limits = dict(settings.LOCAL_EXECUTOR_COMPILE_LIMITS)
+    limits['wall_time'] = settings.EXECUTION_PRECHECK_TIMEOUT
+    limits['limit_address_space'] = False  # node reserves large virtual ranges
+
+    try:
+        with tempfile.TemporaryDirectory(dir=settings.LOCAL_EXECUTOR_WORKDIR) as workdir:
+            with open(os.path.join(workdir, check['source']), 'w') as f:
+                f.write(code)
+            outcome = sandbox.run_process(
+                list(settings.LOCAL_EXECUTOR_COMMAND_PREFIX) + check['command'],
+                cwd=workdir,
+                limits=limits,
+                env={
+                    'PATH': os.environ.get('PATH', '/usr/bin:/bin'),
+                    'HOME': workdir,
+                    'LANG': 'C.UTF-8',
+                }
+            )
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+    if outcome['timed_out'] or outcome['signal'] is not None or outcome['exit_code'] == 0:
+        return None
+    return outcome['stderr'] or outcome['stdout'] or 'Compilation failed'
+
+
+def syntax_error(code: str, language: str) -> Optional[str]:
+    """
+    Check `code` before execution.
+
+    Toolchain checks are skipped on the local executor, whose own compile
+    step is just as cheap and is cached.
+
+    Returns:
+        The compiler diagnostics if the code cannot compile, else None
+    """
+    if not settings.EXECUTION_PRECHECK_ENABLED:
+        return None
+
+    language = language.lower()
+    if language == 'python':
+        return python_syntax_error(code)
+    if settings.CODE_EXECUTOR == 'local':
+        return None
+    return toolchain_syntax_error(code, language)
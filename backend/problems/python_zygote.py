@@ -0,0 +1,127 @@
+"""
+Warm Python worker started by `problems.worker_pool.PythonWorkerPool`.
+
+Usage: python -I -S python_zygote.py
+
+The worker imports the modules solutions commonly use once, then serves
+jobs read as JSON lines on stdin. Each job is run in a forked child under
+the job's rlimits, so user code never runs in (or pollutes) the worker
+itself. The child's outcome is written back as one JSON line in the shape
+returned by `problems.sandbox.run_process`.
+
+Only the standard library may be imported here.
+"""
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from sandbox_runner import apply_limits  # noqa: E402
+
+# Warm the modules most solutions import
+import bisect  # noqa: E402,F401
+import collections  # noqa: E402,F401
+import functools  # noqa: E402,F401
+import heapq  # noqa: E402,F401
+import itertools  # noqa: E402,F401
+import math  # noqa: E402,F401
+import re  # noqa: E402,F401
+import string  # noqa: E402,F401
+import typing  # noqa: E402,F401
+
+
+def run_child(job):
+    """Body of the forked child: set up stdio and limits, run the code, exit."""
+    os.setpgid(0, 0)
+    signal.signal(signal.SIGALRM, signal.SIG_DFL)
+    os.chdir(job['workdir'])
+
+    stdin_fd = os.open(job['stdin_path'], os.O_RDONLY)
+    stdout_fd = os.open(os.path.join(job['workdir'], '.stdout'), os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    stderr_fd = os.open(os.path.join(job['workdir'], '.stderr'), os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    for source, target in ((stdin_fd, 0), (stdout_fd, 1), (stderr_fd, 2)):
+        os.dup2(source, target)
+        os.close(source)
+
+    # Fresh stdio objects; the worker's own may hold buffered request data
+    sys.stdin = open(0, 'r', encoding='utf-8', errors='replace', closefd=False)
+    sys.stdout = open(1, 'w', encoding='utf-8', closefd=False)
+    sys.stderr = open(2, 'w', encoding='utf-8', closefd=False)
+    sys.argv = ['main.py']
+
+    apply_limits(job['limits'])
+
+    exit_code = 0
+    try:
+        exec(compile(job['code'], 'main.py', 'exec'), {'__name__': '__main__'})
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            exit_code = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except BaseException:
+        exit_code = exit_code or 1
+    os._exit(exit_code)
+
+
+def run_job(job):
+    started = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_child(job)
+        finally:
+            os._exit(1)
+
+    timed_out = []
+
+    def on_alarm(signum, frame):
+        timed_out.append(True)
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, float(job['limits']['wall_time']))
+    _, status, usage = os.wait4(pid, 0)
+    signal.setitimer(signal.ITIMER_REAL, 0)
+
+    outcome = {
+        'exit_code': os.WEXITSTATUS(status) if os.WIFEXITED(status) else None,
+        'signal': os.WTERMSIG(status) if os.WIFSIGNALED(status) else None,
+        'timed_out': bool(timed_out),
+        'cpu_time': usage.ru_utime + usage.ru_stime,
+        'wall_time': time.monotonic() - started,
+        'max_rss_kb': usage.ru_maxrss,  # KB on Linux
+    }
+    for stream in ('stdout', 'stderr'):
+        with open(os.path.join(job['workdir'], '.' + stream), 'rb') as f:
+            outcome[stream] = f.read().decode('utf-8', errors='replace')
+    return outcome
+
+
+def main():
+    requests, responses = sys.stdin.buffer, sys.stdout.buffer
+    while True:
+        line = requests.readline()
+        if not line:
+            return
+        outcome = run_job(json.loads(line))
+        responses.write((json.dumps(outcome) + '\n').encode('utf-8'))
+        responses.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Content-addressed cache of execution results.
+
+Results are keyed by a hash of everything that determines a verdict
+(executor backend, normalized source, language, test input/expected
+output and comparison mode) and stored in
+the default Django cache (Redis), so identical runs from any user are served
+without a Judge0 round trip.
+"""
+import hashlib
+import json
+from typing import Optional, Dict, Any, List
+from django.conf import settings
+from django.core.cache import cache
+from .utils import normalize_source
+
+
+class ExecutionResultCache:
+    """Cache for formatted execution results."""
+    
+    KEY_PREFIX = 'exec:result:v2:'
+    METRICS_PREFIX = 'exec:result:metrics:'
+    METRICS = ('hits', 'misses', 'stores', 'skipped')
+    # Verdicts that do not depend on host load: Accepted, Wrong Answer,
+    # Compilation Error. Time limits and runtime errors (e.g. out of memory)
+    # can go either way between runs.
+    CACHEABLE_STATUSES = {3, 4, 6}
+    
+    @staticmethod
+    def make_key(
+        code: str,
+        language: str,
+        stdin: Optional[str] = None,
+        expected_output: Optional[str] = None,
+        test_cases: Optional[List[Dict[str, Optional[str]]]] = None,
+        backend: str = '',
+        comparison: str = 'exact'
+    ) -> str:
+        """Build the cache key for an execution request on `backend`."""
+        digest = hashlib.sha256()
+        parts = [
+            backend,
+            normalize_source(code),
+            language.lower(),
+            stdin or '',
+            expected_output or '',
+            test_cases or [],
+            comparison,
+        ]
+        for part in parts:
+            encoded = part.encode('utf-8') if isinstance(part, str) else json.dumps(part, sort_keys=True).encode('utf-8')
+            # Length-prefix every part so boundaries cannot be shifted
+            digest.update(len(encoded).to_bytes(8, 'big'))
+            digest.update(encoded)
+        return ExecutionResultCache.KEY_PREFIX + digest.hexdigest()
+    
+    @staticmethod
+    def get(key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result, or None on a miss."""
+        try:
+            result = cache.get(key)
+        except Exception:
+            # A cache outage must never fail an execution
+            return None
+        
+        ExecutionResultCache._incr('hits' if result is not None else 'misses')
+        if result is None:
+            return None
+        return dict(result, cached=True)
+    
+    @staticmethod
+    def set(key: str, result: Dict[str, Any]) -> bool:
+        """
+        Store a result.
+        
+        Only results with a verdict in CACHEABLE_STATUSES are cached, so
+        network errors and time-limit or runtime failures on a loaded host
+        are never replayed; neither are results larger than
+        EXECUTION_CACHE_MAX_ENTRY_BYTES. Entries expire after
+        EXECUTION_CACHE_TTL seconds.
+        """
+        if result.get('error') or result.get('status_id') not in ExecutionResultCache.CACHEABLE_STATUSES:
+            return False
+        
+        if len(json.dumps(result)) > settings.EXECUTION_CACHE_MAX_ENTRY_BYTES:
+            ExecutionResultCache._incr('skipped')
+            return False
+        
+        try:
+            cache.set(key, result, timeout=settings.EXECUTION_CACHE_TTL)
+        except Exception:
+            return False
+        
+        ExecutionResultCache._incr('stores')
+        return True
+    
+    @staticmethod
+    def _incr(metric: str):
+        key = ExecutionResultCache.METRICS_PREFIX + metric
+        try:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def stats() -> Dict[str, int]:
+        """Hit/miss counters shared by all workers."""
+        try:
+            values = cache.get_many([ExecutionResultCache.METRICS_PREFIX + m for m in ExecutionResultCache.METRICS])
+        except Exception:
+            values = {}
+        return {
+            metric: values.get(ExecutionResultCache.METRICS_PREFIX + metric, 0)
+            for metric in ExecutionResultCache.METRICS
+        }
@@ -0,0 +1,80 @@
+"""
+Delta encoding for submission revisions.
+
+Each revision stores either a snapshot (the whole source) or a delta against
+the previous revision, both zlib-compressed. A delta is a JSON list of
+operations over lines (line endings included):
+
+    [start, end]   copy lines start:end of the previous revision
+    "text"         insert literal text
+
+Edits to code usually touch a few lines, so a delta costs little more than
+the changed lines. Reading a revision starts from the closest snapshot at or
+before it and applies the deltas in order; snapshots are written at least
+every SUBMISSION_REVISION_SNAPSHOT_INTERVAL revisions to bound that chain.
+"""
+import json
+import zlib
+from difflib import SequenceMatcher
+from typing import List, Tuple
+
+COMPRESSION_LEVEL = 9
+
+
+def _compress(text: str) -> bytes:
+    return zlib.compress(text.encode('utf-8'), COMPRESSION_LEVEL)
+
+
+def _decompress(data: bytes) -> str:
+    return zlib.decompress(bytes(data)).decode('utf-8')
+
+
+def pack_snapshot(code: str) -> bytes:
+    """Compressed full source."""
+    return _compress(code)
+
+
+def make_delta(base: str, code: str) -> bytes:
+    """Compressed line delta turning `base` into `code`."""
+    base_lines = base.splitlines(keepends=True)
+    lines = code.splitlines(keepends=True)
+
+    operations = []
+    matcher = SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            operations.append([i1, i2])
+        elif tag in ('replace', 'insert'):
+            operations.append(''.join(lines[j1:j2]))
+    return _compress(json.dumps(operations, separators=(',', ':')))
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """Rebuild the source a delta was made for from its base."""
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for operation in json.loads(_decompress(delta)):
+        if isinstance(operation, str):
+            parts.append(operation)
+        else:
+            start, end = operation
+            parts.extend(base_lines[start:end])
+    return ''.join(parts)
+
+
+def replay(chain: List[Tuple[bool, bytes]]) -> str:
+    """
+    Rebuild the source at the end of a chain of (is_snapshot, data) pairs
+    that starts with a snapshot.
+    """
+    code = None
+    for is_snapshot, data in chain:
+        if is_snapshot:
+            code = _decompress(data)
+        elif code is None:
+            raise ValueError('Revision chain does not start with a snapshot')
+        else:
+            code = apply_delta(code, data)
+    if code is None:
+        raise ValueError('Empty revision chain')
+    return code
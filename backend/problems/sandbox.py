@@ -0,0 +1,135 @@
+"""
+Resource-limited subprocess runner used by the local executor.
+
+Programs run in their own process group under CPU, address-space, file-size,
+process-count and wall-clock limits, and nothing they start outlives them.
+Runtime and peak memory come from the child's rusage. This only bounds
+resources; filesystem and network isolation must come from
+LOCAL_EXECUTOR_COMMAND_PREFIX (e.g. nsjail or bwrap) or the container.
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+from typing import Dict, Any, List, Optional
+
+
+# Judge0 status IDs and descriptions, reused so results format identically
+STATUS_ACCEPTED = (3, 'Accepted')
+STATUS_TIME_LIMIT = (5, 'Time Limit Exceeded')
+STATUS_COMPILATION_ERROR = (6, 'Compilation Error')
+STATUS_SIGSEGV = (7, 'Runtime Error (SIGSEGV)')
+STATUS_SIGXFSZ = (8, 'Runtime Error (SIGXFSZ)')
+STATUS_SIGFPE = (9, 'Runtime Error (SIGFPE)')
+STATUS_SIGABRT = (10, 'Runtime Error (SIGABRT)')
+STATUS_NZEC = (11, 'Runtime Error (NZEC)')
+STATUS_OTHER = (12, 'Runtime Error (Other)')
+
+SIGNAL_STATUSES = {
+    signal.SIGSEGV: STATUS_SIGSEGV,
+    signal.SIGBUS: STATUS_SIGSEGV,
+    signal.SIGXFSZ: STATUS_SIGXFSZ,
+    signal.SIGFPE: STATUS_SIGFPE,
+    signal.SIGABRT: STATUS_SIGABRT,
+    signal.SIGXCPU: STATUS_TIME_LIMIT,
+}
+
+
+RUNNER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sandbox_runner.py')
+
+
+def run_process(
+    argv: List[str],
+    cwd: str,
+    limits: Dict[str, Any],
+    stdin_path: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Run `argv` under `limits` and collect its outcome.
+
+    The program is forked by `sandbox_runner.py` in a separate interpreter,
+    which applies the rlimits, enforces the wall clock and reports rusage.
+
+    Args:
+        argv: Command to run
+        cwd: Working directory; stdout/stderr are captured to files here
+        limits: Dict with `cpu_time` (s), `wall_time` (s), `memory_kb`,
+            `output_kb` and optionally `processes` and `limit_address_space`
+        stdin_path: File to use as standard input (optional)
+        env: Environment for the program
+
+    Returns:
+        Dict with exit_code, signal, timed_out, cpu_time (s), wall_time (s),
+        max_rss_kb, stdout and stderr
+    """
+    stdout_path = os.path.join(cwd, '.stdout')
+    stderr_path = os.path.join(cwd, '.stderr')
+    config_path = os.path.join(cwd, '.sandbox.json')
+    outcome_path = os.path.join(cwd, '.outcome.json')
+
+    with open(config_path, 'w') as f:
+        json.dump({
+            'argv': argv,
+            'env': env if env is not None else dict(os.environ),
+            'limits': limits,
+            'outcome_path': outcome_path,
+        }, f)
+
+    with open(stdin_path or os.devnull, 'rb') as stdin, \
+            open(stdout_path, 'wb') as stdout, \
+            open(stderr_path, 'wb') as stderr:
+        subprocess.run(
+            [sys.executable, '-I', '-S', RUNNER, config_path],
+            cwd=cwd,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+            close_fds=True,
+            start_new_session=True,
+            # The runner enforces wall_time itself; this only guards the runner
+            timeout=limits['wall_time'] + 10,
+        )
+
+    with open(outcome_path) as f:
+        outcome = json.load(f)
+    with open(stdout_path, 'rb') as f:
+        outcome['stdout'] = f.read().decode('utf-8', errors='replace')
+    with open(stderr_path, 'rb') as f:
+        outcome['stderr'] = f.read().decode('utf-8', errors='replace')
+
+    return outcome
+
+
+def to_judge0_result(outcome: Dict[str, Any], limits: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate a `run_process` outcome into a Judge0-shaped raw result."""
+    if outcome['timed_out'] or outcome['cpu_time'] > limits['cpu_time']:
+        status = STATUS_TIME_LIMIT
+    elif outcome['signal'] is not None:
+        status = SIGNAL_STATUSES.get(outcome['signal'], STATUS_OTHER)
+    elif outcome['exit_code'] != 0:
+        status = STATUS_NZEC
+    else:
+        status = STATUS_ACCEPTED
+
+    return {
+        'status': {'id': status[0], 'description': status[1]},
+        'stdout': outcome['stdout'],
+        'stderr': outcome['stderr'],
+        'compile_output': '',
+        'time': f"{outcome['cpu_time']:.3f}",
+        'memory': outcome['max_rss_kb'],
+    }
+
+
+def compilation_error(output: str) -> Dict[str, Any]:
+    """Judge0-shaped raw result for a failed compile."""
+    return {
+        'status': {'id': STATUS_COMPILATION_ERROR[0], 'description': STATUS_COMPILATION_ERROR[1]},
+        'stdout': '',
+        'stderr': '',
+        'compile_output': output,
+        'time': None,
+        'memory': None,
+    }
@@ -0,0 +1,143 @@
+"""
+Standalone runner started by `problems.sandbox.run_process`.
+
+Usage: python -I -S sandbox_runner.py <config.json>
+
+Runs in a fresh, small interpreter rather than a fork of the Django process:
+Linux carries the peak RSS of the pre-exec image into `ru_maxrss`, so forking
+the program from here keeps its reported memory close to what it really used.
+The program inherits this process's stdin/stdout/stderr. The outcome is
+written as JSON to `config["outcome_path"]`.
+
+Nothing the program started outlives it: once it exits its process group is
+killed, and descendants that left the group (e.g. daemons) are reparented to
+this process, a child subreaper, and killed as well.
+
+Only the standard library may be imported here.
+"""
+import ctypes
+import json
+import os
+import resource
+import signal
+import sys
+import time
+
+
+def apply_limits(limits):
+    cpu = int(limits['cpu_time'])
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    if limits.get('memory_kb'):
+        memory = int(limits['memory_kb']) * 1024
+        # Runtimes that reserve large virtual ranges (JVM, V8, Go) get a heap limit instead
+        kind = resource.RLIMIT_AS if limits.get('limit_address_space', True) else resource.RLIMIT_DATA
+        resource.setrlimit(kind, (memory, memory))
+    output = int(limits.get('output_kb', 1024)) * 1024
+    resource.setrlimit(resource.RLIMIT_FSIZE, (output, output))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if limits.get('processes'):
+        # Counts every process and thread of the user, not just the program's
+        processes = int(limits['processes'])
+        resource.setrlimit(resource.RLIMIT_NPROC, (processes, processes))
+
+
+PR_SET_CHILD_SUBREAPER = 36
+REAP_TIMEOUT = 1.0  # seconds
+
+
+def become_subreaper():
+    """Have orphaned descendants reparented to this process (Linux only)."""
+    try:
+        ctypes.CDLL(None, use_errno=True).prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0)
+    except (OSError, AttributeError):
+        pass
+
+
+def children():
+    """Pids of this process's children, from /proc."""
+    parent = str(os.getpid())
+    pids = []
+    try:
+        names = os.listdir('/proc')
+    except OSError:
+        return pids
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat') as f:
+                # pid (comm) state ppid ...; comm may contain spaces and parentheses
+                fields = f.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if fields[1] == parent:
+            pids.append(int(name))
+    return pids
+
+
+def kill_leftovers(group):
+    """Kill the process group `group` and every remaining child, and reap them."""
+    try:
+        os.killpg(group, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+    deadline = time.monotonic() + REAP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            for child in children():
+                try:
+                    os.kill(child, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            time.sleep(0.001)
+
+
+def main():
+    with open(sys.argv[1]) as f:
+        config = json.load(f)
+
+    become_subreaper()
+    started = time.monotonic()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.setpgid(0, 0)
+            apply_limits(config['limits'])
+            os.execvpe(config['argv'][0], config['argv'], config['env'])
+        except BaseException as e:
+            os.write(2, f'sandbox: cannot run {config["argv"][0]}: {e}\n'.encode())
+        os._exit(127)
+
+    timed_out = []
+
+    def on_alarm(signum, frame):
+        timed_out.append(True)
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, float(config['limits']['wall_time']))
+    _, status, usage = os.wait4(pid, 0)
+    signal.setitimer(signal.ITIMER_REAL, 0)
+    kill_leftovers(pid)
+
+    with open(config['outcome_path'], 'w') as f:
+        json.dump({
+            'exit_code': os.WEXITSTATUS(status) if os.WIFEXITED(status) else None,
+            'signal': os.WTERMSIG(status) if os.WIFSIGNALED(status) else None,
+            'timed_out': bool(timed_out),
+            'cpu_time': usage.ru_utime + usage.ru_stime,
+            'wall_time': time.monotonic() - started,
+            'max_rss_kb': usage.ru_maxrss,  # KB on Linux
+        }, f)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Problem, Submission
+from .admission import AdmissionController
+from .models import Problem, Submission, SubmissionRevision, ExecutionJob, ExecutionStats
 
 
 class ProblemSerializer(serializers.ModelSerializer):
@@ -9,15 +10,29 @@ class ProblemSerializer(serializers.ModelSerializer):
         model = Problem
         fields = (
             'id', 'title', 'slug', 'description', 'difficulty',
-            'constraints', 'examples', 'patterns', 'leetcode_id',
+            'constraints', 'examples', 'patterns', 'comparison_mode',
+            'float_tolerance', 'input_generator', 'leetcode_id',
             'leetcode_url', 'created_at', 'updated_at'
         )
         read_only_fields = ('id', 'slug', 'created_at', 'updated_at')
 
 
+class ExecutionStatsSerializer(serializers.ModelSerializer):
+    """Serializer for benchmark statistics of a submission."""
+    
+    class Meta:
+        model = ExecutionStats
+        fields = (
+            'runs', 'runtime_min', 'runtime_median', 'runtime_p90',
+            'memory_median', 'memory_peak', 'cases', 'measured_at'
+        )
+        read_only_fields = fields
+
+
 class SubmissionSerializer(serializers.ModelSerializer):
     """Serializer for Submission model."""
     
+    execution_stats = ExecutionStatsSerializer(read_only=True)
     problem_title = serializers.CharField(source='problem.title', read_only=True)
     problem_slug = serializers.CharField(source='problem.slug', read_only=True)
     problem_difficulty = serializers.CharField(source='problem.difficulty', read_only=True)
@@ -28,9 +43,22 @@ class SubmissionSerializer(serializers.ModelSerializer):
             'id', 'problem', 'problem_title', 'problem_slug', 'problem_difficulty',
             'code', 'language', 'runtime', 'memory', 'is_solved', 'is_accepted',
             'error_message', 'test_cases_passed', 'test_cases_total', 'notes',
-            'created_at', 'updated_at'
+            'execution_stats', 'time_complexity', 'time_complexity_fit',
+            'space_complexity', 'space_complexity_fit', 'created_at', 'updated_at'
+        )
+        read_only_fields = (
+            'id', 'time_complexity', 'time_complexity_fit',
+            'space_complexity', 'space_complexity_fit', 'created_at', 'updated_at'
         )
-        read_only_fields = ('id', 'created_at', 'updated_at')
+
+
+class SubmissionRevisionSerializer(serializers.ModelSerializer):
+    """Serializer for the metadata of a saved code version."""
+    
+    class Meta:
+        model = SubmissionRevision
+        fields = ('number', 'is_snapshot', 'code_hash', 'size', 'created_at')
+        read_only_fields = fields
 
 
 class SubmissionCreateSerializer(serializers.ModelSerializer):
@@ -44,3 +72,22 @@ class SubmissionCreateSerializer(serializers.ModelSerializer):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
+
+class ExecutionJobSerializer(serializers.ModelSerializer):
+    """Serializer for asynchronous execution jobs."""
+    
+    queue_position = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = ExecutionJob
+        fields = (
+            'id', 'submission', 'status', 'queue_position', 'result',
+            'created_at', 'started_at', 'finished_at'
+        )
+        read_only_fields = fields
+    
+    def get_queue_position(self, obj):
+        """Position in the admission queue while the job waits for a slot."""
+        if obj.status != 'queued':
+            return None
+        return AdmissionController.position(obj.submission.user_id, obj.id)
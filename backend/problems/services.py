@@ -1,107 +1,331 @@
 """
 Services for problem-related operations including code execution.
 """
+import base64
+import binascii
+import hashlib
+import json
+import time
+import uuid
 import requests
 from django.conf import settings
-from typing import Optional, Dict, Any
+from django.core import signing
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from typing import Optional, Dict, Any, List, Tuple
+from .admission import AdmissionController
+from .comparators import compare
+from .complexity import fit as fit_complexity
+from .judge_nodes import get_router
+from .models import ExecutionJob, ExecutionStats, Problem, Submission, SubmissionRevision
+from .precheck import syntax_error
+from .result_cache import ExecutionResultCache
+from .revisions import make_delta, pack_snapshot, replay
+from .sandbox import compilation_error
+from .signals import execution_completed
+from .testcase_store import case_size, case_stdin, expected_output, get_testcase_store
+from .transport import get_transport
+from .utils import percentile
+
+JUDGE0_CALLBACK_SALT = 'problems.judge0-callback'
+
+
+class Judge0Error(Exception):
+    """Judge0 request that did not produce a verdict."""
+    
+    def __init__(self, error: str, message: str = ''):
+        super().__init__(message or error)
+        self.error = error
+        self.message = message
+    
+    def as_result(self) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': self.error,
+            'message': self.message
+        }
 
 
 class Judge0Service:
     """Service for executing code using Judge0 API."""
     
+    # Map language names to Judge0 language IDs
+    LANGUAGE_IDS = {
+        'python': 92,  # Python 3
+        'javascript': 93,  # Node.js
+        'java': 91,  # Java
+        'cpp': 54,  # C++17
+        'c': 50,  # C
+        'go': 60,  # Go
+        'rust': 73,  # Rust
+    }
+    
+    # Judge0 rejects batches larger than this (MAX_SUBMISSION_BATCH_SIZE)
+    MAX_BATCH_SIZE = 20
+    
+    # Status IDs: 1=In Queue, 2=Processing
+    PENDING_STATUSES = (1, 2)
+    
+    # Text fields Judge0 sends base64 encoded in callbacks
+    ENCODED_FIELDS = ('stdout', 'stderr', 'compile_output', 'message')
+    
+    @staticmethod
+    def _language_id(language: str) -> int:
+        return Judge0Service.LANGUAGE_IDS.get(language.lower(), 92)  # Default to Python
+    
+    @staticmethod
+    def _headers() -> Dict[str, str]:
+        headers = {
+            'Content-Type': 'application/json',
+        }
+        
+        if settings.JUDGE0_API_KEY:
+            headers['X-RapidAPI-Key'] = settings.JUDGE0_API_KEY
+            headers['X-RapidAPI-Host'] = 'judge0-ce.p.rapidapi.com'
+        
+        return headers
+    
+    @staticmethod
+    def _api_url(base_url: Optional[str], path: str) -> str:
+        return (base_url or settings.JUDGE0_API_URL).rstrip('/') + path
+    
+    @staticmethod
+    def _is_pending(result: Dict) -> bool:
+        return (result.get('status') or {}).get('id') in Judge0Service.PENDING_STATUSES
+    
+    @staticmethod
+    def _poll_delays():
+        """
+        Yield sleep intervals for polling.
+        
+        Intervals start at JUDGE0_POLL_INITIAL_DELAY and double up to
+        JUDGE0_POLL_MAX_DELAY, so fast programs are picked up within tens of
+        milliseconds while long compiles are not hammered. Stops once
+        JUDGE0_POLL_TIMEOUT seconds have been spent.
+        """
+        delay = settings.JUDGE0_POLL_INITIAL_DELAY
+        deadline = time.monotonic() + settings.JUDGE0_POLL_TIMEOUT
+        while time.monotonic() + delay <= deadline:
+            yield delay
+            delay = min(delay * 2, settings.JUDGE0_POLL_MAX_DELAY)
+    
+    @staticmethod
+    def submit(
+        code: str,
+        language: str,
+        test_cases: List[Dict[str, Optional[str]]],
+        callback_url: Optional[str] = None,
+        base_url: Optional[str] = None
+    ) -> List[str]:
+        """
+        Create one Judge0 submission per test case and return their tokens.
+        
+        With `callback_url` Judge0 PUTs each finished submission to that URL,
+        so nobody has to poll. The tokens only exist on the node at
+        `base_url` (default JUDGE0_API_URL).
+        """
+        api_url = Judge0Service._api_url(base_url, '/submissions/batch')
+        language_id = Judge0Service._language_id(language)
+        batch_size = Judge0Service.MAX_BATCH_SIZE
+        
+        tokens = []
+        for start in range(0, len(test_cases), batch_size):
+            submissions = []
+            for case in test_cases[start:start + batch_size]:
+                submission = {
+                    'source_code': code,
+                    'language_id': language_id,
+                    'stdin': case_stdin(case),
+                }
+                if callback_url:
+                    submission['callback_url'] = callback_url
+                submissions.append(submission)
+            
+            response = get_transport().post(
+                api_url,
+                json={'submissions': submissions},
+                headers=Judge0Service._headers(),
+                timeout=10
+            )
+            
+            if response.status_code != 201:
+                raise Judge0Error(f'Judge0 API error: {response.status_code}', response.text)
+            
+            tokens.extend(item.get('token') for item in response.json())
+        
+        return tokens
+    
+    @staticmethod
+    def submit_and_wait(
+        code: str,
+        language: str,
+        stdin: Optional[str] = None,
+        base_url: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a single submission with `wait=true`.
+        
+        Judge0 holds the request open until the program finishes, saving the
+        polling round trips for short jobs. The returned result may still be
+        pending if Judge0 gave up waiting; it always carries the token.
+        """
+        response = get_transport().post(
+            Judge0Service._api_url(base_url, '/submissions'),
+            params={'base64_encoded': 'false', 'wait': 'true'},
+            json={
+                'source_code': code,
+                'language_id': Judge0Service._language_id(language),
+                'stdin': stdin or '',
+            },
+            headers=Judge0Service._headers(),
+            timeout=settings.JUDGE0_WAIT_TIMEOUT
+        )
+        
+        if response.status_code != 201:
+            raise Judge0Error(f'Judge0 API error: {response.status_code}', response.text)
+        
+        return response.json()
+    
+    @staticmethod
+    def fetch_results(tokens: List[str], base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Poll Judge0 until every token has finished.
+        
+        All pending tokens are fetched together through the batch endpoint
+        with exponential backoff between rounds (see `_poll_delays`).
+        `base_url` must be the node the tokens were submitted to.
+        
+        Returns:
+            Raw Judge0 results in the order of `tokens`
+        """
+        api_url = Judge0Service._api_url(base_url, '/submissions/batch')
+        batch_size = Judge0Service.MAX_BATCH_SIZE
+        results = {}
+        
+        for delay in Judge0Service._poll_delays():
+            time.sleep(delay)
+            pending = [token for token in tokens if token not in results]
+            
+            for start in range(0, len(pending), batch_size):
+                chunk = pending[start:start + batch_size]
+                response = get_transport().get(
+                    api_url,
+                    params={'tokens': ','.join(chunk), 'base64_encoded': 'false'},
+                    headers=Judge0Service._headers(),
+                    timeout=5
+                )
+                
+                if response.status_code != 200:
+                    continue
+                
+                for token, result in zip(chunk, response.json().get('submissions', [])):
+                    if result and not Judge0Service._is_pending(result):
+                        results[token] = result
+            
+            if len(results) == len(tokens):
+                return [results[token] for token in tokens]
+        
+        raise Judge0Error('Execution timeout', 'Code execution took too long')
+    
+    @staticmethod
+    def decode_callback(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode the base64 text fields of a submission sent to a callback."""
+        decoded = dict(result)
+        for field in Judge0Service.ENCODED_FIELDS:
+            if decoded.get(field):
+                try:
+                    decoded[field] = base64.b64decode(decoded[field]).decode('utf-8', errors='replace')
+                except (binascii.Error, ValueError):
+                    pass
+        return decoded
+    
     @staticmethod
     def execute_code(
         code: str,
         language: str,
         stdin: Optional[str] = None,
-        expected_output: Optional[str] = None
+        expected_output: Optional[str] = None,
+        comparison: str = 'exact'
     ) -> Dict[str, Any]:
         """
         Execute code using Judge0 API.
         
+        Short jobs are answered by a single `wait=true` request when
+        JUDGE0_WAIT is enabled; otherwise (or if Judge0 stops waiting) the
+        token is polled with exponential backoff. The run is routed to the
+        least loaded healthy Judge0 node and polled on that node.
+        
         Args:
             code: Source code to execute
             language: Programming language (python, javascript, java, cpp, c, go, rust)
             stdin: Standard input (optional)
             expected_output: Expected output for validation (optional)
+            comparison: How output is checked, see `comparators.compare`
         
         Returns:
             Dict with execution results
         """
-        # Map language names to Judge0 language IDs
-        language_map = {
-            'python': 92,  # Python 3
-            'javascript': 93,  # Node.js
-            'java': 91,  # Java
-            'cpp': 54,  # C++17
-            'c': 50,  # C
-            'go': 60,  # Go
-            'rust': 73,  # Rust
-        }
-        
-        language_id = language_map.get(language.lower(), 92)  # Default to Python
-        
-        # Judge0 API endpoint
-        api_url = f"{settings.JUDGE0_API_URL}/submissions"
-        
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        
-        if settings.JUDGE0_API_KEY:
-            headers['X-RapidAPI-Key'] = settings.JUDGE0_API_KEY
-            headers['X-RapidAPI-Host'] = 'judge0-ce.p.rapidapi.com'
-        
-        payload = {
-            'source_code': code,
-            'language_id': language_id,
-            'stdin': stdin or '',
-        }
-        
         try:
-            # Submit code
-            response = requests.post(
-                api_url,
-                json=payload,
-                headers=headers,
-                timeout=10
-            )
-            
-            if response.status_code != 201:
-                return {
-                    'success': False,
-                    'error': f'Judge0 API error: {response.status_code}',
-                    'message': response.text
-                }
-            
-            submission_token = response.json().get('token')
-            
-            # Poll for results
-            result_url = f"{settings.JUDGE0_API_URL}/submissions/{submission_token}"
-            import time
-            
-            for _ in range(10):  # Poll up to 10 times
-                time.sleep(1)
-                result_response = requests.get(result_url, headers=headers, timeout=5)
+            with get_router().route() as node:
+                if settings.JUDGE0_WAIT:
+                    result = Judge0Service.submit_and_wait(code, language, stdin, base_url=node.url)
+                    if not Judge0Service._is_pending(result):
+                        return Judge0Service._format_result(result, expected_output, comparison)
+                    tokens = [result.get('token')]
+                else:
+                    tokens = Judge0Service.submit(code, language, [{'stdin': stdin}], base_url=node.url)
                 
-                if result_response.status_code == 200:
-                    result = result_response.json()
-                    
-                    # Check if compilation/execution is complete
-                    status_id = result.get('status', {}).get('id')
-                    
-                    if status_id in [1, 2]:  # In Queue or Processing
-                        continue
-                    
-                    # Execution complete
-                    return Judge0Service._format_result(result, expected_output)
+                result = Judge0Service.fetch_results(tokens, base_url=node.url)[0]
+            return Judge0Service._format_result(result, expected_output, comparison)
             
+        except Judge0Error as e:
+            return e.as_result()
+        except requests.exceptions.RequestException as e:
             return {
                 'success': False,
-                'error': 'Execution timeout',
-                'message': 'Code execution took too long'
+                'error': 'Network error',
+                'message': str(e)
             }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': 'Execution error',
+                'message': str(e)
+            }
+    
+    @staticmethod
+    def execute_batch(
+        code: str,
+        language: str,
+        test_cases: List[Dict[str, Optional[str]]],
+        comparison: str = 'exact'
+    ) -> Dict[str, Any]:
+        """
+        Execute code against several test cases using Judge0 batch submissions.
+        
+        All cases are submitted through `/submissions/batch` to one Judge0
+        node and their tokens are polled together, so N cases cost one round
+        trip instead of N.
+        
+        Args:
+            code: Source code to execute
+            language: Programming language
+            test_cases: List of dicts with `stdin` and `expected_output`
+            comparison: How output is checked, see `comparators.compare`
+        
+        Returns:
+            Dict with aggregated execution results and a `cases` list holding
+            the formatted result of every test case
+        """
+        try:
+            with get_router().route() as node:
+                tokens = Judge0Service.submit(code, language, test_cases, base_url=node.url)
+                results = Judge0Service.fetch_results(tokens, base_url=node.url)
+            return Judge0Service._format_batch_result(results, test_cases, comparison)
             
+        except Judge0Error as e:
+            return e.as_result()
         except requests.exceptions.RequestException as e:
             return {
                 'success': False,
@@ -116,10 +340,56 @@ class Judge0Service:
             }
     
     @staticmethod
-    def _format_result(result: Dict, expected_output: Optional[str] = None) -> Dict[str, Any]:
-        """Format Judge0 result into our standard format."""
-        status_id = result.get('status', {}).get('id')
-        status_description = result.get('status', {}).get('description', 'Unknown')
+    def _format_batch_result(
+        results: List[Dict],
+        test_cases: List[Dict],
+        comparison: str = 'exact'
+    ) -> Dict[str, Any]:
+        """Format the results of a batch run into one aggregated result."""
+        cases = []
+        for result, case in zip(results, test_cases):
+            with expected_output(case) as expected:
+                cases.append(Judge0Service._format_result(result, expected, comparison))
+        passed = sum(1 for case in cases if case['is_accepted'])
+        failed = next(
+            ((index, case) for index, case in enumerate(cases) if not case['is_accepted']),
+            None
+        )
+        
+        output = {
+            'success': failed is None,
+            'is_accepted': failed is None,
+            'status': 'Accepted' if failed is None else failed[1]['status'],
+            'status_id': 3 if failed is None else failed[1]['status_id'],
+            'runtime': max((case['runtime'] for case in cases), default=0),
+            'memory': max((case['memory'] or 0 for case in cases), default=0),
+            'test_cases_passed': passed,
+            'test_cases_total': len(cases),
+            'cases': cases,
+        }
+        output['message'] = f"{passed}/{len(cases)} test cases passed"
+        
+        if failed is not None:
+            index, case = failed
+            output['error_message'] = f"Test case {index + 1}: {case.get('error_message', case['status'])}"
+        
+        return output
+    
+    @staticmethod
+    def _format_result(
+        result: Dict,
+        expected_output: Optional[str] = None,
+        comparison: str = 'exact'
+    ) -> Dict[str, Any]:
+        """
+        Format Judge0 result into our standard format.
+        
+        Output of accepted runs is checked against `expected_output` with the
+        `comparison` mode; a mismatch becomes Wrong Answer with a `mismatch`
+        describing the first difference.
+        """
+        status_id = (result.get('status') or {}).get('id')
+        status_description = (result.get('status') or {}).get('description', 'Unknown')
         
         # Status IDs: 3=Accepted, 4=Wrong Answer, 5=Time Limit, 6=Compilation Error, etc.
         is_accepted = status_id == 3
@@ -131,28 +401,748 @@ class Judge0Service:
             'is_accepted': is_accepted,
             'status': status_description,
             'status_id': status_id,
-            'stdout': result.get('stdout', ''),
-            'stderr': result.get('stderr', ''),
-            'compile_output': result.get('compile_output', ''),
-            'runtime': result.get('time', 0) * 1000,  # Convert to milliseconds
-            'memory': result.get('memory', 0),  # Already in KB
+            'stdout': result.get('stdout') or '',
+            'stderr': result.get('stderr') or '',
+            'compile_output': result.get('compile_output') or '',
+            'runtime': float(result.get('time') or 0) * 1000,  # Judge0 reports seconds as a string
+            'memory': result.get('memory') or 0,  # Already in KB
             'message': status_description,
         }
         
         if is_compilation_error:
-            output['error_message'] = result.get('compile_output', 'Compilation error')
+            output['error_message'] = output['compile_output'] or 'Compilation error'
         elif is_runtime_error:
-            output['error_message'] = result.get('stderr', 'Runtime error')
+            output['error_message'] = output['stderr'] or 'Runtime error'
         elif not is_accepted:
             output['error_message'] = status_description
         
         # Validate against expected output if provided
         if expected_output and is_accepted:
-            actual_output = output['stdout'].strip()
-            expected = expected_output.strip()
-            if actual_output != expected:
+            mismatch = compare(expected_output, output['stdout'], comparison)
+            if mismatch:
                 output['success'] = False
                 output['is_accepted'] = False
-                output['error_message'] = f'Expected: {expected}, Got: {actual_output}'
+                output['status'] = output['message'] = 'Wrong Answer'
+                output['status_id'] = 4
+                output['error_message'] = mismatch['message']
+                output['mismatch'] = mismatch
         
         return output
+
+
+class ExecutionService:
+    """Service for running submissions and recording their verdicts."""
+    
+    @staticmethod
+    def test_cases_for(problem: Problem) -> List[Dict[str, str]]:
+        """
+        Build the test cases of a problem: its examples, then the cases of its
+        test-case manifest.
+        
+        Examples are `{"input": ..., "output": ...}` objects; non-string values
+        are passed to the program as JSON. Manifest cases reference their data
+        in the test-case store (`stdin_blob`/`expected_blob`).
+        """
+        test_cases = []
+        for example in problem.examples or []:
+            if not isinstance(example, dict) or 'output' not in example:
+                continue
+            stdin, expected = example.get('input', ''), example['output']
+            test_cases.append({
+                'stdin': stdin if isinstance(stdin, str) else json.dumps(stdin),
+                'expected_output': expected if isinstance(expected, str) else json.dumps(expected),
+            })
+        
+        if problem.test_manifest:
+            for case in get_testcase_store().manifest(problem.test_manifest):
+                test_cases.append({
+                    'stdin_blob': case['input'],
+                    'expected_blob': case['output'],
+                    'size': case.get('input_size'),
+                })
+        return test_cases
+    
+    @staticmethod
+    def run(
+        code: str,
+        language: str,
+        stdin: Optional[str] = None,
+        expected_output: Optional[str] = None,
+        test_cases: Optional[List[Dict[str, Optional[str]]]] = None,
+        use_cache: bool = True,
+        comparison: str = 'exact'
+    ) -> Dict[str, Any]:
+        """
+        Execute code and return the formatted result.
+        
+        Code runs on the backend selected by CODE_EXECUTOR. When `test_cases`
+        is given the code is run against every case in one batch and
+        `stdin`/`expected_output` are ignored. Output is checked with the
+        `comparison` mode (see `comparators.compare`).
+        
+        Results are looked up in and written to ExecutionResultCache unless
+        `use_cache` is False or EXECUTION_CACHE_ENABLED is off.
+        """
+        from .executors import get_executor
+        
+        executor = get_executor()
+        use_cache = use_cache and settings.EXECUTION_CACHE_ENABLED
+        if use_cache:
+            cache_key = ExecutionResultCache.make_key(
+                code, language, stdin, expected_output, test_cases,
+                backend=executor.name, comparison=comparison
+            )
+            cached = ExecutionResultCache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        if test_cases:
+            result = executor.execute_batch(
+                code=code,
+                language=language,
+                test_cases=test_cases,
+                comparison=comparison
+            )
+        else:
+            result = executor.execute(
+                code=code,
+                language=language,
+                stdin=stdin,
+                expected_output=expected_output,
+                comparison=comparison
+            )
+        
+        if use_cache:
+            ExecutionResultCache.set(cache_key, result)
+        
+        return result
+    
+    @staticmethod
+    def record_result(
+        submission: Submission,
+        result: Dict[str, Any],
+        payload: Optional[Dict[str, Any]] = None
+    ) -> Submission:
+        """
+        Write an execution result onto a submission.
+        
+        Args:
+            submission: Submission instance
+            result: Result dict as returned by `run`
+            payload: The run that produced `result`; judging runs (with test
+                cases) are remembered so `stored_verdict` can answer them again
+        """
+        from srs.services import SRSService
+        
+        if result.get('success'):
+            submission.is_accepted = result.get('is_accepted', False)
+            submission.is_solved = result.get('is_accepted', False)
+        else:
+            submission.is_accepted = False
+            submission.is_solved = False
+        
+        if payload and payload.get('test_cases'):
+            submission.verdict_hash = ExecutionService.verdict_hash(payload)
+        else:
+            submission.verdict_hash = ''
+        submission.runtime = result.get('runtime')
+        submission.memory = result.get('memory')
+        submission.error_message = result.get('error_message', '')
+        if 'test_cases_total' in result:
+            submission.test_cases_passed = result['test_cases_passed']
+            submission.test_cases_total = result['test_cases_total']
+        else:
+            submission.test_cases_passed = 1 if result.get('is_accepted') else 0
+            submission.test_cases_total = 1
+        submission.save()
+        
+        # Create SRS review if solved
+        if submission.is_solved:
+            SRSService.create_review_for_submission(submission)
+        
+        if submission.is_accepted and settings.BENCHMARK_ON_ACCEPT and not BenchmarkService.is_fresh(submission):
+            from .tasks import benchmark_submission
+            transaction.on_commit(lambda: benchmark_submission.delay(submission.id))
+        
+        return submission
+    
+    @staticmethod
+    def verdict_hash(payload: Dict[str, Any]) -> str:
+        """Digest of what decides the verdict of a judging run, independent of the backend."""
+        key = ExecutionResultCache.make_key(
+            payload['code'],
+            payload['language'],
+            test_cases=payload.get('test_cases'),
+            comparison=payload.get('comparison', 'exact')
+        )
+        return key[len(ExecutionResultCache.KEY_PREFIX):]
+    
+    @staticmethod
+    def stored_verdict(submission: Submission, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        The submission's recorded verdict, if it is an acceptance for exactly
+        this judging run (same normalized code, test cases and comparison).
+        
+        Returns:
+            A result summarizing the recorded run with `unchanged` set (no
+            per-case details), or None if the code has to run
+        """
+        if not (submission.is_accepted and submission.verdict_hash and payload.get('test_cases')):
+            return None
+        if submission.verdict_hash != ExecutionService.verdict_hash(payload):
+            return None
+        
+        return {
+            'success': True,
+            'is_accepted': True,
+            'status': 'Accepted',
+            'status_id': 3,
+            'runtime': submission.runtime,
+            'memory': submission.memory,
+            'test_cases_passed': submission.test_cases_passed,
+            'test_cases_total': submission.test_cases_total,
+            'message': f"{submission.test_cases_passed}/{submission.test_cases_total} test cases passed",
+            'unchanged': True,
+        }
+    
+    @staticmethod
+    def precheck(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Reject a payload whose code cannot compile without executing it.
+        
+        Returns:
+            A Compilation Error result shaped like the executor's (one per
+            test case for batch payloads), or None if the code may run
+        """
+        error = syntax_error(payload['code'], payload['language'])
+        if error is None:
+            return None
+        
+        if payload.get('test_cases'):
+            return Judge0Service._format_batch_result(
+                [compilation_error(error)] * len(payload['test_cases']),
+                payload['test_cases']
+            )
+        return Judge0Service._format_result(compilation_error(error), payload.get('expected_output'))
+    
+    @staticmethod
+    def run_now(submission: Submission, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Run a payload synchronously if an execution slot is free.
+        
+        Returns the recorded result, or None if the user or the service is at
+        its concurrency limit; the caller should `enqueue` the run instead.
+        Code that fails the pre-check is answered without taking a slot.
+        """
+        result = ExecutionService.precheck(payload)
+        if result is not None:
+            ExecutionService.record_result(submission, result, payload)
+            return result
+        
+        slot_id = f'sync:{uuid.uuid4()}'
+        if not AdmissionController.acquire(submission.user_id, slot_id, queue=False)['admitted']:
+            return None
+        
+        try:
+            result = ExecutionService.run(**payload)
+            ExecutionService.record_result(submission, result, payload)
+        finally:
+            ExecutionService.release_slot(submission.user_id, slot_id)
+        return result
+    
+    @staticmethod
+    def enqueue(submission: Submission, payload: Dict[str, Any]) -> ExecutionJob:
+        """
+        Create an execution job and hand it to a Celery worker.
+        
+        The job is admitted after the surrounding transaction commits so the
+        worker never sees a job row that does not exist yet. Jobs without a
+        free slot stay queued until `release_slot` admits them. Jobs whose
+        code fails the pre-check are finished right away.
+        """
+        job = ExecutionJob.objects.create(submission=submission, payload=payload)
+        
+        result = ExecutionService.precheck(payload)
+        if result is not None:
+            ExecutionService.record_result(submission, result, payload)
+            return ExecutionService.finish_job(job, result)
+        
+        transaction.on_commit(lambda: ExecutionService.admit_job(job))
+        return job
+    
+    @staticmethod
+    def admit_job(job: ExecutionJob):
+        """Start a queued job if it gets a slot; otherwise leave it waiting in line."""
+        from .tasks import run_execution_job
+        
+        if AdmissionController.acquire(job.submission.user_id, job.id)['admitted']:
+            run_execution_job.delay(str(job.id))
+    
+    @staticmethod
+    def release_slot(user_id, slot_id):
+        """Give back an execution slot and start the queued jobs admitted in its place."""
+        from .tasks import run_execution_job
+        
+        for job_id in AdmissionController.release(user_id, slot_id):
+            transaction.on_commit(lambda job_id=job_id: run_execution_job.delay(job_id))
+    
+    @staticmethod
+    def run_job(job: ExecutionJob) -> ExecutionJob:
+        """
+        Run an execution job (called from the worker).
+        
+        With the Judge0 backend and JUDGE0_CALLBACK_BASE_URL set, the job is only
+        submitted here and completed later by Judge0's callbacks; otherwise it
+        runs to completion.
+        """
+        job.status = 'running'
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at'])
+        
+        if settings.JUDGE0_CALLBACK_BASE_URL and settings.CODE_EXECUTOR == 'judge0':
+            return ExecutionService.dispatch_with_callback(job)
+        
+        try:
+            result = ExecutionService.run(**job.payload)
+        except Exception as e:
+            result = {
+                'success': False,
+                'error': 'Execution error',
+                'message': str(e)
+            }
+        
+        ExecutionService.record_result(job.submission, result, job.payload)
+        return ExecutionService.finish_job(job, result)
+    
+    @staticmethod
+    def _job_cases(payload: Dict[str, Any]) -> List[Dict[str, Optional[str]]]:
+        return payload.get('test_cases') or [{
+            'stdin': payload.get('stdin'),
+            'expected_output': payload.get('expected_output'),
+        }]
+    
+    @staticmethod
+    def _job_cache_key(payload: Dict[str, Any]) -> Optional[str]:
+        if not (payload.get('use_cache', True) and settings.EXECUTION_CACHE_ENABLED):
+            return None
+        return ExecutionResultCache.make_key(
+            payload['code'],
+            payload['language'],
+            payload.get('stdin'),
+            payload.get('expected_output'),
+            payload.get('test_cases'),
+            backend='judge0',
+            comparison=payload.get('comparison', 'exact')
+        )
+    
+    @staticmethod
+    def callback_url(job: ExecutionJob) -> str:
+        """Public URL Judge0 reports results of `job` to, signed with the job id."""
+        signature = signing.dumps(str(job.id), salt=JUDGE0_CALLBACK_SALT)
+        return settings.JUDGE0_CALLBACK_BASE_URL.rstrip('/') + reverse('judge0-callback', args=[signature])
+    
+    @staticmethod
+    def dispatch_with_callback(job: ExecutionJob) -> ExecutionJob:
+        """
+        Submit a job to Judge0 with a callback URL instead of polling.
+        
+        A fallback `collect_execution_job` task is scheduled in case callbacks
+        are lost; it polls whatever is still missing.
+        """
+        from .tasks import collect_execution_job
+        
+        cache_key = ExecutionService._job_cache_key(job.payload)
+        if cache_key:
+            cached = ExecutionResultCache.get(cache_key)
+            if cached is not None:
+                ExecutionService.record_result(job.submission, cached, job.payload)
+                return ExecutionService.finish_job(job, cached)
+        
+        router = get_router()
+        node = router.choose()
+        router.acquire(node, lease_id=job.id)
+        job.judge_node = node.url  # Released by finish_job
+        try:
+            tokens = Judge0Service.submit(
+                job.payload['code'],
+                job.payload['language'],
+                ExecutionService._job_cases(job.payload),
+                callback_url=ExecutionService.callback_url(job),
+                base_url=node.url
+            )
+        except Judge0Error as e:
+            result = e.as_result()
+        except requests.exceptions.RequestException as e:
+            result = {
+                'success': False,
+                'error': 'Network error',
+                'message': str(e)
+            }
+        else:
+            # Callbacks may already have arrived; tokens are saved under the
+            # same lock they use so whichever comes last completes the job
+            with transaction.atomic():
+                job = ExecutionJob.objects.select_for_update().select_related('submission').get(id=job.id)
+                job.tokens = tokens
+                job.judge_node = node.url
+                job.save(update_fields=['tokens', 'judge_node'])
+                ExecutionService._complete_if_ready(job)
+            
+            collect_execution_job.apply_async(
+                (str(job.id),),
+                countdown=settings.JUDGE0_CALLBACK_TIMEOUT
+            )
+            return job
+        
+        ExecutionService.record_result(job.submission, result, job.payload)
+        return ExecutionService.finish_job(job, result)
+    
+    @staticmethod
+    def store_judge_results(job_id, results: Dict[str, Dict[str, Any]]) -> Optional[ExecutionJob]:
+        """
+        Attach finished Judge0 results (token -> raw result) to a pending job.
+        
+        Completes the job once a result for every token is present. Returns
+        None if the job does not exist.
+        """
+        with transaction.atomic():
+            try:
+                job = ExecutionJob.objects.select_for_update().select_related('submission').get(id=job_id)
+            except ExecutionJob.DoesNotExist:
+                return None
+            
+            if job.is_finished:
+                return job
+            
+            job.judge_results.update(results)
+            job.save(update_fields=['judge_results'])
+            ExecutionService._complete_if_ready(job)
+            return job
+    
+    @staticmethod
+    def fail_pending_job(job_id, result: Dict[str, Any]) -> Optional[ExecutionJob]:
+        """Finish a pending callback job with an error result unless it already finished."""
+        with transaction.atomic():
+            try:
+                job = ExecutionJob.objects.select_for_update().select_related('submission').get(id=job_id)
+            except ExecutionJob.DoesNotExist:
+                return None
+            
+            if not job.is_finished:
+                ExecutionService.record_result(job.submission, result, job.payload)
+                ExecutionService.finish_job(job, result)
+            return job
+    
+    @staticmethod
+    def _complete_if_ready(job: ExecutionJob):
+        if not job.tokens or any(token not in job.judge_results for token in job.tokens):
+            return
+        
+        raw_results = [job.judge_results[token] for token in job.tokens]
+        comparison = job.payload.get('comparison', 'exact')
+        if job.payload.get('test_cases'):
+            result = Judge0Service._format_batch_result(raw_results, job.payload['test_cases'], comparison)
+        else:
+            result = Judge0Service._format_result(raw_results[0], job.payload.get('expected_output'), comparison)
+        
+        cache_key = ExecutionService._job_cache_key(job.payload)
+        if cache_key:
+            ExecutionResultCache.set(cache_key, result)
+        
+        ExecutionService.record_result(job.submission, result, job.payload)
+        ExecutionService.finish_job(job, result)
+    
+    @staticmethod
+    def finish_job(job: ExecutionJob, result: Dict[str, Any]) -> ExecutionJob:
+        """Store the job result and notify completion listeners."""
+        # Results with an `error` key never reached a verdict (API, network, timeout)
+        job.status = 'failed' if result.get('error') else 'completed'
+        job.result = result
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'result', 'finished_at'])
+        
+        if job.judge_node:
+            get_router().release(job.judge_node, job.id)
+        ExecutionService.release_slot(job.submission.user_id, job.id)
+        execution_completed.send(sender=ExecutionJob, job=job, result=result)
+        return job
+
+
+class BenchmarkService:
+    """Service for measuring accepted submissions over repeated runs."""
+    
+    @staticmethod
+    def select_cases(test_cases: List[Dict[str, Optional[str]]], limit: int) -> List[Dict[str, Optional[str]]]:
+        """Pick up to `limit` test cases spread evenly from the smallest to the largest input."""
+        ordered = sorted(test_cases, key=case_size)
+        if len(ordered) <= limit:
+            return ordered
+        if limit == 1:
+            return ordered[-1:]
+        step = (len(ordered) - 1) / (limit - 1)
+        return [ordered[round(index * step)] for index in range(limit)]
+    
+    @staticmethod
+    def summarize(cases: List[Dict[str, Any]], case_results: List[Dict[str, Any]], runs: int) -> Dict[str, Any]:
+        """
+        Summarize `runs` repetitions of `cases`.
+        
+        `case_results` holds the formatted result of every case of every run,
+        run after run. A run's runtime is its slowest case, as for a normal
+        batch verdict.
+        """
+        count = len(cases)
+        by_run = [case_results[run * count:(run + 1) * count] for run in range(runs)]
+        run_runtimes = [max(case['runtime'] for case in results) for results in by_run]
+        run_memory = [max(case['memory'] or 0 for case in results) for results in by_run]
+        
+        per_case = []
+        for index, case in enumerate(cases):
+            runtimes = [results[index]['runtime'] for results in by_run]
+            per_case.append({
+                'size': case_size(case),
+                'runtime_min': min(runtimes),
+                'runtime_median': percentile(runtimes, 50),
+                'runtime_p90': percentile(runtimes, 90),
+                'memory_peak': max(results[index]['memory'] or 0 for results in by_run),
+            })
+        
+        return {
+            'runs': runs,
+            'runtime_min': min(run_runtimes),
+            'runtime_median': percentile(run_runtimes, 50),
+            'runtime_p90': percentile(run_runtimes, 90),
+            'memory_median': int(percentile(run_memory, 50)),
+            'memory_peak': max(run_memory),
+            'cases': per_case,
+        }
+    
+    @staticmethod
+    def run(submission: Submission, runs: Optional[int] = None) -> Tuple[Optional[ExecutionStats], Dict[str, Any]]:
+        """
+        Run a submission's code `runs` times over a spread of its problem's
+        test cases and store the summary as its ExecutionStats.
+        
+        All repetitions go out as one batch, so on Judge0 they cost a single
+        submission round trip. Stats are only stored if every run is accepted.
+        
+        Returns:
+            tuple: (ExecutionStats or None, the batch result)
+        """
+        runs = runs or settings.BENCHMARK_RUNS
+        problem = submission.problem
+        cases = BenchmarkService.select_cases(
+            ExecutionService.test_cases_for(problem) or [{'stdin': '', 'expected_output': None}],
+            settings.BENCHMARK_MAX_CASES
+        )
+        
+        result = ExecutionService.run(
+            code=submission.code,
+            language=submission.language,
+            test_cases=cases * runs,
+            use_cache=False,
+            comparison=problem.comparison
+        )
+        if not result.get('is_accepted'):
+            return None, result
+        
+        summary = BenchmarkService.summarize(cases, result['cases'], runs)
+        stats, _ = ExecutionStats.objects.update_or_create(
+            submission=submission,
+            defaults={'code_hash': submission.code_hash, **summary}
+        )
+        return stats, result
+    
+    @staticmethod
+    def is_fresh(submission: Submission) -> bool:
+        """Whether the submission has stats measured on its current code."""
+        try:
+            stats = submission.execution_stats
+        except ExecutionStats.DoesNotExist:
+            return False
+        return stats.code_hash == submission.code_hash
+
+
+class ComplexityService:
+    """Service for estimating the time and space complexity of submissions."""
+    
+    @staticmethod
+    def generate_inputs(problem: Problem, sizes: List[int]) -> Tuple[List[int], List[str], Optional[Dict[str, Any]]]:
+        """
+        Run the problem's input generator for every size.
+        
+        The generator is user-editable, so it runs on the executor like any
+        other code; its output is cached, so generators should be seeded.
+        
+        Returns:
+            tuple: (sizes, inputs, error result or None)
+        """
+        inputs = []
+        for size in sizes:
+            result = ExecutionService.run(
+                code=problem.input_generator,
+                language='python',
+                stdin=str(size)
+            )
+            if not result.get('is_accepted'):
+                if len(inputs) >= 3:
+                    break  # Larger inputs exceed the output limit; fit what we have
+                return [], [], result
+            inputs.append(result['stdout'])
+        return sizes[:len(inputs)], inputs, None
+    
+    @staticmethod
+    def analyze(submission: Submission) -> Dict[str, Any]:
+        """
+        Estimate the complexity of a submission and store it on the submission.
+        
+        The code runs COMPLEXITY_REPEATS times on generated inputs of every
+        size in COMPLEXITY_INPUT_SIZES (one batch). Sizes from the first
+        failing run on (e.g. a time limit) are left out of the fit.
+        
+        Returns:
+            Dict with `success`, the estimates and the per-size samples, or an
+            error result
+        """
+        problem = submission.problem
+        if not problem.input_generator:
+            return {
+                'success': False,
+                'error': 'No input generator',
+                'message': 'The problem has no input generator'
+            }
+        
+        sizes, inputs, error = ComplexityService.generate_inputs(problem, settings.COMPLEXITY_INPUT_SIZES)
+        if error:
+            return error
+        
+        repeats = settings.COMPLEXITY_REPEATS
+        cases = [{'stdin': stdin, 'expected_output': None} for stdin in inputs]
+        result = ExecutionService.run(
+            code=submission.code,
+            language=submission.language,
+            test_cases=cases * repeats,
+            use_cache=False
+        )
+        if 'cases' not in result:
+            return result
+        
+        samples = []
+        for index, size in enumerate(sizes):
+            runs = result['cases'][index::len(cases)]
+            if not all(run['is_accepted'] for run in runs):
+                break
+            samples.append({
+                'size': size,
+                'runtime': percentile([run['runtime'] for run in runs], 50),
+                'memory': max(run['memory'] or 0 for run in runs),
+            })
+        
+        measured = [sample['size'] for sample in samples]
+        time_fit = fit_complexity(
+            measured,
+            [sample['runtime'] for sample in samples],
+            min_growth=settings.COMPLEXITY_MIN_RUNTIME_GROWTH
+        )
+        space_fit = fit_complexity(
+            measured,
+            [sample['memory'] for sample in samples],
+            min_growth=settings.COMPLEXITY_MIN_MEMORY_GROWTH
+        )
+        if time_fit is None:
+            return {
+                'success': False,
+                'error': 'Not enough samples',
+                'message': f'Only {len(samples)} input sizes ran successfully'
+            }
+        
+        submission.time_complexity = time_fit['class']
+        submission.time_complexity_fit = time_fit['r2']
+        submission.space_complexity = space_fit['class']
+        submission.space_complexity_fit = space_fit['r2']
+        submission.save(update_fields=[
+            'time_complexity', 'time_complexity_fit',
+            'space_complexity', 'space_complexity_fit', 'updated_at'
+        ])
+        
+        return {
+            'success': True,
+            'time_complexity': time_fit,
+            'space_complexity': space_fit,
+            'samples': samples,
+        }
+
+
+class RevisionService:
+    """Service for the append-only code history of submissions."""
+    
+    @staticmethod
+    def _chain(submission_id, number: int) -> List[SubmissionRevision]:
+        """Revisions from the closest snapshot up to `number`, oldest first."""
+        # A snapshot is written at least every SUBMISSION_REVISION_SNAPSHOT_INTERVAL revisions
+        window = settings.SUBMISSION_REVISION_SNAPSHOT_INTERVAL
+        revisions = list(SubmissionRevision.objects.filter(
+            submission_id=submission_id,
+            number__lte=number,
+            number__gt=number - window
+        ).order_by('number'))
+        if not revisions or revisions[-1].number != number:
+            return []
+        start = max(i for i, revision in enumerate(revisions) if revision.is_snapshot)
+        return revisions[start:]
+    
+    @staticmethod
+    def reconstruct(submission: Submission, number: int) -> Optional[str]:
+        """
+        Rebuild the code of one revision.
+        
+        Returns:
+            The code, or None if the submission has no such revision
+        """
+        chain = RevisionService._chain(submission.id, number)
+        if not chain:
+            return None
+        return replay([(revision.is_snapshot, revision.data) for revision in chain])
+    
+    @staticmethod
+    def latest(submission: Submission) -> Optional[SubmissionRevision]:
+        return submission.revisions.order_by('-number').first()
+    
+    @staticmethod
+    def record(submission: Submission) -> SubmissionRevision:
+        """
+        Append the submission's current code as a new revision.
+        
+        Saving unchanged code does not add a revision; the latest one is
+        returned instead. Writes a snapshot when the delta chain reaches
+        SUBMISSION_REVISION_SNAPSHOT_INTERVAL or a delta would not be smaller.
+        
+        Returns:
+            The revision holding the current code
+        """
+        code = submission.code
+        code_hash = hashlib.sha256(code.encode('utf-8')).hexdigest()
+        
+        with transaction.atomic():
+            # Serialize writers of this submission's history
+            Submission.objects.select_for_update().filter(id=submission.id).first()
+            latest = RevisionService.latest(submission)
+            if latest and latest.code_hash == code_hash:
+                return latest
+            
+            snapshot = pack_snapshot(code)
+            data, is_snapshot, depth = snapshot, True, 0
+            if latest and latest.depth + 1 < settings.SUBMISSION_REVISION_SNAPSHOT_INTERVAL:
+                delta = make_delta(RevisionService.reconstruct(submission, latest.number), code)
+                if len(delta) < len(snapshot):
+                    data, is_snapshot, depth = delta, False, latest.depth + 1
+            
+            return SubmissionRevision.objects.create(
+                submission=submission,
+                number=latest.number + 1 if latest else 1,
+                is_snapshot=is_snapshot,
+                depth=depth,
+                data=data,
+                code_hash=code_hash,
+                size=len(code)
+            )
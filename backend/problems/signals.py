@@ -0,0 +1,8 @@
+"""
+Signals for problem-related events.
+"""
+from django.dispatch import Signal
+
+# Sent when an asynchronous execution job finishes.
+# Receivers get `job` (ExecutionJob) and `result` (formatted result dict).
+execution_completed = Signal()
@@ -0,0 +1,108 @@
+"""
+Celery tasks for asynchronous code execution.
+"""
+import requests
+from celery import shared_task
+from django.conf import settings
+from .admission import AdmissionController
+from .judge_nodes import get_router
+from .models import ExecutionJob, Submission
+from .services import BenchmarkService, ComplexityService, ExecutionService, Judge0Service, Judge0Error
+
+
+@shared_task
+def run_execution_job(job_id):
+    """Run a queued execution job and record its verdict."""
+    try:
+        job = ExecutionJob.objects.select_related('submission').get(id=job_id)
+    except ExecutionJob.DoesNotExist:
+        return f"Execution job {job_id} not found"
+    
+    # Redelivered or already handled jobs are not run twice
+    if job.status != 'queued':
+        return f"Execution job {job_id} already {job.status}"
+    
+    ExecutionService.run_job(job)
+    return f"Execution job {job_id} {job.status}"
+
+
+@shared_task
+def collect_execution_job(job_id):
+    """Poll Judge0 for a callback job whose callbacks have not all arrived."""
+    try:
+        job = ExecutionJob.objects.get(id=job_id)
+    except ExecutionJob.DoesNotExist:
+        return f"Execution job {job_id} not found"
+    
+    if job.is_finished:
+        return f"Execution job {job_id} already {job.status}"
+    
+    missing = [token for token in job.tokens if token not in job.judge_results]
+    try:
+        results = Judge0Service.fetch_results(missing, base_url=job.judge_node or None)
+    except Judge0Error as e:
+        job = ExecutionService.fail_pending_job(job_id, e.as_result())
+        return f"Execution job {job_id} {job.status}"
+    except requests.exceptions.RequestException as e:
+        job = ExecutionService.fail_pending_job(job_id, {
+            'success': False,
+            'error': 'Network error',
+            'message': str(e)
+        })
+        return f"Execution job {job_id} {job.status}"
+    
+    job = ExecutionService.store_judge_results(job_id, dict(zip(missing, results)))
+    return f"Execution job {job_id} {job.status}"
+
+
+@shared_task
+def check_judge0_nodes():
+    """Health-check every Judge0 node so routing skips the unhealthy ones."""
+    results = get_router().check_health()
+    healthy = sum(1 for health in results.values() if health['healthy'])
+    return f"{healthy}/{len(results)} Judge0 nodes healthy"
+
+
+@shared_task(bind=True, max_retries=20)
+def benchmark_submission(self, submission_id, runs=None):
+    """Benchmark an accepted submission once an execution slot is free."""
+    try:
+        submission = Submission.objects.select_related('problem').get(id=submission_id)
+    except Submission.DoesNotExist:
+        return f"Submission {submission_id} not found"
+    
+    # Benchmarks share the user's execution slots; wait for one instead of queueing
+    slot_id = f'benchmark:{self.request.id}'
+    if not AdmissionController.acquire(submission.user_id, slot_id, queue=False)['admitted']:
+        raise self.retry(countdown=settings.BENCHMARK_RETRY_DELAY)
+    
+    try:
+        stats, result = BenchmarkService.run(submission, runs)
+    finally:
+        ExecutionService.release_slot(submission.user_id, slot_id)
+    
+    if stats is None:
+        return f"Benchmark of submission {submission_id} not accepted: {result.get('error') or result.get('status')}"
+    return f"Benchmarked submission {submission_id}: median {stats.runtime_median:.1f} ms over {stats.runs} runs"
+
+
+@shared_task(bind=True, max_retries=20)
+def analyze_complexity(self, submission_id):
+    """Estimate the complexity of a submission once an execution slot is free."""
+    try:
+        submission = Submission.objects.select_related('problem').get(id=submission_id)
+    except Submission.DoesNotExist:
+        return f"Submission {submission_id} not found"
+    
+    slot_id = f'complexity:{self.request.id}'
+    if not AdmissionController.acquire(submission.user_id, slot_id, queue=False)['admitted']:
+        raise self.retry(countdown=settings.BENCHMARK_RETRY_DELAY)
+    
+    try:
+        result = ComplexityService.analyze(submission)
+    finally:
+        ExecutionService.release_slot(submission.user_id, slot_id)
+    
+    if not result.get('success'):
+        return f"Complexity analysis of submission {submission_id} failed: {result.get('message')}"
+    return f"Submission {submission_id}: time {submission.time_complexity}, space {submission.space_complexity}"
@@ -0,0 +1,241 @@
+"""
+Content-addressed store of test-case data.
+
+Inputs and expected outputs of large (hidden) test cases live on disk
+instead of the database. Every blob is stored once, zlib-compressed, under
+the SHA-256 of its content in TESTCASE_STORE_ROOT; a problem references its
+cases through a manifest, itself a blob, whose digest is kept on
+`Problem.test_manifest`:
+
+    [{"name": "01", "input": <digest>, "output": <digest>,
+      "input_size": <bytes>, "output_size": <bytes>}, ...]
+
+Readers work on decompressed copies kept in TESTCASE_CACHE_DIR (evicted
+LRU past TESTCASE_CACHE_MAX_BYTES): the local executor hands such a file
+to the program as stdin without copying it, output checks stream it, and
+`mapped` exposes it as an mmap. TESTCASE_STORE_ROOT must be shared by all
+web and worker processes that execute code.
+
+Test-case dicts used by the executors may reference blobs with
+`stdin_blob`/`expected_blob` instead of carrying `stdin`/`expected_output`;
+`case_stdin`, `case_size` and `expected_output` resolve either form.
+"""
+import hashlib
+import io
+import json
+import mmap
+import os
+import threading
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Union, BinaryIO
+
+from django.conf import settings
+
+CHUNK_SIZE = 1024 * 1024
+COMPRESSION_LEVEL = 6
+
+
+class TestCaseStore:
+    """Compressed blob store with decompressed, size-bounded read copies."""
+
+    def __init__(self, root: str, cache_dir: str, cache_max_bytes: int):
+        self.root = root
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _fan_out(directory: str, digest: str) -> str:
+        if len(digest) != 64 or not all(c in '0123456789abcdef' for c in digest):
+            raise ValueError(f'Invalid blob digest {digest!r}')
+        return os.path.join(directory, digest[:2], digest)
+
+    def _blob_path(self, digest: str) -> str:
+        return self._fan_out(self.root, digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._blob_path(digest))
+
+    def put(self, source: Union[bytes, str, BinaryIO]) -> str:
+        """
+        Store data (bytes, text or a binary file) and return its digest.
+
+        Files are hashed and compressed in chunks, so inputs of any size are
+        never held in memory. Storing existing content is a no-op.
+        """
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+
+        os.makedirs(self.root, exist_ok=True)
+        staging = os.path.join(self.root, f'.{uuid.uuid4().hex}')
+        digest = hashlib.sha256()
+        compressor = zlib.compressobj(COMPRESSION_LEVEL)
+        try:
+            with open(staging, 'wb') as f:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    f.write(compressor.compress(chunk))
+                f.write(compressor.flush())
+
+            digest = digest.hexdigest()
+            path = self._blob_path(digest)
+            if os.path.exists(path):
+                os.unlink(staging)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(staging, path)
+        except BaseException:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            raise
+        return digest
+
+    def path(self, digest: str) -> str:
+        """
+        Path of a decompressed copy of the blob, created on first use.
+
+        The copy is checked against the digest before it is published.
+        """
+        path = self._fan_out(self.cache_dir, digest)
+        try:
+            os.utime(path)  # Mark as recently used
+            return path
+        except FileNotFoundError:
+            pass
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging = f'{path}.{uuid.uuid4().hex}'
+        check = hashlib.sha256()
+        decompressor = zlib.decompressobj()
+        try:
+            with open(self._blob_path(digest), 'rb') as source, open(staging, 'wb') as target:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                    data = decompressor.decompress(chunk)
+                    check.update(data)
+                    target.write(data)
+                data = decompressor.flush()
+                check.update(data)
+                target.write(data)
+            if check.hexdigest() != digest:
+                raise ValueError(f'Test-case blob {digest} is corrupt')
+            # Atomic publish; a concurrent copy of the same blob is identical
+            os.replace(staging, path)
+        except BaseException:
+            if os.path.exists(staging):
+                os.unlink(staging)
+            raise
+
+        self.evict()
+        return path
+
+    def size(self, digest: str) -> int:
+        """Decompressed size of a blob in bytes."""
+        return os.path.getsize(self.path(digest))
+
+    @contextmanager
+    def mapped(self, digest: str):
+        """Map the blob read-only; yields an mmap (or b'' for empty blobs)."""
+        with open(self.path(digest), 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b''
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                yield data
+
+    @contextmanager
+    def stream(self, digest: str):
+        """Open the blob as a text stream (UTF-8, undecodable bytes replaced)."""
+        with open(self.path(digest), 'r', encoding='utf-8', errors='replace', newline='') as f:
+            yield f
+
+    def text(self, digest: str) -> str:
+        """The whole blob as text; for consumers that need a string (Judge0)."""
+        with self.mapped(digest) as data:
+            return bytes(data).decode('utf-8', errors='replace')
+
+    def put_manifest(self, cases: List[Dict[str, Any]]) -> str:
+        """Store a problem's list of test cases and return the manifest digest."""
+        return self.put(json.dumps(cases, sort_keys=True, separators=(',', ':')))
+
+    def manifest(self, digest: str) -> List[Dict[str, Any]]:
+        return json.loads(self.text(digest))
+
+    def evict(self):
+        """Drop least recently used read copies until they fit cache_max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for directory, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.cache_max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                total -= size
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_testcase_store() -> TestCaseStore:
+    """Return the process-wide test-case store."""
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = TestCaseStore(
+                settings.TESTCASE_STORE_ROOT,
+                settings.TESTCASE_CACHE_DIR,
+                settings.TESTCASE_CACHE_MAX_BYTES
+            )
+        return _store
+
+
+def case_stdin(case: Dict[str, Any]) -> str:
+    """Input of a test case as text."""
+    if case.get('stdin_blob'):
+        return get_testcase_store().text(case['stdin_blob'])
+    return case.get('stdin') or ''
+
+
+def case_stdin_path(case: Dict[str, Any]) -> Optional[str]:
+    """File holding the input of a store-backed test case, or None."""
+    if case.get('stdin_blob'):
+        return get_testcase_store().path(case['stdin_blob'])
+    return None
+
+
+def case_size(case: Dict[str, Any]) -> int:
+    """Input size of a test case in bytes (characters for inline inputs)."""
+    if case.get('stdin_blob'):
+        return case.get('size') or get_testcase_store().size(case['stdin_blob'])
+    return len(case.get('stdin') or '')
+
+
+@contextmanager
+def expected_output(case: Dict[str, Any]):
+    """Expected output of a test case: a string, a text stream or None."""
+    if case.get('expected_blob'):
+        with get_testcase_store().stream(case['expected_blob']) as stream:
+            yield stream
+    else:
+        yield case.get('expected_output')
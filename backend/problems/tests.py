@@ -1,3 +1,153 @@
-from django.test import TestCase
+import os
+import sys
+import tempfile
+from unittest import mock, skipIf, skipUnless
 
-# Create your tests here.
+import requests
+from django.test import SimpleTestCase, override_settings
+from urllib3.exceptions import NewConnectionError
+
+from . import sandbox
+from .result_cache import ExecutionResultCache
+from .transport import CircuitOpenError, JudgeTransport
+
+LOCAL_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def _response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return response
+
+
+class JudgeTransportTests(SimpleTestCase):
+    def setUp(self):
+        self.transport = JudgeTransport(max_retries=2, backoff_base=0, backoff_max=0)
+        self.send = mock.patch.object(self.transport.session, 'request').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_get_retried_on_gateway_error(self):
+        self.send.side_effect = [_response(502), _response(200)]
+        response = self.transport.get('http://judge/submissions/batch')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.send.call_count, 2)
+
+    def test_post_not_retried_after_read_timeout(self):
+        self.send.side_effect = requests.exceptions.ReadTimeout()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.transport.post('http://judge/submissions')
+        self.assertEqual(self.send.call_count, 1)
+
+    def test_post_not_retried_on_gateway_error(self):
+        self.send.return_value = _response(504)
+        self.assertEqual(self.transport.post('http://judge/submissions').status_code, 504)
+        self.assertEqual(self.send.call_count, 1)
+
+    def test_post_retried_when_not_sent_or_rejected(self):
+        refused = requests.exceptions.ConnectionError(
+            mock.Mock(reason=NewConnectionError(None, 'refused'))
+        )
+        self.send.side_effect = [refused, _response(429), _response(201)]
+        self.assertEqual(self.transport.post('http://judge/submissions').status_code, 201)
+        self.assertEqual(self.send.call_count, 3)
+
+    def test_retry_post_retries_like_get(self):
+        self.send.side_effect = [requests.exceptions.ReadTimeout(), _response(201)]
+        self.assertEqual(self.transport.post('http://judge/submissions', retry_post=True).status_code, 201)
+
+    def test_breaker_opens_after_failures(self):
+        transport = JudgeTransport(max_retries=0, failure_threshold=2, reset_timeout=60)
+        with mock.patch.object(transport.session, 'request', return_value=_response(500)) as send:
+            transport.get('http://judge/about')
+            transport.get('http://judge/about')
+            with self.assertRaises(CircuitOpenError):
+                transport.get('http://judge/about')
+        self.assertEqual(send.call_count, 2)
+        self.assertTrue(transport.breaker_for('http://judge/about').is_open())
+
+
+@override_settings(CACHES=LOCAL_CACHE)
+class ExecutionResultCacheTests(SimpleTestCase):
+    def test_key_ignores_formatting_but_not_input(self):
+        key = ExecutionResultCache.make_key('print(1)\n', 'python', '1', '1')
+        self.assertEqual(key, ExecutionResultCache.make_key('print(1)', 'Python', '1', '1'))
+        self.assertNotEqual(key, ExecutionResultCache.make_key('print(1)', 'python', '2', '1'))
+        self.assertNotEqual(key, ExecutionResultCache.make_key('print(1)', 'python', '1', '1', backend='local'))
+
+    def test_deterministic_verdict_round_trip(self):
+        key = ExecutionResultCache.make_key('print(1)', 'python', '', '1')
+        self.assertTrue(ExecutionResultCache.set(key, {'status_id': 3, 'status': 'Accepted'}))
+        self.assertEqual(ExecutionResultCache.get(key), {'status_id': 3, 'status': 'Accepted', 'cached': True})
+
+    def test_timing_dependent_verdicts_not_cached(self):
+        key = ExecutionResultCache.make_key('while True: pass', 'python')
+        for status_id in (5, 11):  # Time Limit Exceeded, Runtime Error (SIGKILL)
+            self.assertFalse(ExecutionResultCache.set(key, {'status_id': status_id}))
+        self.assertFalse(ExecutionResultCache.set(key, {'error': 'Judge0 unavailable'}))
+        self.assertIsNone(ExecutionResultCache.get(key))
+
+
+# Forks a detached grandchild that records its pid and sleeps, then exits
+DAEMON = """
+import os, sys, time
+if os.fork() == 0:
+    os.setsid()
+    if os.fork() == 0:
+        with open('daemon.pid', 'w') as f:
+            f.write(str(os.getpid()))
+        time.sleep(60)
+    os._exit(0)
+os.wait()
+while not os.path.exists('daemon.pid'):
+    time.sleep(0.01)
+print('done')
+"""
+
+
+def _alive(pid):
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except OSError:
+        return False
+
+
+class SandboxTests(SimpleTestCase):
+    LIMITS = {'cpu_time': 2, 'wall_time': 5, 'memory_kb': 256 * 1024, 'output_kb': 1024}
+
+    def run_python(self, code, workdir, limits=None):
+        with open(os.path.join(workdir, 'main.py'), 'w') as f:
+            f.write(code)
+        return sandbox.run_process(
+            [sys.executable, 'main.py'], cwd=workdir, limits=limits or self.LIMITS, env={'PATH': '/usr/bin:/bin'}
+        )
+
+    def test_outcome_of_normal_run(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            outcome = self.run_python('print(input()[::-1])', workdir)
+        self.assertEqual(outcome['exit_code'], 1)  # No stdin given
+        self.assertIn('EOFError', outcome['stderr'])
+        self.assertEqual(sandbox.to_judge0_result(outcome, self.LIMITS)['status']['id'], sandbox.STATUS_NZEC[0])
+
+    def test_wall_clock_limit(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            outcome = self.run_python('import time; time.sleep(10)', workdir, dict(self.LIMITS, wall_time=0.5))
+        self.assertTrue(outcome['timed_out'])
+        self.assertEqual(sandbox.to_judge0_result(outcome, self.LIMITS)['status']['id'], sandbox.STATUS_TIME_LIMIT[0])
+
+    @skipUnless(sys.platform.startswith('linux'), 'needs /proc and a child subreaper')
+    def test_detached_descendants_killed_after_exit(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            outcome = self.run_python(DAEMON, workdir)
+            with open(os.path.join(workdir, 'daemon.pid')) as f:
+                daemon = int(f.read())
+        self.assertEqual(outcome['stdout'], 'done\n')
+        self.assertFalse(outcome['timed_out'])
+        self.assertFalse(_alive(daemon))
+
+    @skipIf(os.geteuid() == 0, 'RLIMIT_NPROC does not apply to root')
+    def test_process_limit(self):
+        code = 'import os\nfor _ in range(50):\n    os.fork() or os._exit(0)\n'
+        with tempfile.TemporaryDirectory() as workdir:
+            outcome = self.run_python(code, workdir, dict(self.LIMITS, processes=1))
+        self.assertIn('BlockingIOError', outcome['stderr'])
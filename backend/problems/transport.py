@@ -0,0 +1,244 @@
+"""
+Pooled HTTP transport for the Judge0 client.
+
+One `JudgeTransport` is kept per process. It reuses keep-alive connections
+through a pooled `requests.Session`, retries throttled and unavailable
+responses with jittered exponential backoff, and trips a per-host circuit
+breaker so callers fail fast while the judge is down.
+
+Creating a Judge0 submission (POST) is not idempotent: after a read timeout
+or a gateway error the judge has usually accepted it already, and sending it
+again would run it twice. Such requests are only retried when they cannot
+have been accepted: the connection was never made, or the judge answered
+429 or 503.
+"""
+import os
+import random
+import threading
+import time
+from typing import Dict, Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from django.conf import settings
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of sending a request while a host's breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for a single judge host."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let a single trial request through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def is_open(self) -> bool:
+        """Return whether requests are being rejected, without changing state."""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class JudgeTransport:
+    """Keep-alive session with bounded retries and per-host circuit breakers."""
+
+    # Throttled or temporarily unavailable; safe to send again
+    RETRY_STATUSES = {429, 502, 503, 504}
+    # Rejected before the request was accepted; safe to send any method again
+    REJECTED_STATUSES = {429, 503}
+    IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.counters = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'breaker_rejections': 0,
+        }
+        self._lock = threading.Lock()
+
+    def breaker_for(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[host]
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when sent."""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _not_sent(error: requests.exceptions.RequestException) -> bool:
+        """Return whether a request failed before reaching the server."""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+    def request(self, method: str, url: str, retry_post: bool = False, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session.
+
+        Idempotent requests (and any request with `retry_post`) are retried
+        up to `max_retries` times on connection errors, timeouts and
+        statuses in RETRY_STATUSES; other requests only when they were not
+        sent or got a status in REJECTED_STATUSES. Raises CircuitOpenError
+        without touching the network while the host's breaker is open.
+        """
+        breaker = self.breaker_for(url)
+        idempotent = retry_post or method.upper() in self.IDEMPOTENT_METHODS
+        retry_statuses = self.RETRY_STATUSES if idempotent else self.REJECTED_STATUSES
+
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                self._count('breaker_rejections')
+                raise CircuitOpenError(f'Judge0 host {urlsplit(url).netloc} is unavailable (circuit open)')
+
+            self._count('requests')
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._count('failures')
+                breaker.record_failure()
+                if attempt == self.max_retries or not (idempotent or self._not_sent(e)):
+                    raise
+                self._count('retries')
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code >= 500:
+                self._count('failures')
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if response.status_code in retry_statuses and attempt < self.max_retries:
+                self._count('retries')
+                time.sleep(self._backoff(attempt, response))
+                continue
+
+            return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request('PUT', url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring: requests, retries, pool reuse and breaker states."""
+        connections = pooled_requests = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+                pooled_requests += pool.num_requests
+
+        with self._lock:
+            stats = dict(self.counters)
+            breakers = {
+                host: {'state': breaker.state, 'failures': breaker.failures, 'trips': breaker.trips}
+                for host, breaker in self.breakers.items()
+            }
+
+        stats['connections_opened'] = connections
+        stats['pool_hits'] = max(pooled_requests - connections, 0)
+        stats['breakers'] = breakers
+        return stats
+
+
+_transport = None
+_transport_pid = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> JudgeTransport:
+    """
+    Return the transport for the current process.
+
+    A new transport is built after a fork so worker processes never share
+    pooled sockets with their parent.
+    """
+    global _transport, _transport_pid
+
+    with _transport_lock:
+        if _transport is None or _transport_pid != os.getpid():
+            _transport = JudgeTransport(
+                pool_size=settings.JUDGE0_POOL_SIZE,
+                max_retries=settings.JUDGE0_MAX_RETRIES,
+                backoff_base=settings.JUDGE0_BACKOFF_BASE,
+                backoff_max=settings.JUDGE0_BACKOFF_MAX,
+                failure_threshold=settings.JUDGE0_BREAKER_FAILURE_THRESHOLD,
+                reset_timeout=settings.JUDGE0_BREAKER_RESET_TIMEOUT,
+            )
+            _transport_pid = os.getpid()
+        return _transport
@@ -1,12 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProblemViewSet, SubmissionViewSet
+from .views import ProblemViewSet, SubmissionViewSet, judge_stats, judge0_callback
 
 router = DefaultRouter()
 router.register(r'problems', ProblemViewSet, basename='problem')
 router.register(r'submissions', SubmissionViewSet, basename='submission')
 
 urlpatterns = [
+    path('judge/stats/', judge_stats, name='judge-stats'),
+    path('judge0/callback/<str:signature>/', judge0_callback, name='judge0-callback'),
     path('', include(router.urls)),
 ]
 
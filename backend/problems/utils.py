@@ -0,0 +1,38 @@
+"""
+Helpers for working with submitted source code and execution measurements.
+"""
+import hashlib
+from typing import List
+
+
+def normalize_source(code: str) -> str:
+    """
+    Normalize source code for hashing.
+    
+    Only changes that cannot alter program behaviour are applied: line
+    endings are unified, a leading BOM is dropped and trailing whitespace at
+    the end of the file is removed.
+    """
+    code = code.replace('\r\n', '\n').replace('\r', '\n')
+    if code.startswith('\ufeff'):
+        code = code[1:]
+    return code.rstrip()
+
+
+def source_hash(code: str) -> str:
+    """SHA-256 hex digest of the normalized source."""
+    return hashlib.sha256(normalize_source(code).encode('utf-8')).hexdigest()
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """
+    The q-th percentile (0-100) of `samples`, linearly interpolated
+    between the closest ranks.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        raise ValueError('percentile of no samples')
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
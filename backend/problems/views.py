@@ -1,14 +1,42 @@
 from rest_framework import viewsets, status, filters
-from rest_framework.decorators import action
+from rest_framework.decorators import (
+    action,
+    api_view,
+    authentication_classes,
+    permission_classes,
+    throttle_classes
+)
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from django.conf import settings
+from django.core import signing
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Problem, Submission
-from .serializers import ProblemSerializer, SubmissionSerializer, SubmissionCreateSerializer
-from .services import Judge0Service
+from .models import Problem, Submission, ExecutionJob
+from .serializers import (
+    ProblemSerializer,
+    SubmissionSerializer,
+    SubmissionCreateSerializer,
+    SubmissionRevisionSerializer,
+    ExecutionJobSerializer
+)
+from .services import ExecutionService, Judge0Service, RevisionService, JUDGE0_CALLBACK_SALT
+from .admission import AdmissionController
+from .judge_nodes import get_router
+from .result_cache import ExecutionResultCache
+from .utils import source_hash
+from .tasks import analyze_complexity, benchmark_submission
+from .transport import get_transport
 from srs.services import SRSService
 
 
+def _is_truthy(value):
+    """Interpret a request flag sent as JSON bool or form string."""
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+
 class ProblemViewSet(viewsets.ModelViewSet):
     """ViewSet for Problem CRUD operations."""
     
@@ -42,10 +70,20 @@ class ProblemViewSet(viewsets.ModelViewSet):
             }
         )
         
-        if not created:
-            submission.code = serializer.validated_data['code']
-            submission.notes = serializer.validated_data.get('notes', '')
-            submission.save()
+        if created:
+            RevisionService.record(submission)
+        else:
+            code = serializer.validated_data['code']
+            notes = serializer.validated_data.get('notes', '')
+            if source_hash(code) != submission.code_hash:
+                submission.code = code
+                submission.notes = notes
+                submission.save()
+                RevisionService.record(submission)
+            elif notes != submission.notes:
+                # Same code: leave the code columns alone
+                submission.notes = notes
+                submission.save(update_fields=['notes', 'updated_at'])
         
         # Create SRS review if this is a solved submission
         if submission.is_solved:
@@ -68,7 +106,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     
     def get_queryset(self):
-        return Submission.objects.filter(user=self.request.user).select_related('problem')
+        return Submission.objects.filter(user=self.request.user).select_related('problem', 'execution_stats')
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -78,44 +116,213 @@ class SubmissionViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
         submission = serializer.instance
+        RevisionService.record(submission)
         if submission.is_solved:
             SRSService.create_review_for_submission(submission)
     
+    def perform_update(self, serializer):
+        submission = serializer.save()
+        RevisionService.record(submission)
+    
     @action(detail=True, methods=['post'])
     def execute(self, request, pk=None):
-        """Execute code for a submission using Judge0."""
+        """
+        Execute code for a submission.
+        
+        With `all_tests` set the code is run against every test case of the
+        problem in one Judge0 batch instead of a single `stdin`. Identical runs
+        are answered from the result cache unless `no_cache` is set. Output is
+        checked with the problem's comparison mode.
+        
+        With `async` set (or CODE_EXECUTION_ASYNC enabled) the run is queued as
+        an ExecutionJob and the job is returned immediately with 202; poll
+        `jobs/<job_id>/` for the result.
+        
+        Runs are subject to admission control. A synchronous run that finds
+        no free slot is queued the same way and answered with 202; queued
+        jobs report their `queue_position`.
+        
+        An `all_tests` run of code that is unchanged since it was accepted
+        returns the recorded verdict (with `unchanged` set) without running,
+        unless `force` or `no_cache` is set.
+        """
         submission = self.get_object()
         
-        code = request.data.get('code', submission.code)
-        language = request.data.get('language', submission.language)
-        stdin = request.data.get('stdin')
-        expected_output = request.data.get('expected_output')
-        
-        # Execute code
-        result = Judge0Service.execute_code(
-            code=code,
-            language=language,
-            stdin=stdin,
-            expected_output=expected_output
-        )
+        payload = {
+            'code': request.data.get('code', submission.code),
+            'language': request.data.get('language', submission.language),
+            'stdin': request.data.get('stdin'),
+            'expected_output': request.data.get('expected_output'),
+            'use_cache': not _is_truthy(request.data.get('no_cache', False)),
+            'comparison': submission.problem.comparison,
+        }
         
-        # Update submission with results
-        if result.get('success'):
-            submission.is_accepted = result.get('is_accepted', False)
-            submission.is_solved = result.get('is_accepted', False)
-        else:
-            submission.is_accepted = False
-            submission.is_solved = False
+        if _is_truthy(request.data.get('all_tests', False)):
+            payload['test_cases'] = ExecutionService.test_cases_for(submission.problem)
+            if not payload['test_cases']:
+                return Response(
+                    {'error': 'Problem has no test cases'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
         
-        submission.runtime = result.get('runtime')
-        submission.memory = result.get('memory')
-        submission.error_message = result.get('error_message', '')
-        submission.test_cases_passed = 1 if result.get('is_accepted') else 0
-        submission.test_cases_total = 1
-        submission.save()
+        force = _is_truthy(request.data.get('force', False)) or not payload['use_cache']
+        if not force:
+            verdict = ExecutionService.stored_verdict(submission, payload)
+            if verdict is not None:
+                return Response(verdict)
         
-        # Create SRS review if solved
-        if submission.is_solved:
-            SRSService.create_review_for_submission(submission)
+        if _is_truthy(request.data.get('async', settings.CODE_EXECUTION_ASYNC)):
+            job = ExecutionService.enqueue(submission, payload)
+            return Response(
+                ExecutionJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED
+            )
+        
+        # Execute code and update submission with results
+        result = ExecutionService.run_now(submission, payload)
+        if result is None:
+            # At the concurrency limit: wait in line instead of timing out
+            job = ExecutionService.enqueue(submission, payload)
+            return Response(
+                ExecutionJobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED
+            )
         
         return Response(result)
+    
+    @action(detail=True, methods=['post'])
+    def benchmark(self, request, pk=None):
+        """
+        Queue a benchmark run of an accepted submission.
+        
+        The code is run `runs` times (default BENCHMARK_RUNS) over a spread
+        of the problem's test cases; the summary appears as the submission's
+        `execution_stats` once done.
+        """
+        submission = self.get_object()
+        if not submission.is_accepted:
+            return Response(
+                {'error': 'Only accepted submissions can be benchmarked'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            runs = int(request.data.get('runs', settings.BENCHMARK_RUNS))
+        except (TypeError, ValueError):
+            runs = 0
+        if not 1 <= runs <= settings.BENCHMARK_MAX_RUNS:
+            return Response(
+                {'error': f'runs must be between 1 and {settings.BENCHMARK_MAX_RUNS}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        benchmark_submission.delay(submission.id, runs)
+        return Response(
+            {'status': 'queued', 'runs': runs},
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(detail=True, methods=['post'])
+    def analyze_complexity(self, request, pk=None):
+        """
+        Queue an empirical complexity analysis of an accepted submission.
+        
+        The estimates appear as the submission's `time_complexity` and
+        `space_complexity` (with their fit quality) once done.
+        """
+        submission = self.get_object()
+        if not submission.is_accepted:
+            return Response(
+                {'error': 'Only accepted submissions can be analyzed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not submission.problem.input_generator:
+            return Response(
+                {'error': 'Problem has no input generator'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        analyze_complexity.delay(submission.id)
+        return Response({'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=True, methods=['get'])
+    def revisions(self, request, pk=None):
+        """List the saved versions of the submission's code, newest first."""
+        submission = self.get_object()
+        revisions = submission.revisions.defer('data').order_by('-number')
+        return Response(SubmissionRevisionSerializer(revisions, many=True).data)
+    
+    @action(detail=True, methods=['get'], url_path=r'revisions/(?P<number>[0-9]+)')
+    def revision(self, request, pk=None, number=None):
+        """Get the code of one saved version of the submission."""
+        submission = self.get_object()
+        code = RevisionService.reconstruct(submission, int(number))
+        if code is None:
+            return Response(
+                {'error': 'Revision not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'number': int(number), 'code': code})
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path=r'jobs/(?P<job_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})'
+    )
+    def job_status(self, request, job_id=None):
+        """Get the status and result of an execution job."""
+        job = get_object_or_404(
+            ExecutionJob.objects.select_related('submission'),
+            id=job_id,
+            submission__user=request.user
+        )
+        return Response(ExecutionJobSerializer(job).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def judge_stats(request):
+    """Judge0 nodes, transport, result cache and admission counters (staff only)."""
+    return Response({
+        'admission': AdmissionController.stats(),
+        'nodes': get_router().stats(),
+        'transport': get_transport().stats(),
+        'result_cache': ExecutionResultCache.stats(),
+    })
+
+
+@api_view(['PUT', 'POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def judge0_callback(request, signature):
+    """
+    Receive a finished submission from Judge0.
+    
+    Judge0 cannot send our JWTs, so the request is authenticated by the
+    signed job id in the URL (see ExecutionService.callback_url).
+    """
+    try:
+        job_id = signing.loads(signature, salt=JUDGE0_CALLBACK_SALT)
+    except signing.BadSignature:
+        return Response(
+            {'error': 'Invalid callback signature'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    token = request.data.get('token')
+    if not token:
+        return Response(
+            {'error': 'token is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    result = Judge0Service.decode_callback(dict(request.data))
+    job = ExecutionService.store_judge_results(job_id, {token: result})
+    if job is None:
+        return Response(
+            {'error': 'Execution job not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response({'status': job.status})
@@ -0,0 +1,181 @@
+"""
+Pool of warm, pre-started Python workers for the local executor.
+
+Starting an interpreter per run costs tens of milliseconds before user code
+runs. Workers (`python_zygote.py`) are started ahead of time with common
+modules imported and fork a sandboxed child per job, so a short Python run
+only pays for a fork. Workers are recycled after PYTHON_WORKER_MAX_JOBS jobs
+and after any job that hit a resource limit.
+"""
+import json
+import os
+import queue
+import select
+import signal
+import subprocess
+import sys
+import threading
+from typing import Dict, Any
+
+from django.conf import settings
+
+
+ZYGOTE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python_zygote.py')
+
+# Signals that mean the child was stopped by an rlimit or the wall clock
+LIMIT_SIGNALS = {signal.SIGXCPU, signal.SIGXFSZ, signal.SIGKILL, signal.SIGSEGV}
+
+
+class WorkerError(Exception):
+    """Raised when a worker dies or stops responding."""
+
+
+class PythonWorker:
+    """One warm interpreter serving jobs over a pipe."""
+
+    def __init__(self):
+        self.jobs = 0
+        self.process = subprocess.Popen(
+            [sys.executable, '-I', '-S', ZYGOTE],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True,
+        )
+
+    def run(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            self.process.stdin.write((json.dumps(job) + '\n').encode('utf-8'))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f'Python worker is gone: {e}')
+
+        # The worker enforces wall_time itself; this only guards against a hung worker
+        ready, _, _ = select.select([self.process.stdout], [], [], job['limits']['wall_time'] + 5)
+        line = self.process.stdout.readline() if ready else b''
+        if not line:
+            raise WorkerError('Python worker did not respond')
+
+        self.jobs += 1
+        return json.loads(line)
+
+    def close(self):
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        self.process.wait()
+
+
+class PythonWorkerPool:
+    """Fixed-size pool of PythonWorkers shared by the threads of a process."""
+
+    def __init__(self, size: int, max_jobs: int):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.idle = queue.LifoQueue()
+        self.started = 0
+        self.counters = {
+            'jobs': 0,
+            'workers_started': 0,
+            'recycled': 0,
+        }
+        self._lock = threading.Lock()
+
+    def _start_worker(self) -> PythonWorker:
+        with self._lock:
+            self.counters['workers_started'] += 1
+        return PythonWorker()
+
+    def warm(self):
+        """Start all workers that are not running yet."""
+        while True:
+            with self._lock:
+                if self.started >= self.size:
+                    return
+                self.started += 1
+            self.idle.put(self._start_worker())
+
+    def _acquire(self) -> PythonWorker:
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_start = self.started < self.size
+            if can_start:
+                self.started += 1
+        if can_start:
+            return self._start_worker()
+        return self.idle.get()
+
+    def _release(self, worker: PythonWorker, recycle: bool):
+        if recycle or worker.jobs >= self.max_jobs:
+            worker.close()
+            with self._lock:
+                self.counters['recycled'] += 1
+            # Start the replacement now so it is warm by the next job
+            worker = self._start_worker()
+        self.idle.put(worker)
+
+    @staticmethod
+    def hit_limit(outcome: Dict[str, Any], limits: Dict[str, Any]) -> bool:
+        return (
+            outcome['timed_out']
+            or outcome['cpu_time'] > limits['cpu_time']
+            or outcome['signal'] in LIMIT_SIGNALS
+            or 'MemoryError' in outcome['stderr'][-500:]
+        )
+
+    def run(self, code: str, stdin_path: str, workdir: str, limits: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run Python `code` on a warm worker.
+
+        Returns an outcome dict in the shape of `sandbox.run_process`.
+        """
+        job = {
+            'code': code,
+            'stdin_path': stdin_path,
+            'workdir': workdir,
+            'limits': limits,
+        }
+
+        worker = self._acquire()
+        try:
+            outcome = worker.run(job)
+        except WorkerError:
+            self._release(worker, recycle=True)
+            raise
+
+        with self._lock:
+            self.counters['jobs'] += 1
+        self._release(worker, recycle=self.hit_limit(outcome, limits))
+        return outcome
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.counters)
+        stats['size'] = self.size
+        stats['idle'] = self.idle.qsize()
+        return stats
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> PythonWorkerPool:
+    """Return the worker pool of the current process, starting its workers."""
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = PythonWorkerPool(
+                size=settings.PYTHON_WORKER_POOL_SIZE,
+                max_jobs=settings.PYTHON_WORKER_MAX_JOBS,
+            )
+            _pool_pid = os.getpid()
+            _pool.warm()
+        return _pool
@@ -0,0 +1,169 @@
+"""
+Model fields that store large text and JSON compressed.
+
+Values are kept in a binary column (bytea on Postgres) with a one-byte
+header: values of at least `min_size` bytes are zlib-compressed, smaller
+ones are stored as plain UTF-8 where compression would not pay for itself.
+Compressed values stay compressed in Postgres, in its buffer cache, in
+backups and on the wire, and are only inflated in the application.
+
+Only `exact`/`isnull` lookups work on these columns; keep fields that are
+searched with `icontains` and similar as plain text.
+"""
+import json
+import zlib
+
+from django.db import migrations, models
+
+PLAIN = b'\x00'
+ZLIB = b'\x01'
+COMPRESSION_LEVEL = 6
+
+
+def pack(text: str, min_size: int) -> bytes:
+    """Encode text with the storage header, compressing it from `min_size` bytes on."""
+    data = text.encode('utf-8')
+    if len(data) >= min_size:
+        compressed = zlib.compress(data, COMPRESSION_LEVEL)
+        if len(compressed) < len(data):
+            return ZLIB + compressed
+    return PLAIN + data
+
+
+def unpack(data) -> str:
+    """Decode a value written by `pack`."""
+    data = bytes(data)  # memoryview on Postgres
+    header, payload = data[:1], data[1:]
+    if header == ZLIB:
+        payload = zlib.decompress(payload)
+    elif header != PLAIN:
+        raise ValueError(f'Unknown compressed value header {header!r}')
+    return payload.decode('utf-8')
+
+
+class CompressedTextField(models.TextField):
+    """TextField stored compressed; behaves like a TextField in Python, forms and serializers."""
+
+    description = 'Compressed text'
+
+    def __init__(self, *args, min_size: int = 256, **kwargs):
+        self.min_size = min_size
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.min_size != 256:
+            kwargs['min_size'] = self.min_size
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return 'BinaryField'
+
+    def encode(self, value) -> str:
+        return self.to_python(value)
+
+    def decode(self, text: str):
+        return text
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.decode(unpack(value))
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        return pack(self.encode(value), self.min_size)
+
+    def value_to_string(self, obj):
+        return self.encode(self.value_from_object(obj))
+
+
+class CompressedJSONField(CompressedTextField):
+    """JSON document stored compressed. Unlike JSONField it cannot be queried by key."""
+
+    description = 'Compressed JSON'
+
+    def __init__(self, *args, encoder=None, decoder=None, **kwargs):
+        self.encoder = encoder
+        self.decoder = decoder
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.encoder is not None:
+            kwargs['encoder'] = self.encoder
+        if self.decoder is not None:
+            kwargs['decoder'] = self.decoder
+        return name, path, args, kwargs
+
+    def to_python(self, value):
+        return value
+
+    def encode(self, value) -> str:
+        return json.dumps(value, cls=self.encoder, separators=(',', ':'))
+
+    def decode(self, text: str):
+        return json.loads(text, cls=self.decoder)
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        return models.JSONField(encoder=self.encoder, decoder=self.decoder).formfield(**kwargs)
+
+
+def compress_existing(
+    app_label: str,
+    model_name: str,
+    name: str,
+    field: models.Field,
+    old_field: models.Field,
+    batch_size: int = 500
+):
+    """
+    Migration operations converting the column `name` from `old_field` to `field`.
+
+    A compressed column is added next to the old one and filled in batches,
+    then replaces it; the old column is made nullable first so the migration
+    can be reversed. On Postgres the new column is marked STORAGE EXTERNAL so
+    TOAST does not try to compress already compressed values again.
+    """
+    temp = f'{name}_compressed'
+    temp_field = field.clone()
+    temp_field.null = True
+    nullable_field = old_field.clone()
+    nullable_field.null = True
+
+    def copy(source, target):
+        def run(apps, schema_editor):
+            model = apps.get_model(app_label, model_name)
+            rows = model.objects.only('pk', source).order_by('pk')
+            batch = []
+            for row in rows.iterator(chunk_size=batch_size):
+                setattr(row, target, getattr(row, source))
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    model.objects.bulk_update(batch, [target])
+                    batch = []
+            model.objects.bulk_update(batch, [target])
+        return run
+
+    def set_storage(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        model = apps.get_model(app_label, model_name)
+        schema_editor.execute('ALTER TABLE %s ALTER COLUMN %s SET STORAGE EXTERNAL' % (
+            schema_editor.quote_name(model._meta.db_table),
+            schema_editor.quote_name(model._meta.get_field(name).column),
+        ))
+
+    return [
+        migrations.AddField(model_name, temp, temp_field),
+        migrations.AlterField(model_name, name, nullable_field),
+        migrations.RunPython(copy(name, temp), copy(temp, name)),
+        migrations.RemoveField(model_name, name),
+        migrations.RenameField(model_name, temp, name),
+        migrations.AlterField(model_name, name, field),
+        migrations.RunPython(set_storage, migrations.RunPython.noop),
+    ]
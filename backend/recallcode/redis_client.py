@@ -0,0 +1,17 @@
+"""
+Shared Redis client for features that need more than the cache API
+(sorted sets, lists, Lua scripts).
+"""
+import redis
+from django.conf import settings
+
+_client = None
+
+
+def get_redis() -> redis.Redis:
+    """Return the process-wide Redis client for REDIS_URL."""
+    global _client
+    if _client is None:
+        # redis-py's connection pool resets itself after a fork
+        _client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
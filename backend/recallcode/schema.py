@@ -64,6 +64,12 @@ class SRSReviewType:
     total_reviews: int
 
 
+@strawberry.type
+class DueSummaryType:
+    due_count: int
+    next_due_at: Optional[str]
+
+
 @strawberry.django.type(DailyPlan)
 class DailyPlanType:
     id: strawberry.ID
@@ -161,6 +167,21 @@ class Query:
         from srs.services import SRSService
         reviews = SRSService.get_due_reviews(user, limit=limit)
         return list(reviews)
+    
+    @strawberry.field
+    def due_summary(self, info) -> Optional[DueSummaryType]:
+        """Number of due SRS reviews and when the next one is due."""
+        user = info.context.request.user
+        if not user.is_authenticated:
+            return None
+        
+        from srs.services import SRSService
+        summary = SRSService.get_due_summary(user)
+        next_due_at = summary['next_due_at']
+        return DueSummaryType(
+            due_count=summary['due_count'],
+            next_due_at=next_due_at.isoformat() if next_due_at else None
+        )
 
 
 @strawberry.type
@@ -206,7 +227,7 @@ class Mutation:
             raise Exception("Authentication required")
         
         try:
-            review = SRSReview.objects.get(id=review_id, submission__user=user)
+            review = SRSReview.objects.select_related('user').get(id=review_id, user=user)
         except SRSReview.DoesNotExist:
             raise Exception("Review not found")
         
@@ -3,6 +3,7 @@ Django settings for recallcode project.
 """
 
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 import environ
@@ -219,6 +220,136 @@ GROQ_API_KEY = env("GROQ_API_KEY", default="")
 # Judge0 Configuration
 JUDGE0_API_URL = env("JUDGE0_API_URL", default="https://judge0-ce.p.rapidapi.com")
 JUDGE0_API_KEY = env("JUDGE0_API_KEY", default="")
+# Judge0 nodes to balance across, each `url` or `url|weight`
+JUDGE0_API_URLS = env.list("JUDGE0_API_URLS", default=[]) or [JUDGE0_API_URL]
+JUDGE0_HEALTH_CHECK_PATH = env("JUDGE0_HEALTH_CHECK_PATH", default="/workers")
+JUDGE0_HEALTH_CHECK_INTERVAL = env.int("JUDGE0_HEALTH_CHECK_INTERVAL", default=15)  # seconds
+JUDGE0_HEALTH_CHECK_TIMEOUT = env.float("JUDGE0_HEALTH_CHECK_TIMEOUT", default=3.0)  # seconds
+# Runs not released within this time stop counting towards a node's load
+JUDGE0_NODE_LEASE = env.int("JUDGE0_NODE_LEASE", default=120)  # seconds
+CELERY_BEAT_SCHEDULE["check-judge0-nodes"] = {
+    "task": "problems.tasks.check_judge0_nodes",
+    "schedule": timedelta(seconds=JUDGE0_HEALTH_CHECK_INTERVAL),
+}
+# Judge0 HTTP transport (keep-alive pool, retries, circuit breaker)
+JUDGE0_POOL_SIZE = env.int("JUDGE0_POOL_SIZE", default=10)
+JUDGE0_MAX_RETRIES = env.int("JUDGE0_MAX_RETRIES", default=3)
+JUDGE0_BACKOFF_BASE = env.float("JUDGE0_BACKOFF_BASE", default=0.2)  # seconds
+JUDGE0_BACKOFF_MAX = env.float("JUDGE0_BACKOFF_MAX", default=2.0)  # seconds
+JUDGE0_BREAKER_FAILURE_THRESHOLD = env.int("JUDGE0_BREAKER_FAILURE_THRESHOLD", default=5)
+JUDGE0_BREAKER_RESET_TIMEOUT = env.float("JUDGE0_BREAKER_RESET_TIMEOUT", default=30.0)  # seconds
+# Judge0 result retrieval: `wait=true` for single runs, then exponential-backoff polling
+JUDGE0_WAIT = env.bool("JUDGE0_WAIT", default=True)
+JUDGE0_WAIT_TIMEOUT = env.float("JUDGE0_WAIT_TIMEOUT", default=15.0)  # seconds
+JUDGE0_POLL_INITIAL_DELAY = env.float("JUDGE0_POLL_INITIAL_DELAY", default=0.05)  # seconds
+JUDGE0_POLL_MAX_DELAY = env.float("JUDGE0_POLL_MAX_DELAY", default=1.0)  # seconds
+JUDGE0_POLL_TIMEOUT = env.float("JUDGE0_POLL_TIMEOUT", default=10.0)  # seconds
+# Public base URL of this backend. When set, async jobs are completed by
+# Judge0 callbacks instead of polling; polling resumes after the timeout.
+JUDGE0_CALLBACK_BASE_URL = env("JUDGE0_CALLBACK_BASE_URL", default="")
+JUDGE0_CALLBACK_TIMEOUT = env.int("JUDGE0_CALLBACK_TIMEOUT", default=30)  # seconds
+
+# Code Execution
+# Backend that runs code: "judge0" (remote) or "local" (sandboxed subprocesses)
+CODE_EXECUTOR = env("CODE_EXECUTOR", default="judge0")
+# When enabled, `execute` queues an ExecutionJob on Celery instead of blocking
+CODE_EXECUTION_ASYNC = env.bool("CODE_EXECUTION_ASYNC", default=False)
+# Reject code that fails a local syntax check before it is executed
+EXECUTION_PRECHECK_ENABLED = env.bool("EXECUTION_PRECHECK_ENABLED", default=True)
+EXECUTION_PRECHECK_TIMEOUT = env.float("EXECUTION_PRECHECK_TIMEOUT", default=5.0)  # seconds
+# Benchmark runs: accepted code is run BENCHMARK_RUNS times over up to
+# BENCHMARK_MAX_CASES test cases to get robust runtime/memory statistics
+BENCHMARK_RUNS = env.int("BENCHMARK_RUNS", default=5)
+BENCHMARK_MAX_RUNS = env.int("BENCHMARK_MAX_RUNS", default=20)
+BENCHMARK_MAX_CASES = env.int("BENCHMARK_MAX_CASES", default=4)
+BENCHMARK_ON_ACCEPT = env.bool("BENCHMARK_ON_ACCEPT", default=False)
+BENCHMARK_RETRY_DELAY = env.int("BENCHMARK_RETRY_DELAY", default=30)  # seconds
+# Submission history: every saved version of the code is kept as a delta
+# against the previous one, with a full snapshot at least this often
+SUBMISSION_REVISION_SNAPSHOT_INTERVAL = env.int("SUBMISSION_REVISION_SNAPSHOT_INTERVAL", default=16)
+# Complexity analysis: the problem's input generator is run for each size and
+# the submission's median runtime/peak memory per size is fitted
+COMPLEXITY_INPUT_SIZES = [int(size) for size in env.list("COMPLEXITY_INPUT_SIZES", default=[1000, 2000, 4000, 8000, 16000, 32000, 64000])]
+COMPLEXITY_REPEATS = env.int("COMPLEXITY_REPEATS", default=3)
+# Growth across all sizes below which a curve counts as constant (clock and page noise)
+COMPLEXITY_MIN_RUNTIME_GROWTH = env.float("COMPLEXITY_MIN_RUNTIME_GROWTH", default=5.0)  # ms
+COMPLEXITY_MIN_MEMORY_GROWTH = env.int("COMPLEXITY_MIN_MEMORY_GROWTH", default=2048)  # KB
+# Bulk rescheduling of SRS reviews (reschedule_reviews command/task): rows per chunk
+SRS_RESCHEDULE_CHUNK_SIZE = env.int("SRS_RESCHEDULE_CHUNK_SIZE", default=5000)
+# Monthly partitions of the SRS review log created ahead of time (Postgres)
+SRS_REVIEW_LOG_PARTITIONS_AHEAD = env.int("SRS_REVIEW_LOG_PARTITIONS_AHEAD", default=2)
+CELERY_BEAT_SCHEDULE["create-review-log-partitions"] = {
+    "task": "srs.tasks.create_review_log_partitions",
+    "schedule": timedelta(days=1),
+}
+# Per-user interval modifiers, refitted nightly from the last
+# SRS_PARAMS_HISTORY_DAYS of ratings to reach SRS_TARGET_RETENTION; users
+# start from SRS_PARAMS_PRIOR_REVIEWS pseudo-ratings at their current modifier
+SRS_TARGET_RETENTION = env.float("SRS_TARGET_RETENTION", default=0.9)
+SRS_PARAMS_HISTORY_DAYS = env.int("SRS_PARAMS_HISTORY_DAYS", default=365)
+SRS_PARAMS_PRIOR_REVIEWS = env.float("SRS_PARAMS_PRIOR_REVIEWS", default=20)
+SRS_PARAMS_CHUNK_SIZE = env.int("SRS_PARAMS_CHUNK_SIZE", default=5000)
+CELERY_BEAT_SCHEDULE["fit-user-parameters"] = {
+    "task": "srs.tasks.fit_user_parameters",
+    "schedule": timedelta(days=1),
+}
+# Redis index of due SRS reviews; per-user sets are rebuilt from the database
+# when missing or older than SRS_DUE_QUEUE_TTL
+SRS_DUE_QUEUE_ENABLED = env.bool("SRS_DUE_QUEUE_ENABLED", default=True)
+SRS_DUE_QUEUE_TTL = env.int("SRS_DUE_QUEUE_TTL", default=86400)  # seconds
+# Load leveling of rated reviews: the due date moves by up to
+# SRS_FUZZ_RATIO of the interval (at most SRS_FUZZ_MAX_DAYS) to the least
+# loaded day, avoiding days with SRS_MAX_REVIEWS_PER_DAY due (0: no limit)
+SRS_LOAD_LEVELING_ENABLED = env.bool("SRS_LOAD_LEVELING_ENABLED", default=True)
+SRS_FUZZ_RATIO = env.float("SRS_FUZZ_RATIO", default=0.05)
+SRS_FUZZ_MAX_DAYS = env.int("SRS_FUZZ_MAX_DAYS", default=14)
+SRS_MAX_REVIEWS_PER_DAY = env.int("SRS_MAX_REVIEWS_PER_DAY", default=0)
+# Admission control (Redis): global and per-user in-flight runs; runs over
+# the limits wait in fair per-user queues. Slots held longer than the lease
+# (e.g. by a crashed worker) are reclaimed.
+EXECUTION_ADMISSION_ENABLED = env.bool("EXECUTION_ADMISSION_ENABLED", default=True)
+EXECUTION_MAX_CONCURRENCY = env.int("EXECUTION_MAX_CONCURRENCY", default=20)
+EXECUTION_MAX_PER_USER = env.int("EXECUTION_MAX_PER_USER", default=2)
+EXECUTION_ADMISSION_LEASE = env.int("EXECUTION_ADMISSION_LEASE", default=300)  # seconds
+# Local executor limits (seconds, KB). Filesystem/network isolation is not
+# provided by rlimits; wrap commands with e.g. nsjail via the prefix.
+# "processes" is RLIMIT_NPROC, which counts all processes and threads of the
+# user running the program (and does not apply to root), so run programs as
+# a dedicated user for it to bound just them.
+LOCAL_EXECUTOR_LIMITS = {
+    "cpu_time": env.float("LOCAL_EXECUTOR_CPU_TIME", default=2.0),
+    "wall_time": env.float("LOCAL_EXECUTOR_WALL_TIME", default=5.0),
+    "memory_kb": env.int("LOCAL_EXECUTOR_MEMORY_KB", default=256 * 1024),
+    "output_kb": env.int("LOCAL_EXECUTOR_OUTPUT_KB", default=1024),
+    "processes": env.int("LOCAL_EXECUTOR_PROCESSES", default=256),
+}
+LOCAL_EXECUTOR_COMPILE_LIMITS = {
+    "cpu_time": 20.0,
+    "wall_time": 30.0,
+    "memory_kb": 2 * 1024 * 1024,
+    "output_kb": 64 * 1024,
+    "processes": 512,
+}
+LOCAL_EXECUTOR_WORKDIR = env("LOCAL_EXECUTOR_WORKDIR", default=None)
+LOCAL_EXECUTOR_COMMAND_PREFIX = env.list("LOCAL_EXECUTOR_COMMAND_PREFIX", default=[])
+# Warm Python workers per process for the local executor (0 disables the pool)
+PYTHON_WORKER_POOL_SIZE = env.int("PYTHON_WORKER_POOL_SIZE", default=4)
+PYTHON_WORKER_MAX_JOBS = env.int("PYTHON_WORKER_MAX_JOBS", default=200)
+# Compiled artifacts of the local executor, evicted LRU above the size cap
+COMPILE_CACHE_ENABLED = env.bool("COMPILE_CACHE_ENABLED", default=True)
+COMPILE_CACHE_DIR = env("COMPILE_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "recallcode-compile-cache"))
+COMPILE_CACHE_MAX_BYTES = env.int("COMPILE_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+# Content-addressed store of (hidden) test-case data, compressed. The store
+# must be shared by every process that executes code; decompressed copies for
+# reading are kept per machine and evicted LRU above the size cap.
+TESTCASE_STORE_ROOT = env("TESTCASE_STORE_ROOT", default=os.path.join(BASE_DIR, "testdata"))
+TESTCASE_CACHE_DIR = env("TESTCASE_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "recallcode-testcases"))
+TESTCASE_CACHE_MAX_BYTES = env.int("TESTCASE_CACHE_MAX_BYTES", default=1024 * 1024 * 1024)
+# Content-addressed execution result cache (stored in CACHES["default"]).
+# Entries expire after the TTL; results above the size cap are not cached.
+EXECUTION_CACHE_ENABLED = env.bool("EXECUTION_CACHE_ENABLED", default=True)
+EXECUTION_CACHE_TTL = env.int("EXECUTION_CACHE_TTL", default=60 * 60 * 24)  # seconds
+EXECUTION_CACHE_MAX_ENTRY_BYTES = env.int("EXECUTION_CACHE_MAX_ENTRY_BYTES", default=64 * 1024)
 
 # Email Configuration
 EMAIL_BACKEND = env("EMAIL_BACKEND", default="django.core.mail.backends.console.EmailBackend")
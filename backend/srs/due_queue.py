@@ -0,0 +1,253 @@
+"""
+Redis index of due SRS reviews.
+
+Each user's reviews are kept in a sorted set scored by `next_review`, so
+due lookups, due counts and the next due time are range queries on Redis
+instead of scans over a join in Postgres:
+
+    srs:due:<user>   ZSET review id -> next_review (epoch seconds)
+                     plus the member "end" scored +inf
+    srs:load:<user>  HASH UTC day (epoch days) -> reviews due that day,
+                     days without reviews omitted, plus the field "end"
+
+The load hash is the histogram used for load leveling (see srs.leveling);
+updates move a review between days atomically with its set entry, so it is
+never recounted.
+
+The "end" entries mark a complete pair: a missing key (never built, expired
+or flushed) rebuilds both from the database on first use. Keys expire after
+SRS_DUE_QUEUE_TTL, which bounds drift from writes that bypassed the index,
+and updates only apply when both keys exist, so a partial set never looks
+complete.
+
+Writers update the index once their transaction commits (`schedule`); the
+rebuild_due_queue command rebuilds it wholesale. When Redis is unavailable
+callers fall back to the database.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from typing import Optional, List, Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from redis.exceptions import RedisError
+
+from recallcode.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'srs:due:'
+LOAD_PREFIX = 'srs:load:'
+END = 'end'
+DAY = 86400  # seconds
+
+# KEYS: user set, user load hash; ARGV: review id, score ('' removes the review)
+UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1], KEYS[2]) < 2 then
+    return 0
+end
+local old = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if old then
+    local day = math.floor(tonumber(old) / 86400)
+    if redis.call('HINCRBY', KEYS[2], day, -1) <= 0 then
+        redis.call('HDEL', KEYS[2], day)
+    end
+end
+if ARGV[2] == '' then
+    redis.call('ZREM', KEYS[1], ARGV[1])
+else
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+    redis.call('HINCRBY', KEYS[2], math.floor(tonumber(ARGV[2]) / 86400), 1)
+end
+return 1
+"""
+
+_scripts = {}
+
+
+def _script(source: str):
+    client = get_redis()
+    script = _scripts.get(source)
+    if script is None or script.registered_client is not client:
+        script = _scripts[source] = client.register_script(source)
+    return script
+
+
+class DueQueue:
+    """Per-user sorted sets of review ids by due time."""
+
+    @staticmethod
+    def _key(user_id) -> str:
+        return f'{PREFIX}{user_id}'
+
+    @staticmethod
+    def _load_key(user_id) -> str:
+        return f'{LOAD_PREFIX}{user_id}'
+
+    @staticmethod
+    def day(moment: datetime) -> int:
+        """UTC day of a time, in days since the epoch (the load hash's fields)."""
+        return int(moment.timestamp() // DAY)
+
+    @staticmethod
+    def _score(next_review: Optional[datetime]) -> str:
+        return '' if next_review is None else repr(next_review.timestamp())
+
+    @staticmethod
+    def update(entries: Iterable[Tuple[int, int, Optional[datetime]]]):
+        """
+        Apply (user id, review id, next_review) changes to existing sets; a
+        next_review of None removes the review. Errors are logged, not raised.
+        """
+        if not settings.SRS_DUE_QUEUE_ENABLED:
+            return
+        script = _script(UPDATE_SCRIPT)
+        try:
+            with get_redis().pipeline(transaction=False) as pipe:
+                for user_id, review_id, next_review in entries:
+                    script(
+                        keys=[DueQueue._key(user_id), DueQueue._load_key(user_id)],
+                        args=[str(review_id), DueQueue._score(next_review)],
+                        client=pipe
+                    )
+                pipe.execute()
+        except RedisError as e:
+            logger.warning('Could not update the SRS due queue: %s', e)
+
+    @staticmethod
+    def schedule(user_id, review_id, next_review: Optional[datetime]):
+        """Update a review's due time once the current transaction commits."""
+        transaction.on_commit(lambda: DueQueue.update([(user_id, review_id, next_review)]))
+
+    @staticmethod
+    def schedule_many(entries: List[Tuple[int, int, Optional[datetime]]]):
+        """Update several reviews' due times once the current transaction commits."""
+        if entries:
+            transaction.on_commit(lambda: DueQueue.update(entries))
+
+    @staticmethod
+    def store(sets: Dict[int, Dict[str, float]]):
+        """Replace whole sets and their load hashes: user id -> {review id: score}."""
+        with get_redis().pipeline(transaction=True) as pipe:
+            for user_id, members in sets.items():
+                key = DueQueue._key(user_id)
+                load_key = DueQueue._load_key(user_id)
+                loads = Counter(int(score // DAY) for score in members.values())
+                pipe.delete(key, load_key)
+                pipe.zadd(key, {**members, END: float('inf')})
+                pipe.hset(load_key, mapping={**loads, END: 1})
+                pipe.expire(key, settings.SRS_DUE_QUEUE_TTL)
+                pipe.expire(load_key, settings.SRS_DUE_QUEUE_TTL)
+            pipe.execute()
+
+    @staticmethod
+    def rebuild(user_id):
+        """Rebuild a user's set from the database."""
+        from .models import SRSReview
+
+        rows = SRSReview.objects.filter(
+            user_id=user_id,
+            next_review__isnull=False
+        ).values_list('id', 'next_review')
+        DueQueue.store({user_id: {str(review_id): next_review.timestamp() for review_id, next_review in rows}})
+
+    @staticmethod
+    def _read(user_id, read, load: bool = False):
+        """
+        Run `read(pipe, key)` against a user's set (or load hash, with
+        `load`), building both first if either is missing. Returns the read's
+        result, or None when Redis fails.
+        """
+        if not settings.SRS_DUE_QUEUE_ENABLED:
+            return None
+        key = DueQueue._key(user_id)
+        load_key = DueQueue._load_key(user_id)
+        try:
+            for _ in range(2):
+                with get_redis().pipeline(transaction=False) as pipe:
+                    pipe.exists(key, load_key)
+                    read(pipe, load_key if load else key)
+                    exists, result = pipe.execute()
+                if exists == 2:
+                    return result
+                DueQueue.rebuild(user_id)
+        except RedisError as e:
+            logger.warning('SRS due queue unavailable: %s', e)
+        return None
+
+    @staticmethod
+    def due_ids(user_id, limit: Optional[int] = None) -> Optional[List[int]]:
+        """Ids of the user's due reviews, earliest first, or None when Redis fails."""
+        now = timezone.now().timestamp()
+        ids = DueQueue._read(
+            user_id,
+            lambda pipe, key: pipe.zrangebyscore(key, '-inf', now, start=0 if limit else None, num=limit)
+        )
+        return None if ids is None else [int(review_id) for review_id in ids]
+
+    @staticmethod
+    def due_count(user_id) -> Optional[int]:
+        """Number of the user's due reviews, or None when Redis fails."""
+        now = timezone.now().timestamp()
+        return DueQueue._read(user_id, lambda pipe, key: pipe.zcount(key, '-inf', now))
+
+    @staticmethod
+    def next_due(user_id) -> Tuple[bool, Optional[datetime]]:
+        """
+        Earliest due time of the user's reviews.
+
+        Returns:
+            tuple: (answered, due time or None if the user has no reviews);
+            answered is False when Redis fails
+        """
+        first = DueQueue._read(user_id, lambda pipe, key: pipe.zrange(key, 0, 0, withscores=True))
+        if first is None:
+            return False, None
+        member, score = first[0]
+        if member == END:
+            return True, None
+        return True, datetime.fromtimestamp(score, tz=dt_timezone.utc)
+
+    @staticmethod
+    def day_loads(user_id, first_day: int, last_day: int) -> Optional[List[int]]:
+        """
+        Reviews due on each UTC day from first_day to last_day (inclusive,
+        see `day`), or None when Redis fails.
+        """
+        days = [str(day) for day in range(first_day, last_day + 1)]
+        counts = DueQueue._read(user_id, lambda pipe, key: pipe.hmget(key, days), load=True)
+        return None if counts is None else [int(count or 0) for count in counts]
+
+    @staticmethod
+    def rebuild_all(user_ids: Optional[List[int]] = None, chunk_size: int = 1000) -> int:
+        """
+        Rebuild the sets of all users with reviews (or of `user_ids`).
+
+        Returns:
+            Number of sets rebuilt
+        """
+        from .models import SRSReview
+
+        reviews = SRSReview.objects.filter(next_review__isnull=False)
+        if user_ids is not None:
+            reviews = reviews.filter(user_id__in=user_ids)
+        rows = reviews.order_by('user_id').values_list('user_id', 'id', 'next_review')
+
+        sets = {}
+        built = 0
+        for user_id, review_id, next_review in rows.iterator(chunk_size=chunk_size):
+            if user_id not in sets and len(sets) >= chunk_size:
+                DueQueue.store(sets)
+                built += len(sets)
+                sets = {}
+            sets.setdefault(user_id, {})[str(review_id)] = next_review.timestamp()
+
+        # Users without reviews get an empty, complete set
+        for user_id in user_ids or []:
+            sets.setdefault(user_id, {})
+        if sets:
+            DueQueue.store(sets)
+            built += len(sets)
+        return built
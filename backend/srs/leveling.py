@@ -0,0 +1,65 @@
+"""
+Review-load leveling.
+
+Reviews created together are scheduled together, so without leveling they
+stay bunched on the same future days. Instead of being due exactly its
+scheduled interval from now, a review may move within a fuzz window of
+`radius` days either way; the day picked is, in order of preference:
+
+    1. under the daily capacity (when there is one)
+    2. the one with the fewest reviews already due
+    3. the closest to the scheduled interval, earlier on a tie
+
+Intervals shorter than FUZZ_MIN_INTERVAL days are never moved. Days are
+counted in whole days from now, so a review moved by k days keeps its time
+of day.
+"""
+import numpy as np
+
+FUZZ_MIN_INTERVAL = 3
+
+
+def fuzz_radius(interval_days, ratio: float, max_days: int):
+    """
+    Days by which due dates may move either way.
+
+    Args:
+        interval_days: Scheduled interval(s) in days (scalar or array)
+        ratio: Share of the interval (at least one day)
+        max_days: Largest radius
+
+    Returns:
+        Radius (int64 array, 0-d for a scalar interval)
+    """
+    interval_days = np.asarray(interval_days)
+    radius = np.minimum(np.maximum(np.rint(interval_days * ratio), 1), max_days)
+    return np.where(interval_days >= FUZZ_MIN_INTERVAL, radius, 0).astype(np.int64)
+
+
+def level_intervals(interval_days: np.ndarray, radius: np.ndarray, loads: np.ndarray, capacity: int) -> np.ndarray:
+    """
+    Pick the interval of each review within its fuzz window.
+
+    Args:
+        interval_days: Scheduled intervals, shape (n,)
+        radius: Fuzz radius of each interval, shape (n,)
+        loads: Reviews already due on the days of each window, shape
+            (n, 2 * R + 1) with R = radius.max(); column j is the day
+            interval - R + j. Columns outside a review's own window are ignored.
+        capacity: Reviews per day that fill a day (0 for no limit)
+
+    Returns:
+        Chosen intervals, shape (n,)
+    """
+    width = loads.shape[1]
+    offsets = np.arange(width) - width // 2
+    candidates = interval_days[:, None] + offsets
+    valid = (np.abs(offsets) <= radius[:, None]) & (candidates >= 1)
+
+    loads = np.asarray(loads, dtype=np.int64)
+    full = (loads >= capacity) if capacity else np.zeros(loads.shape, bool)
+    # Preferences combined into one key: full days, then load, then distance
+    distance = np.abs(offsets)
+    key = (full * (int(loads.max(initial=0)) + 1) + loads) * (width // 2 + 1) + distance
+    key = np.where(valid, key, np.iinfo(np.int64).max)
+    return candidates[np.arange(len(candidates)), key.argmin(axis=1)]
@@ -0,0 +1,108 @@
+"""
+Benchmark the SRS scheduler.
+
+Times the simulation at several learner counts and the scalar scheduling
+path on a sample of review states, which is also checked against the
+vectorized rules. --json prints the results for tracking across changes.
+"""
+import json
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from srs.models import SRSReview
+from srs.services import SRSService
+from srs.simulation import simulate
+
+
+class Command(BaseCommand):
+    help = 'Measure SRS scheduling throughput, vectorized and scalar'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--learners',
+            default='1000,10000,100000',
+            help='Comma-separated learner counts to simulate'
+        )
+        parser.add_argument('--days', type=int, default=30)
+        parser.add_argument('--scalar-sample', type=int, default=50000, help='Review states for the scalar path')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['learners'].split(',')]
+        except ValueError:
+            raise CommandError('--learners must be a comma-separated list of integers')
+        if not sizes or min(sizes) < 1 or options['days'] < 1 or options['scalar_sample'] < 1:
+            raise CommandError('Learner counts, --days and --scalar-sample must be positive')
+
+        results = {'simulation': [], 'scalar': self.scalar(options['scalar_sample'], options['seed'])}
+        for learners in sizes:
+            report = simulate(learners, days=options['days'], seed=options['seed'])
+            results['simulation'].append({
+                key: report[key] for key in (
+                    'learners', 'reviews', 'seconds', 'reviews_per_second', 'scheduler_reviews_per_second',
+                    'mean_reviews_per_learner_per_day', 'recall_rate', 'mean_retention',
+                )
+            })
+
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+            return
+
+        self.stdout.write('learners     reviews  seconds   reviews/s  scheduler reviews/s')
+        for row in results['simulation']:
+            self.stdout.write(
+                f"{row['learners']:>8} {row['reviews']:>11} {row['seconds']:>8.2f} "
+                f"{row['reviews_per_second']:>11} {row['scheduler_reviews_per_second']:>20}"
+            )
+        scalar = results['scalar']
+        self.stdout.write(
+            f"scalar calculate_next_interval: {scalar['reviews_per_second']} reviews/s over {scalar['reviews']} states"
+        )
+        if scalar['mismatches']:
+            self.stdout.write(self.style.ERROR(
+                f"{scalar['mismatches']} states scheduled differently by the vectorized rules"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('Vectorized rules match the scalar path'))
+
+    def scalar(self, sample, seed):
+        """Time calculate_next_interval on random states and compare it with the vectorized rules."""
+        rng = np.random.default_rng(seed)
+        repetitions = rng.integers(0, 8, sample)
+        ease_factor = rng.uniform(SRSService.MIN_EASE_FACTOR, SRSService.MAX_EASE_FACTOR, sample)
+        interval_days = rng.integers(1, 365, sample)
+        rating = rng.integers(1, 6, sample)
+        runtime_ratio = np.where(rng.random(sample) < 0.5, 1.0, rng.uniform(0, 2, sample))
+        interval_modifier = np.where(rng.random(sample) < 0.5, 1.0, rng.uniform(0.5, 2, sample))
+
+        started = time.perf_counter()
+        expected = []
+        for i in range(sample):
+            review = SRSReview(
+                repetitions=int(repetitions[i]),
+                ease_factor=float(ease_factor[i]),
+                interval_days=int(interval_days[i])
+            )
+            scheduled, ease = SRSService.calculate_next_interval(
+                review, int(rating[i]), float(runtime_ratio[i]), 1.0, float(interval_modifier[i])
+            )
+            expected.append((review.repetitions, review.interval_days, ease, scheduled))
+        seconds = time.perf_counter() - started
+
+        actual = zip(*SRSService.calculate_next_intervals(
+            repetitions, ease_factor, interval_days, rating, runtime_ratio, 1.0, interval_modifier
+        ))
+        mismatches = sum(
+            1 for state, (reps, interval, ease, scheduled) in zip(expected, actual)
+            if state != (int(reps), int(interval), float(ease), int(scheduled))
+        )
+        return {
+            'reviews': sample,
+            'seconds': round(seconds, 3),
+            'reviews_per_second': round(sample / seconds),
+            'mismatches': mismatches,
+        }
@@ -0,0 +1,34 @@
+"""
+Refit per-user SRS scheduling parameters from the review log.
+
+The same job runs nightly as the fit_user_parameters Celery task.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from srs.services import ParameterService
+
+
+class Command(BaseCommand):
+    help = 'Fit the SRS interval modifier of every user with recent ratings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, help='Users per chunk (default SRS_PARAMS_CHUNK_SIZE)')
+        parser.add_argument('--async', action='store_true', dest='run_async', help='Queue the Celery task instead')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] is not None and options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+
+        if options['run_async']:
+            from srs.tasks import fit_user_parameters
+            task = fit_user_parameters.delay(chunk_size=options['chunk_size'])
+            self.stdout.write(f'Queued fitting task {task.id}')
+            return
+
+        def progress(processed, total):
+            self.stdout.write(f'{processed}/{total} users fitted')
+
+        result = ParameterService.run(chunk_size=options['chunk_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['fitted']} users fitted, {result['updated']} changed"
+        ))
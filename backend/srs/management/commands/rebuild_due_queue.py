@@ -0,0 +1,24 @@
+"""
+Rebuild the Redis index of due SRS reviews from the database.
+
+Use it after restoring a database, flushing Redis or writing reviews
+outside the services; sets are otherwise rebuilt lazily.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from redis.exceptions import RedisError
+
+from srs.due_queue import DueQueue
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-user Redis sets of due SRS reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='Only this user id (repeatable)')
+
+    def handle(self, *args, **options):
+        try:
+            built = DueQueue.rebuild_all(options['users'])
+        except RedisError as e:
+            raise CommandError(f'Redis unavailable: {e}')
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the due queues of {built} users'))
@@ -0,0 +1,50 @@
+"""
+Reschedule SRS reviews in bulk, e.g. after the SRS constants changed.
+
+Runs in-process by default; --async queues the Celery task instead, whose
+progress is reported as task state.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from srs.models import SRSReview
+from srs.services import RescheduleService
+
+
+class Command(BaseCommand):
+    help = 'Bring stored SRS review schedules in line with the current SRS constants'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, help='Reviews per chunk (default SRS_RESCHEDULE_CHUNK_SIZE)')
+        parser.add_argument('--user', type=int, help='Only reschedule the reviews of this user id')
+        parser.add_argument('--dry-run', action='store_true', help='Count the changes without writing them')
+        parser.add_argument('--async', action='store_true', dest='run_async', help='Queue the Celery task instead')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] is not None and options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+
+        if options['run_async']:
+            if options['user'] is not None:
+                raise CommandError('--user cannot be combined with --async')
+            from srs.tasks import reschedule_reviews
+            task = reschedule_reviews.delay(chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+            self.stdout.write(f'Queued rescheduling task {task.id}')
+            return
+
+        queryset = SRSReview.objects.all()
+        if options['user'] is not None:
+            queryset = queryset.filter(user_id=options['user'])
+
+        def progress(processed, total, updated):
+            self.stdout.write(f'{processed}/{total} reviews processed, {updated} changed')
+
+        result = RescheduleService.run(
+            queryset,
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            progress=progress
+        )
+        verb = 'would change' if options['dry_run'] else 'changed'
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['processed']} reviews processed, {result['updated']} {verb}"
+        ))
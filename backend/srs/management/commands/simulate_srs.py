@@ -0,0 +1,96 @@
+"""
+Simulate SRS scheduling on synthetic learners (see srs.simulation).
+
+Prints the review load per learner and day, the recall rate at reviews and
+the retention of everything learned, to judge a scheduling change before it
+ships: run it with the current rules, then with --scheduler pointing at the
+candidate (or with --level-load), with the same seed.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from srs.simulation import FORGETTING_CURVES, simulate
+
+
+class Command(BaseCommand):
+    help = 'Simulate SRS scheduling on synthetic learners and report review load and retention'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--learners', type=int, default=100000)
+        parser.add_argument('--items', type=int, default=20, help='Items per learner')
+        parser.add_argument('--days', type=int, default=90)
+        parser.add_argument('--new-per-day', type=int, default=2, help='Items each learner starts per day')
+        parser.add_argument('--forgetting', choices=sorted(FORGETTING_CURVES), default='exponential')
+        parser.add_argument('--interval-modifier', type=float, default=1.0)
+        parser.add_argument(
+            '--scheduler',
+            help='Dotted path of a replacement for SRSService.calculate_next_intervals'
+        )
+        parser.add_argument(
+            '--level-load',
+            action='store_true',
+            help='Move due days within their fuzz windows to the least loaded day'
+        )
+        parser.add_argument(
+            '--max-per-day',
+            type=int,
+            default=0,
+            help='Daily review capacity for --level-load (0 for no limit)'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+
+    def handle(self, *args, **options):
+        for name in ('learners', 'items', 'days', 'new_per_day'):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive")
+        if options['max_per_day'] < 0:
+            raise CommandError('--max-per-day must not be negative')
+
+        scheduler = None
+        if options['scheduler']:
+            scheduler = self.load_scheduler(options['scheduler'])
+
+        report = simulate(
+            options['learners'],
+            items=options['items'],
+            days=options['days'],
+            new_per_day=options['new_per_day'],
+            forgetting=options['forgetting'],
+            interval_modifier=options['interval_modifier'],
+            scheduler=scheduler,
+            level_load=options['level_load'],
+            max_reviews_per_day=options['max_per_day'],
+            seed=options['seed']
+        )
+        if options['json']:
+            self.stdout.write(json.dumps(report))
+            return
+
+        self.stdout.write('day  reviews/learner  retention')
+        for day in range(0, report['days'], 7):
+            self.stdout.write(
+                f"{day:>3}  {report['reviews_per_learner_per_day'][day]:>15.3f}  {report['daily_retention'][day]:>9.4f}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['reviews']} reviews of {report['items']} items by {report['learners']} learners "
+            f"over {report['days']} days: {report['mean_reviews_per_learner_per_day']} reviews per learner "
+            f"and day (peak {report['peak_reviews_per_learner_per_day']}, busiest day of a learner "
+            f"{report['mean_learner_peak_reviews_per_day']} on average), recall rate {report['recall_rate']}, "
+            f"mean retention {report['mean_retention']}; {report['reviews_per_second']} simulated reviews/s"
+        ))
+        if report['learner_days_over_capacity'] is not None:
+            self.stdout.write(f"Learner-days over capacity: {report['learner_days_over_capacity']}")
+
+    def load_scheduler(self, path):
+        """Import a function, or a method given as module.Class.method."""
+        try:
+            return import_string(path)
+        except ImportError as e:
+            owner, _, name = path.rpartition('.')
+            try:
+                return getattr(import_string(owner), name)
+            except (ImportError, AttributeError):
+                raise CommandError(str(e))
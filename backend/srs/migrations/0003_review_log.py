@@ -0,0 +1,56 @@
+# Generated by Django 5.0 on 2026-10-17 02:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def partition_review_logs(apps, schema_editor):
+    """
+    On Postgres, replace the new table with one partitioned by month of
+    reviewed_at, with a default partition for months without their own.
+
+    Django creates foreign keys and indexes at the end of the migration, so
+    they are created on the partitioned table. Its primary key must include
+    the partition key.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE TABLE srs_review_logs_partitioned (LIKE srs_review_logs '
+        'INCLUDING DEFAULTS INCLUDING IDENTITY INCLUDING CONSTRAINTS) PARTITION BY RANGE (reviewed_at)'
+    )
+    schema_editor.execute('DROP TABLE srs_review_logs')
+    schema_editor.execute('ALTER TABLE srs_review_logs_partitioned RENAME TO srs_review_logs')
+    schema_editor.execute('ALTER TABLE srs_review_logs ADD CONSTRAINT srs_review_logs_pkey PRIMARY KEY (id, reviewed_at)')
+    schema_editor.execute('CREATE TABLE srs_review_logs_default PARTITION OF srs_review_logs DEFAULT')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('srs', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewLog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('reviewed_at', models.DateTimeField()),
+                ('rating', models.PositiveSmallIntegerField(choices=[(1, 'Again - Hard'), (2, 'Hard'), (3, 'Good'), (4, 'Easy'), (5, 'Perfect')])),
+                ('elapsed_days', models.FloatField()),
+                ('previous_interval', models.IntegerField()),
+                ('previous_ease', models.FloatField()),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='logs', to='srs.srsreview')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_logs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'srs_review_logs',
+                'ordering': ['reviewed_at'],
+                'indexes': [models.Index(fields=['user', 'reviewed_at'], name='srs_review__user_id_75430f_idx')],
+            },
+        ),
+        migrations.RunPython(partition_review_logs, migrations.RunPython.noop),
+    ]
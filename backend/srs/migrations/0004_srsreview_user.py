@@ -0,0 +1,137 @@
+"""
+Denormalize the submission's user onto SRSReview without long table locks.
+
+On Postgres each step only takes brief locks: the column is added nullable
+with a NOT VALID foreign key, filled in batches that commit separately, the
+constraints are validated without blocking writes, and the index is built
+concurrently. Other databases use plain schema changes.
+"""
+import copy
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def add_column(apps, schema_editor):
+    model = apps.get_model('srs', 'SRSReview')
+    field = model._meta.get_field('user')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.add_field(model, field)
+        return
+
+    # Column only; the foreign key is checked for new rows now, old ones later
+    unchecked = copy.copy(field)
+    unchecked.db_constraint = False
+    schema_editor.add_field(model, unchecked)
+    schema_editor.execute(
+        'ALTER TABLE srs_reviews ADD CONSTRAINT srs_reviews_user_id_fk_users_id '
+        'FOREIGN KEY (user_id) REFERENCES users (id) DEFERRABLE INITIALLY DEFERRED NOT VALID'
+    )
+
+
+def remove_column(apps, schema_editor):
+    model = apps.get_model('srs', 'SRSReview')
+    schema_editor.remove_field(model, model._meta.get_field('user'))
+
+
+def backfill(apps, schema_editor):
+    """Copy the owner of each review's submission in id ranges, one transaction each."""
+    SRSReview = apps.get_model('srs', 'SRSReview')
+    Submission = apps.get_model('problems', 'Submission')
+    owner = Subquery(Submission.objects.filter(id=OuterRef('submission_id')).values('user_id')[:1])
+
+    last_id = SRSReview.objects.aggregate(last=models.Max('id'))['last'] or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        SRSReview.objects.filter(
+            id__gte=start,
+            id__lt=start + BATCH_SIZE,
+            user__isnull=True
+        ).update(user_id=owner)
+
+
+def validate(apps, schema_editor):
+    """Validate the foreign key and make the column NOT NULL without a locking scan."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # Rows written by application servers still running the previous code
+    backfill(apps, schema_editor)
+    for statement in (
+        'ALTER TABLE srs_reviews VALIDATE CONSTRAINT srs_reviews_user_id_fk_users_id',
+        'ALTER TABLE srs_reviews ADD CONSTRAINT srs_reviews_user_id_not_null CHECK (user_id IS NOT NULL) NOT VALID',
+        'ALTER TABLE srs_reviews VALIDATE CONSTRAINT srs_reviews_user_id_not_null',
+        # Proven by the validated check, so no table scan
+        'ALTER TABLE srs_reviews ALTER COLUMN user_id SET NOT NULL',
+        'ALTER TABLE srs_reviews DROP CONSTRAINT srs_reviews_user_id_not_null',
+    ):
+        schema_editor.execute(statement)
+
+
+def set_not_null(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        return  # Done by validate()
+    model = apps.get_model('srs', 'SRSReview')
+    field = model._meta.get_field('user')
+    nullable = copy.copy(field)
+    nullable.null = True
+    schema_editor.alter_field(model, nullable, field)
+
+
+def add_index(apps, schema_editor):
+    model = apps.get_model('srs', 'SRSReview')
+    index = models.Index(fields=['user', 'next_review'], include=['id'], name='srs_reviews_user_due_idx')
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.add_index(model, index, concurrently=True)
+    else:
+        schema_editor.add_index(model, index)
+
+
+def remove_index(apps, schema_editor):
+    model = apps.get_model('srs', 'SRSReview')
+    index = models.Index(fields=['user', 'next_review'], include=['id'], name='srs_reviews_user_due_idx')
+    schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    # Batches and concurrent index builds must run outside a transaction
+    atomic = False
+
+    dependencies = [
+        ('problems', '0012_problem_test_manifest'),
+        ('srs', '0003_review_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Each schema change is applied to the state first, then to the
+        # database by the RunPython that follows it
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AddField(
+                model_name='srsreview',
+                name='user',
+                field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='srs_reviews', to=settings.AUTH_USER_MODEL),
+            ),
+        ]),
+        migrations.RunPython(add_column, remove_column),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(validate, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name='srsreview',
+                name='user',
+                field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='srs_reviews', to=settings.AUTH_USER_MODEL),
+            ),
+        ]),
+        migrations.RunPython(set_not_null, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AddIndex(
+                model_name='srsreview',
+                index=models.Index(fields=['user', 'next_review'], include=('id',), name='srs_reviews_user_due_idx'),
+            ),
+        ]),
+        migrations.RunPython(add_index, remove_index),
+    ]
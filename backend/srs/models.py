@@ -22,6 +22,9 @@ class SRSReview(models.Model):
         on_delete=models.CASCADE,
         related_name='srs_review'
     )
+    # Owner of the submission, kept in sync by save() so reads need no join;
+    # indexed by the (user, next_review) index
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='srs_reviews', db_index=False)
     repetitions = models.IntegerField(default=0)  # Number of successful reviews
     ease_factor = models.FloatField(default=2.5)  # SM-17 ease factor
     interval_days = models.IntegerField(default=1)  # Days until next review
@@ -38,11 +41,18 @@ class SRSReview(models.Model):
         indexes = [
             models.Index(fields=['next_review']),
             models.Index(fields=['submission']),
+            # Due queries: one range scan, covering the id
+            models.Index(fields=['user', 'next_review'], include=['id'], name='srs_reviews_user_due_idx'),
         ]
     
     def __str__(self):
         return f"SRS Review for {self.submission.problem.title}"
     
+    def save(self, *args, **kwargs):
+        if self.user_id is None:
+            self.user_id = self.submission.user_id
+        super().save(*args, **kwargs)
+    
     def is_due(self):
         """Check if this review is due."""
         if not self.next_review:
@@ -50,6 +60,35 @@ class SRSReview(models.Model):
         return timezone.now() >= self.next_review
 
 
+
+class ReviewLog(models.Model):
+    """
+    One rating of an SRS review, append-only.
+    
+    Records the state the rating was made in, for retention analytics and
+    parameter fitting. On Postgres the table is partitioned by month of
+    `reviewed_at` (see ReviewLogService).
+    """
+    
+    id = models.BigAutoField(primary_key=True)
+    review = models.ForeignKey(SRSReview, on_delete=models.CASCADE, related_name='logs')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='review_logs')
+    reviewed_at = models.DateTimeField()
+    rating = models.PositiveSmallIntegerField(choices=SRSReview.RATING_CHOICES)
+    elapsed_days = models.FloatField()  # Since the previous rating (or creation of the review)
+    previous_interval = models.IntegerField()  # interval_days before the rating
+    previous_ease = models.FloatField()  # ease_factor before the rating
+    
+    class Meta:
+        db_table = 'srs_review_logs'
+        ordering = ['reviewed_at']
+        indexes = [
+            models.Index(fields=['user', 'reviewed_at']),
+        ]
+    
+    def __str__(self):
+        return f"Rating {self.rating} of review {self.review_id} at {self.reviewed_at}"
+
 class DailyPlan(models.Model):
     """Daily practice plan for a user."""
     
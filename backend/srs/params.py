@@ -0,0 +1,82 @@
+"""
+Per-user scheduling parameters fitted from the review log.
+
+Stored intervals (`SRSReview.interval_days`) are never scaled by the user's
+interval modifier; only the due date is. Recall is modelled as exponential
+forgetting over those base intervals: a review taken x = elapsed_days /
+previous_interval base intervals after the previous one is recalled (rated
+3 or more) with probability exp(-theta * x), where theta is the user's
+forgetting rate. theta is the maximum-likelihood estimate over the user's
+ratings, found with Newton's method for all users at once (the
+log-likelihood is concave in theta).
+
+Every user also gets `prior_weight` pseudo-ratings taken when their current
+schedule makes them due and recalled at the target retention, which keeps
+users with little history close to their current modifier.
+
+Base intervals scaled by -ln(R) / theta are recalled at the target
+retention R; that factor is the interval modifier.
+"""
+import math
+
+import numpy as np
+
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+
+def fit_forgetting_rates(
+    groups: np.ndarray,
+    ratios: np.ndarray,
+    recalled: np.ndarray,
+    prior_ratios: np.ndarray,
+    target_retention: float,
+    prior_weight: float
+) -> np.ndarray:
+    """
+    Fit the forgetting rate of each group (user).
+
+    Args:
+        groups: Group index (0 .. len(prior_ratios) - 1) of each rating
+        ratios: Elapsed days over the previous interval of each rating (> 0)
+        recalled: Whether each rating was a recall (bool)
+        prior_ratios: Ratio of the pseudo-ratings of each group (its current modifier)
+        target_retention: Retention the current schedule aims for (0-1)
+        prior_weight: Pseudo-ratings per group at the target retention
+
+    Returns:
+        Array of forgetting rates, one per group
+    """
+    # Prior pseudo-ratings: one recalled and one forgotten rating per group,
+    # weighted to prior_weight ratings at the target retention
+    group_count = len(prior_ratios)
+    prior_groups = np.arange(group_count)
+    groups = np.concatenate([groups, prior_groups, prior_groups])
+    ratios = np.concatenate([ratios, prior_ratios, prior_ratios])
+    recalled = np.concatenate([recalled, np.ones(group_count, bool), np.zeros(group_count, bool)])
+    weights = np.concatenate([
+        np.ones(len(groups) - 2 * group_count),
+        np.full(group_count, prior_weight * target_retention),
+        np.full(group_count, prior_weight * (1 - target_retention)),
+    ])
+
+    theta = -math.log(target_retention) / prior_ratios
+    for _ in range(MAX_ITERATIONS):
+        decay = np.expm1(theta[groups] * ratios)  # e^(theta x) - 1
+        gradient = np.where(recalled, -ratios, ratios / decay) * weights
+        hessian = np.where(recalled, 0.0, -ratios ** 2 * (decay + 1) / decay ** 2) * weights
+
+        gradient = np.bincount(groups, gradient, minlength=group_count)
+        hessian = np.bincount(groups, hessian, minlength=group_count)
+        # Newton step, kept positive by at most quartering theta per iteration
+        new_theta = np.maximum(theta - gradient / hessian, theta / 4)
+        converged = np.max(np.abs(new_theta - theta) / theta) < TOLERANCE
+        theta = new_theta
+        if converged:
+            break
+    return theta
+
+
+def interval_modifiers(theta: np.ndarray, target_retention: float, minimum: float, maximum: float) -> np.ndarray:
+    """Interval modifiers for fitted forgetting rates, clipped to [minimum, maximum]."""
+    return np.clip(-math.log(target_retention) / theta, minimum, maximum)
@@ -2,11 +2,18 @@
 SRS (Spaced Repetition System) Service
 Implements custom SM-17 algorithm optimized for coding problems.
 """
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 from django.db.models import Q
-from .models import SRSReview
-from problems.models import Submission
+from .due_queue import DAY, DueQueue
+from .leveling import fuzz_radius, level_intervals
+from .models import ReviewLog, SRSReview
+from .params import fit_forgetting_rates, interval_modifiers
+from problems.models import ExecutionStats, Submission
+from users.models import User
 
 
 class SRSService:
@@ -22,7 +29,13 @@ class SRSService:
     MEMORY_PENALTY_THRESHOLD = 0.8
     
     @staticmethod
-    def calculate_next_interval(review: SRSReview, rating: int, runtime_ratio: float = 1.0, memory_ratio: float = 1.0):
+    def calculate_next_interval(
+        review: SRSReview,
+        rating: int,
+        runtime_ratio: float = 1.0,
+        memory_ratio: float = 1.0,
+        interval_modifier: float = 1.0
+    ):
         """
         Calculate next review interval using SM-17 algorithm with coding-specific adjustments.
         
@@ -31,9 +44,11 @@ class SRSService:
             rating: User's rating (1-5)
             runtime_ratio: Ratio of user's runtime to average (for penalty)
             memory_ratio: Ratio of user's memory to average (for penalty)
+            interval_modifier: User's factor for successful intervals (User.srs_interval_modifier)
         
         Returns:
-            tuple: (new_interval_days, new_ease_factor)
+            tuple: (days until the next review, new_ease_factor); the review's
+            interval_days is left unscaled by interval_modifier
         """
         # Base SM-17 calculation
         if rating <= 2:
@@ -77,7 +92,143 @@ class SRSService:
         if rating >= 3:
             review.repetitions += 1
         
-        return review.interval_days, review.ease_factor
+        # Per-user scaling of successful intervals; only the returned interval
+        # is scaled, so the modifier does not compound across reviews
+        interval_days = review.interval_days
+        if rating >= 3 and interval_modifier != 1.0:
+            interval_days = max(1, int(interval_days * interval_modifier))
+        
+        return interval_days, review.ease_factor
+    
+    @staticmethod
+    def calculate_next_intervals(
+        repetitions,
+        ease_factor,
+        interval_days,
+        rating,
+        runtime_ratio=1.0,
+        memory_ratio=1.0,
+        interval_modifier=1.0
+    ):
+        """
+        Vectorized `calculate_next_interval` over arrays of review states.
+        
+        Applies the same rules and float operations as the scalar version, so
+        results match it exactly; keep the two in sync.
+        
+        Args:
+            repetitions: Array of repetition counts
+            ease_factor: Array of ease factors
+            interval_days: Array of current intervals
+            rating: Array of ratings (1-5)
+            runtime_ratio: Array or scalar of runtime ratios
+            memory_ratio: Array or scalar of memory ratios
+            interval_modifier: Array or scalar of users' interval modifiers
+        
+        Returns:
+            tuple: (new_repetitions, new_interval_days, new_ease_factor,
+            days until the next review) arrays
+        """
+        repetitions = np.asarray(repetitions, dtype=np.int64)
+        ease_factor = np.asarray(ease_factor, dtype=np.float64)
+        interval_days = np.asarray(interval_days, dtype=np.int64)
+        rating = np.asarray(rating, dtype=np.int64)
+        runtime_ratio = np.broadcast_to(np.asarray(runtime_ratio, dtype=np.float64), rating.shape)
+        memory_ratio = np.broadcast_to(np.asarray(memory_ratio, dtype=np.float64), rating.shape)
+        interval_modifier = np.broadcast_to(np.asarray(interval_modifier, dtype=np.float64), rating.shape)
+        
+        failed = rating <= 2
+        good = rating == 3
+        grown = np.trunc(interval_days * ease_factor).astype(np.int64)
+        
+        # Base SM-17 calculation
+        new_interval = np.select(
+            [failed, good & (repetitions == 0), good & (repetitions == 1), good,
+             repetitions == 0, repetitions == 1],
+            [1, 1, 6, grown, 4, 10],
+            default=grown
+        )
+        new_ease = np.select(
+            [failed, good, rating == 5],
+            [
+                np.maximum(ease_factor - 0.2, SRSService.MIN_EASE_FACTOR),
+                np.maximum(ease_factor - 0.15, SRSService.MIN_EASE_FACTOR),
+                np.minimum(ease_factor + 0.15, SRSService.MAX_EASE_FACTOR),
+            ],
+            default=np.minimum(ease_factor + 0.1, SRSService.MAX_EASE_FACTOR)
+        )
+        
+        # Apply coding-specific penalties
+        penalized = runtime_ratio > SRSService.RUNTIME_PENALTY_THRESHOLD
+        penalty = 1 - (runtime_ratio - SRSService.RUNTIME_PENALTY_THRESHOLD) * 0.5
+        new_interval = np.where(
+            penalized, np.maximum(1, np.trunc(new_interval * penalty).astype(np.int64)), new_interval
+        )
+        
+        penalized = memory_ratio > SRSService.MEMORY_PENALTY_THRESHOLD
+        penalty = 1 - (memory_ratio - SRSService.MEMORY_PENALTY_THRESHOLD) * 0.3
+        new_interval = np.where(
+            penalized, np.maximum(1, np.trunc(new_interval * penalty).astype(np.int64)), new_interval
+        )
+        
+        # Update repetitions
+        new_repetitions = np.where(failed, 0, repetitions + (rating >= 3))
+        
+        return new_repetitions, new_interval, new_ease, SRSService.scheduled_intervals(
+            new_interval, rating, interval_modifier
+        )
+    
+    @staticmethod
+    def scheduled_intervals(interval_days, rating, interval_modifier):
+        """Days until the next review for arrays of stored intervals and the ratings that set them."""
+        return np.where(
+            (rating >= 3) & (interval_modifier != 1.0),
+            np.maximum(1, np.trunc(interval_days * interval_modifier).astype(np.int64)),
+            interval_days
+        )
+    
+    @staticmethod
+    def level_interval(review: SRSReview, interval_days: int, now):
+        """
+        Move a scheduled interval within its fuzz window to the user's least
+        loaded day (see srs.leveling), using the due queue's per-day counts.
+        
+        Args:
+            review: SRSReview instance being rescheduled
+            interval_days: Scheduled days until the next review
+            now: Time of the review
+        
+        Returns:
+            Days until the next review
+        """
+        if not settings.SRS_LOAD_LEVELING_ENABLED:
+            return interval_days
+        radius = int(fuzz_radius(interval_days, settings.SRS_FUZZ_RATIO, settings.SRS_FUZZ_MAX_DAYS))
+        if not radius:
+            return interval_days
+        
+        first_day = DueQueue.day(now) + interval_days - radius
+        last_day = first_day + 2 * radius
+        loads = DueQueue.day_loads(review.user_id, first_day, last_day)
+        if loads is None:
+            # Due queue unavailable: count the window's reviews in the database
+            loads = [0] * (2 * radius + 1)
+            due_dates = SRSReview.objects.filter(
+                user_id=review.user_id,
+                next_review__gte=datetime.fromtimestamp(first_day * DAY, tz=dt_timezone.utc),
+                next_review__lt=datetime.fromtimestamp((last_day + 1) * DAY, tz=dt_timezone.utc)
+            ).values_list('next_review', flat=True)
+            for next_review in due_dates:
+                loads[DueQueue.day(next_review) - first_day] += 1
+        
+        # The review itself is moving, so it does not count where it is now
+        if review.next_review and first_day <= DueQueue.day(review.next_review) <= last_day:
+            day = DueQueue.day(review.next_review) - first_day
+            loads[day] = max(loads[day] - 1, 0)
+        
+        return int(level_intervals(
+            np.array([interval_days]), np.array([radius]), np.array([loads]), settings.SRS_MAX_REVIEWS_PER_DAY
+        )[0])
     
     @staticmethod
     def process_review(review: SRSReview, rating: int, runtime: int = None, memory: int = None):
@@ -85,7 +236,7 @@ class SRSService:
         Process a review rating and update the SRS schedule.
         
         Args:
-            review: SRSReview instance
+            review: SRSReview instance, ideally with user selected
             rating: User's rating (1-5)
             runtime: Code runtime in milliseconds (optional)
             memory: Code memory in KB (optional)
@@ -93,30 +244,65 @@ class SRSService:
         # Calculate runtime/memory ratios (simplified - in production, compare to average)
         runtime_ratio = 1.0
         memory_ratio = 1.0
+        baseline_runtime, baseline_memory = SRSService.performance_baseline(review.submission)
         
-        if runtime and review.submission.runtime:
+        if runtime and baseline_runtime:
             # Compare to previous submission runtime
-            runtime_ratio = runtime / max(review.submission.runtime, 1)
+            runtime_ratio = runtime / max(baseline_runtime, 1)
         
-        if memory and review.submission.memory:
-            memory_ratio = memory / max(review.submission.memory, 1)
+        if memory and baseline_memory:
+            memory_ratio = memory / max(baseline_memory, 1)
+        
+        # Log the state the rating was made in before it is overwritten
+        now = timezone.now()
+        previous = review.last_review or review.created_at or now
+        log = ReviewLog(
+            review=review,
+            user_id=review.user_id,
+            reviewed_at=now,
+            rating=rating,
+            elapsed_days=(now - previous).total_seconds() / 86400,
+            previous_interval=review.interval_days,
+            previous_ease=review.ease_factor,
+        )
         
         # Calculate new interval
         interval_days, ease_factor = SRSService.calculate_next_interval(
-            review, rating, runtime_ratio, memory_ratio
+            review, rating, runtime_ratio, memory_ratio, review.user.srs_interval_modifier
         )
+        interval_days = SRSService.level_interval(review, interval_days, now)
         
         # Update review
-        review.interval_days = interval_days
         review.ease_factor = ease_factor
         review.last_rating = rating
-        review.last_review = timezone.now()
-        review.next_review = timezone.now() + timedelta(days=interval_days)
+        review.last_review = now
+        review.next_review = now + timedelta(days=interval_days)
         review.total_reviews += 1
-        review.save()
+        ReviewLogService.save_with_log(review, log)
+        DueQueue.schedule(review.user_id, review.id, review.next_review)
         
         return review
     
+    @staticmethod
+    def performance_baseline(submission: Submission):
+        """
+        Runtime (ms) and memory (KB) that review measurements are compared to.
+        
+        Benchmark medians are used when they were measured on the current
+        code, since a single run is too noisy; otherwise the recorded run.
+        
+        Returns:
+            tuple: (runtime, memory), either may be None
+        """
+        try:
+            stats = submission.execution_stats
+        except ExecutionStats.DoesNotExist:
+            stats = None
+        
+        if stats and stats.code_hash == submission.code_hash:
+            return stats.runtime_median, stats.memory_median
+        return submission.runtime, submission.memory
+    
     @staticmethod
     def get_due_reviews(user, limit=None):
         """
@@ -127,18 +313,43 @@ class SRSService:
             limit: Maximum number of reviews to return
         
         Returns:
-            QuerySet of SRSReview instances
+            List of SRSReview instances, earliest due first
         """
-        now = timezone.now()
-        reviews = SRSReview.objects.filter(
-            submission__user=user,
-            next_review__lte=now
-        ).select_related('submission', 'submission__problem')
+        ids = DueQueue.due_ids(user.id, limit)
+        if ids is None:
+            # Due queue unavailable: query the database
+            reviews = SRSReview.objects.filter(
+                user=user,
+                next_review__lte=timezone.now()
+            ).select_related('submission', 'submission__problem')
+            return list(reviews[:limit] if limit else reviews)
+        
+        reviews = SRSReview.objects.select_related('submission', 'submission__problem').in_bulk(ids)
+        stale = [review_id for review_id in ids if review_id not in reviews]
+        if stale:
+            # Deleted reviews; drop them from the index
+            DueQueue.update([(user.id, review_id, None) for review_id in stale])
+        return [reviews[review_id] for review_id in ids if review_id in reviews]
+    
+    @staticmethod
+    def get_due_summary(user):
+        """
+        Number of due reviews and when the next review is due, from the due queue.
         
-        if limit:
-            reviews = reviews[:limit]
+        Args:
+            user: User instance
         
-        return reviews
+        Returns:
+            dict: due_count and next_due_at (None without reviews)
+        """
+        due_count = DueQueue.due_count(user.id)
+        answered, next_due_at = DueQueue.next_due(user.id)
+        if due_count is None or not answered:
+            # Due queue unavailable: query the database
+            reviews = SRSReview.objects.filter(user=user, next_review__isnull=False)
+            due_count = reviews.filter(next_review__lte=timezone.now()).count()
+            next_due_at = reviews.order_by('next_review').values_list('next_review', flat=True).first()
+        return {'due_count': due_count, 'next_due_at': next_due_at}
     
     @staticmethod
     def create_review_for_submission(submission: Submission):
@@ -151,9 +362,374 @@ class SRSService:
         if not SRSReview.objects.filter(submission=submission).exists():
             review = SRSReview.objects.create(
                 submission=submission,
+                user_id=submission.user_id,
                 next_review=timezone.now() + timedelta(days=1),
                 ease_factor=SRSService.INITIAL_EASE_FACTOR
             )
+            DueQueue.schedule(submission.user_id, review.id, review.next_review)
             return review
         return None
 
+
+
+class ReviewLogService:
+    """
+    Writing and partitioning of the review log.
+    
+    On Postgres srs_review_logs is partitioned by month of reviewed_at, with
+    a default partition catching rows outside the existing months. Monthly
+    partitions are created ahead of time by the create_review_log_partitions
+    task.
+    """
+    
+    @staticmethod
+    def save_with_log(review: SRSReview, log: ReviewLog):
+        """
+        Save a rated review and append its log entry atomically.
+        
+        On Postgres both writes go out as one statement (the insert runs in a
+        data-modifying CTE of the update), so logging costs no extra round
+        trip; `log.id` is not set then. Elsewhere they share a transaction.
+        """
+        if connection.vendor != 'postgresql':
+            with transaction.atomic():
+                review.save()
+                log.save()
+            return
+        
+        def columns(obj, add):
+            fields = [field for field in obj._meta.concrete_fields if not field.primary_key]
+            return (
+                [connection.ops.quote_name(field.column) for field in fields],
+                [field.get_db_prep_save(field.pre_save(obj, add), connection) for field in fields],
+            )
+        
+        log_columns, log_values = columns(log, True)
+        review_columns, review_values = columns(review, False)
+        sql = 'WITH log AS (INSERT INTO %s (%s) VALUES (%s)) UPDATE %s SET %s WHERE %s = %%s' % (
+            connection.ops.quote_name(ReviewLog._meta.db_table),
+            ', '.join(log_columns),
+            ', '.join(['%s'] * len(log_columns)),
+            connection.ops.quote_name(SRSReview._meta.db_table),
+            ', '.join(f'{column} = %s' for column in review_columns),
+            connection.ops.quote_name(SRSReview._meta.pk.column),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, log_values + review_values + [review.pk])
+    
+    @staticmethod
+    def partition_name(month) -> str:
+        return f'{ReviewLog._meta.db_table}_y{month.year}m{month.month:02d}'
+    
+    @staticmethod
+    def ensure_partitions(months_ahead: int = None):
+        """
+        Create the monthly partitions from the current month to months_ahead
+        months later (SRS_REVIEW_LOG_PARTITIONS_AHEAD by default).
+        
+        Rows of a new month already in the default partition are moved into
+        it. No-op on databases other than Postgres.
+        
+        Returns:
+            list: Names of the partitions created
+        """
+        if connection.vendor != 'postgresql':
+            return []
+        if months_ahead is None:
+            months_ahead = settings.SRS_REVIEW_LOG_PARTITIONS_AHEAD
+        
+        table = ReviewLog._meta.db_table
+        quote = connection.ops.quote_name
+        month = timezone.now().date().replace(day=1)
+        created = []
+        for _ in range(months_ahead + 1):
+            following = (month + timedelta(days=32)).replace(day=1)
+            name = ReviewLogService.partition_name(month)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute('SELECT to_regclass(%s)', [name])
+                if cursor.fetchone()[0] is None:
+                    bounds = [datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc),
+                              datetime(following.year, following.month, 1, tzinfo=dt_timezone.utc)]
+                    # A standalone table filled from the default partition, then
+                    # attached: attaching fails while the default holds its rows
+                    cursor.execute(f'CREATE TABLE {quote(name)} (LIKE {quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+                    cursor.execute(
+                        f'WITH moved AS (DELETE FROM {quote(table + "_default")} '
+                        f'WHERE reviewed_at >= %s AND reviewed_at < %s RETURNING *) '
+                        f'INSERT INTO {quote(name)} SELECT * FROM moved',
+                        bounds
+                    )
+                    cursor.execute(
+                        f'ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} FOR VALUES FROM (%s) TO (%s)',
+                        bounds
+                    )
+                    created.append(name)
+            month = following
+        return created
+
+
+class RescheduleService:
+    """
+    Bulk rescheduling of stored reviews after SRS constants or rules change.
+    
+    Reviews are processed in primary-key chunks of plain values loaded into
+    NumPy arrays, never as model instances; only rows whose schedule changes
+    are written back, with bulk_update. Each chunk is locked and written in
+    its own transaction.
+    """
+    
+    FIELDS = (
+        'id', 'repetitions', 'ease_factor', 'interval_days', 'next_review', 'last_review', 'last_rating',
+        'user__srs_interval_modifier', 'user_id',
+    )
+    
+    @staticmethod
+    def load_chunk(queryset, after_id: int, chunk_size: int):
+        """
+        Load the state of up to chunk_size reviews with ids above after_id.
+        
+        Returns:
+            Dict of arrays keyed by field name (user_id and interval_modifier
+            for the user's), with datetimes as naive UTC datetime64[us] (NaT for null)
+            and a null last_rating as 0, or None past the last row
+        """
+        rows = list(
+            queryset.filter(id__gt=after_id).order_by('id')
+            .values_list(*RescheduleService.FIELDS)[:chunk_size]
+        )
+        if not rows:
+            return None
+        
+        ids, repetitions, ease_factor, interval_days, next_review, last_review, last_rating, modifier, users = zip(*rows)
+        return {
+            'id': np.array(ids, dtype=np.int64),
+            'repetitions': np.array(repetitions, dtype=np.int64),
+            'ease_factor': np.array(ease_factor, dtype=np.float64),
+            'interval_days': np.array(interval_days, dtype=np.int64),
+            'next_review': RescheduleService._to_datetime64(next_review),
+            'last_review': RescheduleService._to_datetime64(last_review),
+            'last_rating': np.array([rating or 0 for rating in last_rating], dtype=np.int64),
+            'interval_modifier': np.array(modifier, dtype=np.float64),
+            'user_id': np.array(users, dtype=np.int64),
+        }
+    
+    @staticmethod
+    def _to_datetime64(values):
+        return np.array(
+            [value.astimezone(dt_timezone.utc).replace(tzinfo=None) if value else None for value in values],
+            dtype='datetime64[us]'
+        )
+    
+    @staticmethod
+    def _from_datetime64(value):
+        return value.astype(datetime).replace(tzinfo=dt_timezone.utc)
+    
+    @staticmethod
+    def reschedule_chunk(chunk):
+        """
+        Bring one chunk of review state in line with the current constants.
+        
+        Ease factors are clamped to [MIN_EASE_FACTOR, MAX_EASE_FACTOR],
+        intervals to at least a day, and reviewed items are due their
+        scheduled interval (with the user's interval modifier) after their
+        last review, unless they are already due within that interval's
+        fuzz window (see srs.leveling); never reviewed items keep their due
+        date.
+        
+        Returns:
+            tuple: (new_chunk, changed) where changed is a boolean mask
+        """
+        ease_factor = np.clip(chunk['ease_factor'], SRSService.MIN_EASE_FACTOR, SRSService.MAX_EASE_FACTOR)
+        interval_days = np.maximum(chunk['interval_days'], 1)
+        reviewed = ~np.isnat(chunk['last_review'])
+        scheduled = SRSService.scheduled_intervals(interval_days, chunk['last_rating'], chunk['interval_modifier'])
+        target = chunk['last_review'] + scheduled.astype('timedelta64[D]')
+        
+        # Keep due dates moved by load leveling; NaT compares as outside
+        radius = np.zeros_like(scheduled)
+        if settings.SRS_LOAD_LEVELING_ENABLED:
+            radius = fuzz_radius(scheduled, settings.SRS_FUZZ_RATIO, settings.SRS_FUZZ_MAX_DAYS)
+        leveled = np.abs(chunk['next_review'] - target) <= radius.astype('timedelta64[D]')
+        next_review = np.where(reviewed & ~leveled, target, chunk['next_review'])
+        
+        changed = (
+            (ease_factor != chunk['ease_factor'])
+            | (interval_days != chunk['interval_days'])
+            # NaT never compares equal; a null date only changes if it is filled in
+            | ((next_review != chunk['next_review']) & ~(np.isnat(next_review) & np.isnat(chunk['next_review'])))
+        )
+        return dict(chunk, ease_factor=ease_factor, interval_days=interval_days, next_review=next_review), changed
+    
+    @staticmethod
+    def _write(chunk, changed):
+        """Write the changed rows of a chunk back and update the due queue after commit."""
+        now = timezone.now()
+        reviews = [
+            SRSReview(
+                id=int(review_id),
+                ease_factor=float(ease_factor),
+                interval_days=int(interval_days),
+                next_review=None if np.isnat(next_review) else RescheduleService._from_datetime64(next_review),
+                updated_at=now,
+            )
+            for review_id, ease_factor, interval_days, next_review in zip(
+                chunk['id'][changed],
+                chunk['ease_factor'][changed],
+                chunk['interval_days'][changed],
+                chunk['next_review'][changed],
+            )
+        ]
+        SRSReview.objects.bulk_update(
+            reviews,
+            ['ease_factor', 'interval_days', 'next_review', 'updated_at'],
+            batch_size=1000
+        )
+        DueQueue.schedule_many([
+            (int(user_id), review.id, review.next_review)
+            for user_id, review in zip(chunk['user_id'][changed], reviews)
+        ])
+    
+    @staticmethod
+    def run(queryset=None, chunk_size: int = None, dry_run: bool = False, progress=None):
+        """
+        Reschedule reviews in chunks.
+        
+        Args:
+            queryset: SRSReview queryset to process (all reviews by default)
+            chunk_size: Rows per chunk (SRS_RESCHEDULE_CHUNK_SIZE by default)
+            dry_run: Count the changes without writing them
+            progress: Optional callable(processed, total, updated) called after each chunk
+        
+        Returns:
+            dict: processed, updated and total row counts
+        """
+        if queryset is None:
+            queryset = SRSReview.objects.all()
+        chunk_size = chunk_size or settings.SRS_RESCHEDULE_CHUNK_SIZE
+        
+        total = queryset.count()
+        processed = 0
+        updated = 0
+        last_id = 0
+        while True:
+            # Rows are locked until their chunk is written, so reviews rated
+            # meanwhile are not overwritten with stale state
+            with transaction.atomic():
+                chunk = RescheduleService.load_chunk(
+                    queryset if dry_run else queryset.select_for_update(of=('self',)), last_id, chunk_size
+                )
+                if chunk is None:
+                    break
+                new_chunk, changed = RescheduleService.reschedule_chunk(chunk)
+                if changed.any() and not dry_run:
+                    RescheduleService._write(new_chunk, changed)
+            
+            last_id = int(chunk['id'][-1])
+            processed += len(chunk['id'])
+            updated += int(changed.sum())
+            if progress:
+                progress(processed, total, updated)
+        
+        return {'processed': processed, 'updated': updated, 'total': total}
+
+
+class ParameterService:
+    """
+    Offline fitting of per-user scheduling parameters from the review log.
+    
+    Users are processed in id ranges; each range's ratings are loaded as
+    plain values into NumPy arrays and fitted together (see srs.params).
+    """
+    
+    MIN_INTERVAL_MODIFIER = 0.5
+    MAX_INTERVAL_MODIFIER = 2.0
+    
+    @staticmethod
+    def fit_chunk(user_ids, current, after_user_id: int, since):
+        """
+        Fit the interval modifiers of a range of users.
+        
+        Args:
+            user_ids: Sorted array of the ids of the users with ratings in the range
+            current: Array of their current interval modifiers
+            after_user_id: Largest user id before the range
+            since: Only ratings from this time on are used
+        
+        Returns:
+            Array of new interval modifiers, aligned with user_ids
+        """
+        rows = list(
+            ReviewLog.objects.filter(
+                user_id__gt=after_user_id,
+                user_id__lte=int(user_ids[-1]),
+                reviewed_at__gte=since,
+                elapsed_days__gt=0,
+                previous_interval__gt=0,
+            ).values_list('user_id', 'elapsed_days', 'previous_interval', 'rating')
+        )
+        if rows:
+            log_users, elapsed_days, previous_interval, rating = (np.array(column) for column in zip(*rows))
+        else:
+            log_users = elapsed_days = previous_interval = rating = np.array([], dtype=np.int64)
+        
+        theta = fit_forgetting_rates(
+            np.searchsorted(user_ids, log_users),
+            elapsed_days / previous_interval,
+            rating >= 3,
+            current,
+            settings.SRS_TARGET_RETENTION,
+            settings.SRS_PARAMS_PRIOR_REVIEWS
+        )
+        return interval_modifiers(
+            theta,
+            settings.SRS_TARGET_RETENTION,
+            ParameterService.MIN_INTERVAL_MODIFIER,
+            ParameterService.MAX_INTERVAL_MODIFIER
+        )
+    
+    @staticmethod
+    def run(chunk_size: int = None, progress=None):
+        """
+        Refit the interval modifier of every user with recent ratings.
+        
+        Args:
+            chunk_size: Users per chunk (SRS_PARAMS_CHUNK_SIZE by default)
+            progress: Optional callable(processed, total) called after each chunk
+        
+        Returns:
+            dict: Number of users fitted and updated
+        """
+        chunk_size = chunk_size or settings.SRS_PARAMS_CHUNK_SIZE
+        since = timezone.now() - timedelta(days=settings.SRS_PARAMS_HISTORY_DAYS)
+        users = User.objects.filter(
+            id__in=ReviewLog.objects.filter(reviewed_at__gte=since).values('user_id')
+        ).order_by('id')
+        
+        total = users.count()
+        processed = 0
+        updated = 0
+        last_id = 0
+        while True:
+            rows = list(users.filter(id__gt=last_id).values_list('id', 'srs_interval_modifier')[:chunk_size])
+            if not rows:
+                break
+            
+            user_ids, current = (np.array(column) for column in zip(*rows))
+            modifiers = np.round(ParameterService.fit_chunk(user_ids, current, last_id, since), 3)
+            changed = modifiers != current
+            User.objects.bulk_update(
+                [
+                    User(id=int(user_id), srs_interval_modifier=float(modifier))
+                    for user_id, modifier in zip(user_ids[changed], modifiers[changed])
+                ],
+                ['srs_interval_modifier'],
+                batch_size=1000
+            )
+            
+            last_id = int(user_ids[-1])
+            processed += len(user_ids)
+            updated += int(changed.sum())
+            if progress:
+                progress(processed, total)
+        
+        return {'fitted': processed, 'updated': updated}
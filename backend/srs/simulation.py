@@ -0,0 +1,205 @@
+"""
+Simulation of SRS scheduling policies on synthetic learners.
+
+Every learner studies a number of items, introduced a few per day. An
+item's memory has a stability S, the number of days after which it is
+recalled with 90% probability; recall probability after t days follows a
+forgetting curve:
+
+    exponential   R = 0.9 ** (t / S)
+    power         R = 1 / (1 + t / (9 * S))
+
+Learners differ in the stability of newly learned items and in how much a
+successful recall strengthens memory. Due items are reviewed each day: a
+recall multiplies S by the learner's growth factor, a lapse shrinks it. The
+rating follows from the recall probability, and the scheduler, by default
+the real rules in `SRSService.calculate_next_intervals`, decides the next
+due day. With load leveling the due day then moves within its fuzz window
+as in `SRSService.level_interval`. Everything is vectorized over all items
+of all learners.
+"""
+import time
+from typing import Dict, Any, Callable, Optional
+
+import numpy as np
+from django.conf import settings
+
+from .leveling import fuzz_radius, level_intervals
+from .services import SRSService
+
+FORGETTING_CURVES = {
+    'exponential': lambda elapsed, stability: 0.9 ** (elapsed / stability),
+    'power': lambda elapsed, stability: 1 / (1 + elapsed / (9 * stability)),
+}
+
+# Ratings by recall probability at review time
+EASY_RECALL = 0.95  # Recalled at or above: 5, else 4 down to GOOD_RECALL, else 3
+GOOD_RECALL = 0.85
+HARD_LAPSE = 0.5  # Forgotten at or above: 2, else 1
+LAPSE_STABILITY = 0.3  # Share of stability kept after a lapse
+
+
+def ratings_for(recalled: np.ndarray, retrievability: np.ndarray) -> np.ndarray:
+    """Ratings (1-5) for reviews with the given outcomes and recall probabilities."""
+    return np.where(
+        recalled,
+        np.select([retrievability >= EASY_RECALL, retrievability >= GOOD_RECALL], [5, 4], default=3),
+        np.where(retrievability >= HARD_LAPSE, 2, 1)
+    )
+
+
+def level_day(load: np.ndarray, day: int, learners: np.ndarray, scheduled: np.ndarray, capacity: int) -> np.ndarray:
+    """
+    Level one day's scheduled intervals and count them in `load`.
+
+    Args:
+        load: Reviews due per learner and day, updated in place; days past
+            its end count as empty and are not recorded
+        day: Current day
+        learners: Learner of each review, sorted
+        scheduled: Scheduled interval of each review
+        capacity: Daily capacity (0 for no limit)
+
+    Returns:
+        Leveled intervals
+    """
+    days = load.shape[1]
+    radius = fuzz_radius(scheduled, settings.SRS_FUZZ_RATIO, settings.SRS_FUZZ_MAX_DAYS)
+    leveled = scheduled.copy()
+    # Each learner's reviews are rated one after another: the k-th review of
+    # every learner is leveled in round k, against the load left by the others
+    rank = np.arange(len(learners)) - np.searchsorted(learners, learners)
+    for round_ in range(int(rank.max(initial=-1)) + 1):
+        batch = np.flatnonzero(rank == round_)
+        width = 2 * int(radius[batch].max()) + 1
+        window = day + scheduled[batch, None] + np.arange(width) - width // 2
+        window_loads = np.where(window < days, load[learners[batch, None], np.clip(window, 0, days - 1)], 0)
+        leveled[batch] = level_intervals(scheduled[batch], radius[batch], window_loads, capacity)
+
+        due = day + leveled[batch]
+        inside = due < days
+        load[learners[batch][inside], due[inside]] += 1
+    return leveled
+
+
+def simulate(
+    learners: int,
+    items: int = 20,
+    days: int = 90,
+    new_per_day: int = 2,
+    forgetting: str = 'exponential',
+    interval_modifier: float = 1.0,
+    scheduler: Optional[Callable] = None,
+    level_load: bool = False,
+    max_reviews_per_day: int = 0,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Run a simulation.
+
+    Args:
+        learners: Number of synthetic learners
+        items: Items per learner
+        days: Simulated days
+        new_per_day: Items each learner starts per day
+        forgetting: Forgetting curve, a key of FORGETTING_CURVES
+        interval_modifier: Interval modifier of every learner
+        scheduler: Callable with the signature and return value of
+            `SRSService.calculate_next_intervals` (the default)
+        level_load: Level due days with the SRS_FUZZ_* settings
+        max_reviews_per_day: Daily capacity for leveling (0 for no limit)
+        seed: Random seed; equal seeds give equal learners and outcomes
+
+    Returns:
+        Dict with the daily review load, the mean of each learner's busiest
+        day, learner-days over max_reviews_per_day (when set), the recall
+        rate, overall retention and timing: `reviews_per_second` over the whole simulation and
+        `scheduler_reviews_per_second` for the scheduler alone
+    """
+    scheduler = scheduler or SRSService.calculate_next_intervals
+    if forgetting not in FORGETTING_CURVES:
+        raise ValueError(f"Unknown forgetting curve '{forgetting}'")
+    curve = FORGETTING_CURVES[forgetting]
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+
+    count = learners * items
+    learner = np.repeat(np.arange(learners), items)
+    # Per learner: stability of new items (days) and growth on recall
+    initial_stability = rng.lognormal(np.log(1.5), 0.5, learners)
+    growth = rng.lognormal(np.log(2.5), 0.3, learners)
+
+    introduced = np.tile(np.arange(items) // new_per_day, learners)
+    stability = initial_stability[learner]
+    last_day = introduced.copy()
+    due = introduced + 1  # As for a new submission's review
+    repetitions = np.zeros(count, dtype=np.int64)
+    ease_factor = np.full(count, SRSService.INITIAL_EASE_FACTOR)
+    interval_days = np.ones(count, dtype=np.int64)
+
+    daily_reviews = np.zeros(days, dtype=np.int64)
+    daily_recalls = np.zeros(days, dtype=np.int64)
+    daily_retention = np.zeros(days)
+    learner_peak = np.zeros(learners, dtype=np.int64)
+    over_capacity = 0
+    scheduler_seconds = 0.0
+    if level_load:
+        # Reviews due per learner and day within the simulation
+        load = np.zeros((learners, days), dtype=np.int64)
+        np.add.at(load, (learner[due < days], due[due < days]), 1)
+
+    for day in range(days):
+        index = np.flatnonzero(due <= day)
+        if len(index):
+            retrievability = curve(day - last_day[index], stability[index])
+            recalled = rng.random(len(index)) < retrievability
+            rating = ratings_for(recalled, retrievability)
+
+            scheduler_started = time.perf_counter()
+            new_repetitions, new_interval, new_ease, scheduled = scheduler(
+                repetitions[index], ease_factor[index], interval_days[index], rating,
+                interval_modifier=interval_modifier
+            )
+            if level_load:
+                scheduled = level_day(load, day, learner[index], scheduled, max_reviews_per_day)
+            scheduler_seconds += time.perf_counter() - scheduler_started
+
+            repetitions[index] = new_repetitions
+            interval_days[index] = new_interval
+            ease_factor[index] = new_ease
+            due[index] = day + scheduled
+            last_day[index] = day
+            stability[index] = np.where(
+                recalled,
+                stability[index] * growth[learner[index]],
+                np.maximum(initial_stability[learner[index]], stability[index] * LAPSE_STABILITY)
+            )
+            daily_reviews[day] = len(index)
+            daily_recalls[day] = int(recalled.sum())
+            learner_reviews = np.bincount(learner[index], minlength=learners)
+            learner_peak = np.maximum(learner_peak, learner_reviews)
+            if max_reviews_per_day:
+                over_capacity += int((learner_reviews > max_reviews_per_day).sum())
+
+        started_items = introduced <= day
+        daily_retention[day] = curve(day - last_day[started_items], stability[started_items]).mean()
+
+    seconds = time.perf_counter() - started
+    total_reviews = int(daily_reviews.sum())
+    return {
+        'learners': learners,
+        'items': count,
+        'days': days,
+        'reviews': total_reviews,
+        'reviews_per_learner_per_day': (daily_reviews / learners).round(3).tolist(),
+        'mean_reviews_per_learner_per_day': round(total_reviews / learners / days, 3),
+        'peak_reviews_per_learner_per_day': round(int(daily_reviews.max()) / learners, 3),
+        'mean_learner_peak_reviews_per_day': round(float(learner_peak.mean()), 3),
+        'learner_days_over_capacity': over_capacity if max_reviews_per_day else None,
+        'recall_rate': round(int(daily_recalls.sum()) / max(total_reviews, 1), 4),
+        'daily_retention': daily_retention.round(4).tolist(),
+        'mean_retention': round(float(daily_retention.mean()), 4),
+        'seconds': round(seconds, 3),
+        'reviews_per_second': round(total_reviews / seconds),
+        'scheduler_reviews_per_second': round(total_reviews / max(scheduler_seconds, 1e-9)),
+    }
@@ -5,7 +5,7 @@ from celery import shared_task
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from .models import DailyPlan, SRSReview
-from .services import SRSService
+from .services import ParameterService, RescheduleService, ReviewLogService, SRSService
 from problems.models import Problem, Submission
 from datetime import date, timedelta
 import random
@@ -72,3 +72,33 @@ def update_srs_reviews():
     # For now, it's a placeholder
     return "SRS reviews updated"
 
+
+@shared_task
+def create_review_log_partitions():
+    """Create the upcoming monthly partitions of the review log."""
+    created = ReviewLogService.ensure_partitions()
+    return f"Created review log partitions: {', '.join(created) or 'none'}"
+
+
+@shared_task(bind=True)
+def reschedule_reviews(self, chunk_size=None, dry_run=False):
+    """Reschedule all SRS reviews in bulk, reporting progress as task state."""
+    def progress(processed, total, updated):
+        self.update_state(state='PROGRESS', meta={
+            'processed': processed,
+            'total': total,
+            'updated': updated,
+        })
+    
+    result = RescheduleService.run(chunk_size=chunk_size, dry_run=dry_run, progress=progress)
+    return f"Rescheduled {result['updated']} of {result['processed']} SRS reviews"
+
+
+@shared_task(bind=True)
+def fit_user_parameters(self, chunk_size=None):
+    """Refit per-user scheduling parameters from the review log, reporting progress as task state."""
+    def progress(processed, total):
+        self.update_state(state='PROGRESS', meta={'processed': processed, 'total': total})
+    
+    result = ParameterService.run(chunk_size=chunk_size, progress=progress)
+    return f"Fitted scheduling parameters of {result['fitted']} users, {result['updated']} changed"
@@ -16,8 +16,8 @@ class SRSReviewViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         return SRSReview.objects.filter(
-            submission__user=self.request.user
-        ).select_related('submission', 'submission__problem')
+            user=self.request.user
+        ).select_related('user', 'submission', 'submission__problem', 'submission__execution_stats')
     
     @action(detail=True, methods=['post'])
     def rate(self, request, pk=None):
@@ -68,6 +68,11 @@ class SRSReviewViewSet(viewsets.ReadOnlyModelViewSet):
                 'ease_factor': review.ease_factor,
             })
         return Response(data)
+    
+    @action(detail=False, methods=['get'], url_path='due/summary')
+    def due_summary(self, request):
+        """Number of due reviews and when the next one is due."""
+        return Response(SRSService.get_due_summary(request.user))
 
 
 class DailyPlanViewSet(viewsets.ReadOnlyModelViewSet):
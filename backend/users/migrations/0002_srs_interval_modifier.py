@@ -0,0 +1,18 @@
+# Generated by Django 5.0 on 2026-10-17 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='srs_interval_modifier',
+            field=models.FloatField(default=1.0),
+        ),
+    ]
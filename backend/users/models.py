@@ -11,6 +11,8 @@ class User(AbstractUser):
     weakness_scores = models.JSONField(default=dict, blank=True)
     streak_count = models.IntegerField(default=0)
     last_review_date = models.DateField(null=True, blank=True)
+    # Scales successful SRS intervals; fitted nightly from the review log (srs.params)
+    srs_interval_modifier = models.FloatField(default=1.0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     